@@ -0,0 +1,47 @@
+"""Add scan_finding_counts aggregate table
+
+Revision ID: 007_scan_finding_counts
+Revises: 006_password_reset
+Create Date: 2024-02-01 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '007_scan_finding_counts'
+down_revision = '006_password_reset'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Per-scan severity/category counts so dashboards never load finding rows
+    op.create_table(
+        'scan_finding_counts',
+        sa.Column('scan_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('category', sa.String(), nullable=False),
+        sa.Column('severity', sa.String(), nullable=False),
+        sa.Column('tenant_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False, server_default='0'),
+        sa.PrimaryKeyConstraint('scan_id', 'category', 'severity'),
+        sa.ForeignKeyConstraint(['scan_id'], ['scan_runs.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id'], ),
+    )
+    op.create_index('ix_scan_finding_counts_tenant_id', 'scan_finding_counts', ['tenant_id'])
+    
+    # Backfill from existing findings of completed scans
+    op.execute("""
+        INSERT INTO scan_finding_counts (scan_id, category, severity, tenant_id, count)
+        SELECT f.scan_run_id, f.category, f.severity, f.tenant_id, COUNT(*)
+        FROM findings f
+        JOIN scan_runs s ON s.id = f.scan_run_id
+        WHERE s.status = 'completed'
+        GROUP BY f.scan_run_id, f.category, f.severity, f.tenant_id
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_scan_finding_counts_tenant_id', table_name='scan_finding_counts')
+    op.drop_table('scan_finding_counts')
@@ -0,0 +1,37 @@
+"""Add response cache tables for the shared (postgres) cache backend
+
+Revision ID: 008_response_cache
+Revises: 007_scan_finding_counts
+Create Date: 2024-02-05 00:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '008_response_cache'
+down_revision = '007_scan_finding_counts'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # UNLOGGED: cache contents are disposable, so skip WAL writes
+    op.execute("""
+        CREATE UNLOGGED TABLE response_cache_entries (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL,
+            expires_at TIMESTAMPTZ NOT NULL
+        )
+    """)
+    op.execute("CREATE INDEX ix_response_cache_entries_expires_at ON response_cache_entries (expires_at)")
+    op.execute("""
+        CREATE UNLOGGED TABLE response_cache_generations (
+            scope TEXT PRIMARY KEY,
+            generation BIGINT NOT NULL DEFAULT 0
+        )
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE response_cache_generations")
+    op.execute("DROP TABLE response_cache_entries")
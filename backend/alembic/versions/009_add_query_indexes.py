@@ -0,0 +1,69 @@
+"""Add composite and partial indexes for hot query paths
+
+Revision ID: 009_query_indexes
+Revises: 008_response_cache
+Create Date: 2024-02-10 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '009_query_indexes'
+down_revision = '008_response_cache'
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    # Findings list and exports: tenant filter, severity/newest-first keyset order
+    ('ix_findings_tenant_severity_created', 'findings',
+     ['tenant_id', sa.text('severity DESC'), sa.text('created_at DESC'), sa.text('id DESC')], None),
+    # Per-scan reads: counts, reports, PDFs, exports by scan
+    ('ix_findings_scan_run_category_severity', 'findings',
+     ['scan_run_id', 'category', 'severity'], None),
+    # Auto-verification of findings marked fixed
+    ('ix_findings_tenant_pending_verification', 'findings',
+     ['tenant_id'], "remediation_status = 'marked_fixed' AND verified_fixed_at IS NULL"),
+    # Latest scan per tenant, scan lists (keyset on started_at, id)
+    ('ix_scan_runs_tenant_started', 'scan_runs',
+     ['tenant_id', sa.text('started_at DESC'), sa.text('id DESC')], None),
+    # Trends, reports and PDFs only look at completed scans
+    ('ix_scan_runs_tenant_completed_started', 'scan_runs',
+     ['tenant_id', sa.text('started_at DESC')], "status = 'completed'"),
+    # Scheduler check for a scan already running
+    ('ix_scan_runs_tenant_running', 'scan_runs',
+     ['tenant_id'], "status = 'running'"),
+    # Notification history per tenant and across tenants
+    ('ix_alerts_tenant_created', 'alerts',
+     ['tenant_id', sa.text('created_at DESC'), sa.text('id DESC')], None),
+    ('ix_alerts_created', 'alerts',
+     [sa.text('created_at DESC'), sa.text('id DESC')], None),
+    # Foreign key lookups when findings are deleted
+    ('ix_alerts_finding_id', 'alerts', ['finding_id'], None),
+    # Admin activity log, optionally filtered by user
+    ('ix_user_activities_created', 'user_activities',
+     [sa.text('created_at DESC'), sa.text('id DESC')], None),
+    ('ix_user_activities_user_created', 'user_activities',
+     ['user_id', sa.text('created_at DESC'), sa.text('id DESC')], None),
+]
+
+
+def upgrade() -> None:
+    # CONCURRENTLY keeps the tables writable while indexes build, but cannot
+    # run inside a transaction
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                postgresql_where=sa.text(where) if where else None,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
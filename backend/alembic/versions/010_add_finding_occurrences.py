@@ -0,0 +1,69 @@
+"""Add finding_occurrences history table
+
+Revision ID: 010_finding_occurrences
+Revises: 009_query_indexes
+Create Date: 2024-02-15 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '010_finding_occurrences'
+down_revision = '009_query_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Ranges of consecutive completed scans in which each finding was detected
+    op.create_table(
+        'finding_occurrences',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('finding_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('tenant_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('first_scan_run_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('last_scan_run_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('first_seen_at', sa.DateTime(), nullable=False),
+        sa.Column('last_seen_at', sa.DateTime(), nullable=False),
+        sa.Column('scan_count', sa.Integer(), nullable=False, server_default='1'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.ForeignKeyConstraint(['finding_id'], ['findings.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id'], ),
+        sa.ForeignKeyConstraint(['first_scan_run_id'], ['scan_runs.id'], ondelete='SET NULL'),
+        sa.ForeignKeyConstraint(['last_scan_run_id'], ['scan_runs.id'], ondelete='SET NULL'),
+    )
+    op.create_index(
+        'ix_finding_occurrences_finding_last_seen',
+        'finding_occurrences',
+        ['finding_id', sa.text('last_seen_at DESC')],
+    )
+    op.create_index(
+        'ix_finding_occurrences_tenant_range',
+        'finding_occurrences',
+        ['tenant_id', 'last_seen_at', 'first_seen_at'],
+    )
+    op.create_index('ix_finding_occurrences_last_scan', 'finding_occurrences', ['last_scan_run_id'])
+
+    # Backfill: until now only the latest scan that saw a finding was kept,
+    # so each existing finding starts with a single-scan range on that scan
+    op.execute("""
+        INSERT INTO finding_occurrences (
+            id, finding_id, tenant_id, first_scan_run_id, last_scan_run_id,
+            first_seen_at, last_seen_at, scan_count
+        )
+        SELECT
+            gen_random_uuid(), f.id, f.tenant_id, s.id, s.id,
+            COALESCE(s.started_at, f.created_at), COALESCE(s.started_at, f.created_at), 1
+        FROM findings f
+        JOIN scan_runs s ON s.id = f.scan_run_id
+        WHERE COALESCE(s.started_at, f.created_at) IS NOT NULL
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_finding_occurrences_last_scan', table_name='finding_occurrences')
+    op.drop_index('ix_finding_occurrences_tenant_range', table_name='finding_occurrences')
+    op.drop_index('ix_finding_occurrences_finding_last_seen', table_name='finding_occurrences')
+    op.drop_table('finding_occurrences')
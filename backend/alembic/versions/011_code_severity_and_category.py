@@ -0,0 +1,56 @@
+"""Store finding severity and category as SMALLINT codes
+
+Revision ID: 011_coded_severity_category
+Revises: 010_finding_occurrences
+Create Date: 2024-02-20 00:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '011_coded_severity_category'
+down_revision = '010_finding_occurrences'
+branch_labels = None
+depends_on = None
+
+# Must match app.models.types; severity codes are ranks
+SEVERITY_CODES = {"LOW": 1, "MEDIUM": 2, "HIGH": 3, "CRITICAL": 4}
+CATEGORY_CODES = {
+    "IAM": 1, "S3": 2, "LOGGING": 3, "EC2": 4, "EBS": 5,
+    "RDS": 6, "LAMBDA": 7, "CLOUDWATCH": 8, "SYSTEM": 9,
+}
+
+COLUMNS = [
+    ('findings', 'severity', SEVERITY_CODES),
+    ('findings', 'category', CATEGORY_CODES),
+    ('scan_finding_counts', 'severity', SEVERITY_CODES),
+    ('scan_finding_counts', 'category', CATEGORY_CODES),
+]
+
+
+def _to_code(column, codes):
+    whens = " ".join(f"WHEN '{name}' THEN {code}" for name, code in codes.items())
+    # Unknown values become NULL and abort the migration on the NOT NULL constraint
+    return f"CASE upper({column}) {whens} END"
+
+
+def _to_name(column, codes):
+    whens = " ".join(f"WHEN {code} THEN '{name}'" for name, code in codes.items())
+    return f"CASE {column} {whens} END"
+
+
+def upgrade() -> None:
+    # Indexes on these columns are rebuilt by ALTER TYPE
+    for table, column, codes in COLUMNS:
+        op.execute(
+            f"ALTER TABLE {table} ALTER COLUMN {column} TYPE SMALLINT "
+            f"USING {_to_code(column, codes)}"
+        )
+
+
+def downgrade() -> None:
+    for table, column, codes in COLUMNS:
+        op.execute(
+            f"ALTER TABLE {table} ALTER COLUMN {column} TYPE VARCHAR "
+            f"USING {_to_name(column, codes)}"
+        )
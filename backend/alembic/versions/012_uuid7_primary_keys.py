@@ -0,0 +1,51 @@
+"""Time-ordered (UUIDv7) primary keys for high-insert tables
+
+Revision ID: 012_uuid7_primary_keys
+Revises: 011_coded_severity_category
+Create Date: 2024-02-25 00:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '012_uuid7_primary_keys'
+down_revision = '011_coded_severity_category'
+branch_labels = None
+depends_on = None
+
+TABLES = ['findings', 'alerts', 'scan_runs', 'user_activities', 'finding_occurrences']
+
+
+def upgrade() -> None:
+    # UUIDv7 from a random v4 UUID: overwrite the first 48 bits with the Unix
+    # time in milliseconds and flip the version nibble from 4 to 7
+    op.execute("""
+        CREATE OR REPLACE FUNCTION uuid_generate_v7() RETURNS uuid AS $$
+            SELECT encode(
+                set_bit(
+                    set_bit(
+                        overlay(
+                            uuid_send(gen_random_uuid())
+                            PLACING substring(int8send(floor(extract(epoch FROM clock_timestamp()) * 1000)::bigint) FROM 3)
+                            FROM 1 FOR 6
+                        ),
+                        52, 1
+                    ),
+                    53, 1
+                ),
+                'hex'
+            )::uuid
+        $$ LANGUAGE sql VOLATILE
+    """)
+
+    # The application generates ids itself (app.core.ids.uuid7); the server
+    # default covers rows inserted with plain SQL. Existing uuid4 keys stay
+    # valid: both versions share the uuid type, only new rows are time-ordered.
+    for table in TABLES:
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN id SET DEFAULT uuid_generate_v7()")
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN id DROP DEFAULT")
+    op.execute("DROP FUNCTION IF EXISTS uuid_generate_v7()")
@@ -0,0 +1,31 @@
+"""Reference finding rule templates instead of storing rendered text
+
+Revision ID: 013_finding_rule_templates
+Revises: 012_uuid7_primary_keys
+Create Date: 2024-03-01 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '013_finding_rule_templates'
+down_revision = '012_uuid7_primary_keys'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # New catalog findings store rule_id + params and leave description and
+    # remediation NULL. Existing rows keep their text until a scan re-detects
+    # them, at which point they are switched over to the rule.
+    op.add_column('findings', sa.Column('rule_id', sa.String(), nullable=True))
+    op.add_column('findings', sa.Column('params', postgresql.JSON(astext_type=sa.Text()), nullable=True))
+
+
+def downgrade() -> None:
+    # Templated rows have no stored text; downgrading leaves their description
+    # and remediation empty (titles are always stored)
+    op.drop_column('findings', 'params')
+    op.drop_column('findings', 'rule_id')
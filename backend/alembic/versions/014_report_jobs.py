@@ -0,0 +1,59 @@
+"""Background report jobs
+
+Revision ID: 014_report_jobs
+Revises: 013_finding_rule_templates
+Create Date: 2024-03-08 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '014_report_jobs'
+down_revision = '013_finding_rule_templates'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'report_jobs',
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True, server_default=sa.text('uuid_generate_v7()')),
+        sa.Column('tenant_id', postgresql.UUID(as_uuid=True), sa.ForeignKey('tenants.id'), nullable=False),
+        sa.Column('requested_by', postgresql.UUID(as_uuid=True), sa.ForeignKey('users.id', ondelete='SET NULL'), nullable=True),
+        sa.Column('kind', sa.String(), nullable=False),
+        sa.Column('params', postgresql.JSON(astext_type=sa.Text()), nullable=False),
+        sa.Column('dedupe_key', sa.String(), nullable=False),
+        sa.Column('status', sa.String(), nullable=False),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('artifact_path', sa.String(), nullable=True),
+        sa.Column('content_type', sa.String(), nullable=True),
+        sa.Column('filename', sa.String(), nullable=True),
+        sa.Column('size_bytes', sa.BigInteger(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.Column('expires_at', sa.DateTime(), nullable=True),
+    )
+    op.create_index(
+        'ix_report_jobs_tenant_created', 'report_jobs',
+        ['tenant_id', sa.text('created_at DESC'), sa.text('id DESC')],
+    )
+    # At most one pending/running job per identical request; finished jobs don't block new ones
+    op.create_index(
+        'uq_report_jobs_in_flight', 'report_jobs', ['dedupe_key'],
+        unique=True,
+        postgresql_where=sa.text("status IN ('pending', 'running')"),
+    )
+    op.create_index(
+        'ix_report_jobs_expires', 'report_jobs', ['expires_at'],
+        postgresql_where=sa.text("status = 'completed'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_report_jobs_expires', table_name='report_jobs')
+    op.drop_index('uq_report_jobs_in_flight', table_name='report_jobs')
+    op.drop_index('ix_report_jobs_tenant_created', table_name='report_jobs')
+    op.drop_table('report_jobs')
@@ -0,0 +1,35 @@
+"""Row versions (updated_at) on findings and scan runs for conditional GETs
+
+Revision ID: 015_row_versions
+Revises: 014_report_jobs
+Create Date: 2024-03-15 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '015_row_versions'
+down_revision = '014_report_jobs'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('findings', sa.Column('updated_at', sa.DateTime(), nullable=True))
+    op.add_column('scan_runs', sa.Column('updated_at', sa.DateTime(), nullable=True))
+
+    # Existing rows: their last known change (GREATEST ignores NULLs)
+    op.execute("UPDATE findings SET updated_at = GREATEST(created_at, marked_as_fixed_at, verified_fixed_at)")
+    op.execute("UPDATE scan_runs SET updated_at = GREATEST(started_at, finished_at)")
+
+    # max(updated_at) per tenant is a single index probe
+    op.create_index('ix_findings_tenant_updated', 'findings', ['tenant_id', sa.text('updated_at DESC')])
+    op.create_index('ix_scan_runs_tenant_updated', 'scan_runs', ['tenant_id', sa.text('updated_at DESC')])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_scan_runs_tenant_updated', table_name='scan_runs')
+    op.drop_index('ix_findings_tenant_updated', table_name='findings')
+    op.drop_column('scan_runs', 'updated_at')
+    op.drop_column('findings', 'updated_at')
@@ -0,0 +1,24 @@
+"""Auth version on users, so role/tenant/password changes revoke tokens
+
+Revision ID: 016_user_auth_version
+Revises: 015_row_versions
+Create Date: 2024-03-18 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '016_user_auth_version'
+down_revision = '015_row_versions'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Existing tokens carry no version and count as 0
+    op.add_column('users', sa.Column('auth_version', sa.Integer(), nullable=False, server_default='0'))
+
+
+def downgrade() -> None:
+    op.drop_column('users', 'auth_version')
@@ -1,5 +1,5 @@
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Request
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response
 from sqlalchemy.orm import Session
 from uuid import UUID
 
@@ -9,8 +9,10 @@ from app.models.tenant import Tenant
 from app.schemas.user import UserResponse, AdminUserCreate, AdminUserUpdate
 from app.schemas.user_activity import UserActivityResponse
 from app.core.security import get_password_hash
+from app.core.auth_cache import bump_auth_version, principal_cache
 from app.core.validation import validate_password_strength
 from app.api.deps import get_current_user, require_superadmin
+from app.api.pagination import estimate_count, paginate_keyset, set_page_headers
 
 router = APIRouter()
 
@@ -166,6 +168,8 @@ def update_user(
             detail="User not found",
         )
     
+    previous_role, previous_tenant_id = user.role, user.tenant_id
+    
     # Prevent self-demotion from superadmin
     if user.id == current_user.id and user_data.role and user_data.role != "superadmin":
         raise HTTPException(
@@ -211,8 +215,13 @@ def update_user(
         else:
             user.name = user_data.name.strip()
     
+    # A new role or tenant revokes the user's existing tokens
+    if user.role != previous_role or user.tenant_id != previous_tenant_id:
+        bump_auth_version(user)
+    
     db.commit()
     db.refresh(user)
+    principal_cache.invalidate(user.email)
     
     # Log activity
     log_activity(
@@ -253,6 +262,7 @@ def delete_user(
     user_email = user.email
     db.delete(user)
     db.commit()
+    principal_cache.invalidate(user_email)
     
     # Log activity
     log_activity(
@@ -269,26 +279,51 @@ def delete_user(
 
 @router.get("/activities", response_model=List[UserActivityResponse])
 def list_activities(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
+    include_total: bool = False,
     user_id: Optional[UUID] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_superadmin),
 ):
-    """List user activity logs (superadmin only)."""
-    query = db.query(UserActivity)
+    """
+    List user activity logs (superadmin only), newest first.
+    Pass the X-Next-Cursor response header back as `cursor` for the next page;
+    `skip` is still honoured for older clients.
+    """
+    query = db.query(UserActivity, User.email).outerjoin(User, User.id == UserActivity.user_id)
     
     if user_id:
         query = query.filter(UserActivity.user_id == user_id)
     
-    activities = query.order_by(UserActivity.created_at.desc()).offset(skip).limit(limit).all()
+    total = estimate_count(query) if include_total else None
+    sort_columns = [UserActivity.created_at, UserActivity.id]
+    if skip and not cursor:
+        rows = (
+            query.order_by(*[column.desc() for column in sort_columns])
+            .offset(skip)
+            .limit(limit)
+            .all()
+        )
+        next_cursor = None
+    else:
+        rows, next_cursor = paginate_keyset(
+            query,
+            sort_columns,
+            cursor,
+            limit,
+            row_key=lambda row: (row[0].created_at, row[0].id),
+        )
+    set_page_headers(response, next_cursor, total)
     
     # Add user email for display
     result = []
-    for activity in activities:
+    for activity, user_email in rows:
         activity_dict = {
             **activity.__dict__,
-            "user_email": activity.user.email if activity.user else None,
+            "user_email": user_email,
         }
         result.append(activity_dict)
     
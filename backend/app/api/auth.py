@@ -14,11 +14,26 @@ from app.core.security import (
 )
 from app.core.config import settings
 from app.core.validation import validate_email, validate_password_strength
-from app.api.deps import get_current_user, require_superadmin
+from app.core.auth_cache import bump_auth_version, principal_cache
+from app.api.deps import get_current_user_record, require_superadmin
 
 router = APIRouter()
 
 
+def _issue_token(user: User) -> str:
+    """Access token for the user's current role, tenant and auth version."""
+    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    return create_access_token(
+        data={
+            "sub": user.email,
+            "role": user.role,
+            "tenant_id": str(user.tenant_id) if user.tenant_id else None,
+            "ver": user.auth_version or 0,
+        },
+        expires_delta=access_token_expires,
+    )
+
+
 @router.post("/register", response_model=UserResponse)
 def register(
     user_data: UserCreate,
@@ -83,18 +98,11 @@ def login(user_data: UserLogin, db: Session = Depends(get_db)):
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    # Create token
-    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    access_token = create_access_token(
-        data={"sub": user.email, "role": user.role, "tenant_id": str(user.tenant_id) if user.tenant_id else None},
-        expires_delta=access_token_expires,
-    )
-    
-    return {"access_token": access_token, "token_type": "bearer"}
+    return {"access_token": _issue_token(user), "token_type": "bearer"}
 
 
 @router.get("/me", response_model=UserResponse)
-def get_me(current_user: User = Depends(get_current_user)):
+def get_me(current_user: User = Depends(get_current_user_record)):
     """Get current user info."""
     # Ensure two_factor_enabled is always a string, defaulting to "false" if None
     if not hasattr(current_user, 'two_factor_enabled') or current_user.two_factor_enabled is None:
@@ -106,7 +114,7 @@ def get_me(current_user: User = Depends(get_current_user)):
 def update_me(
     user_data: UserUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(get_current_user_record),
 ):
     """Update current user profile. Email cannot be changed after account creation."""
     # Update name if provided
@@ -136,7 +144,7 @@ def update_me(
 def change_password(
     password_data: PasswordChange,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(get_current_user_record),
 ):
     """Change user password."""
     # Verify current password
@@ -161,17 +169,24 @@ def change_password(
             detail="New password must be different from current password",
         )
     
-    # Update password
+    # Update password; tokens issued before the change stop working
     current_user.password_hash = get_password_hash(password_data.new_password)
+    bump_auth_version(current_user)
     db.commit()
+    principal_cache.invalidate(current_user.email)
     
-    return {"message": "Password changed successfully"}
+    # A fresh token so this session survives the change
+    return {
+        "message": "Password changed successfully",
+        "access_token": _issue_token(current_user),
+        "token_type": "bearer",
+    }
 
 
 @router.get("/me/2fa/setup")
 def get_2fa_setup(
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(get_current_user_record),
 ):
     """Get 2FA setup QR code and secret (if not enabled)."""
     import pyotp
@@ -220,7 +235,7 @@ def get_2fa_setup(
 def verify_2fa(
     verification_data: TwoFactorSetup,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(get_current_user_record),
 ):
     """Verify and enable 2FA."""
     import pyotp
@@ -251,7 +266,7 @@ def verify_2fa(
 def disable_2fa(
     password_data: PasswordChange,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(get_current_user_record),
 ):
     """Disable 2FA (requires password verification)."""
     # Verify password
@@ -360,7 +375,9 @@ def reset_password(
     user.password_hash = get_password_hash(request_data.new_password)
     user.reset_token = None
     user.reset_token_expires = None
+    bump_auth_version(user)
     db.commit()
+    principal_cache.invalidate(user.email)
     
     return {"message": "Password reset successfully"}
 
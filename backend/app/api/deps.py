@@ -7,6 +7,7 @@ from uuid import UUID
 from app.db.session import get_db
 from app.models.user import User
 from app.schemas.token import TokenData
+from app.core.auth_cache import Principal, load_principal, principal_cache, token_version
 from app.core.security import decode_access_token
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
@@ -15,8 +16,13 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 def get_current_user(
     token: str = Depends(oauth2_scheme),
     db: Session = Depends(get_db),
-) -> User:
-    """Get current authenticated user from JWT token."""
+) -> Principal:
+    """
+    Get the authenticated principal (id, email, role, tenant_id) from the JWT.
+
+    Served from the principal cache; the users row is only read on a miss.
+    Endpoints that need the full row depend on get_current_user_record.
+    """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -31,14 +37,33 @@ def get_current_user(
     if email is None:
         raise credentials_exception
     
-    user = db.query(User).filter(User.email == email).first()
-    if user is None:
+    version = token_version(payload)
+    principal = principal_cache.get(email, version)
+    if principal is None:
+        # Unknown user, or token issued before a role/tenant/password change
+        principal = load_principal(db, email, version)
+    if principal is None:
         raise credentials_exception
     
+    return principal
+
+
+def get_current_user_record(
+    current_user: Principal = Depends(get_current_user),
+    db: Session = Depends(get_db),
+) -> User:
+    """The authenticated user's row, for endpoints that read or change profile fields."""
+    user = db.query(User).filter(User.id == current_user.id).first()
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
     return user
 
 
-def require_superadmin(current_user: User = Depends(get_current_user)) -> User:
+def require_superadmin(current_user: Principal = Depends(get_current_user)) -> Principal:
     """Require user to be superadmin."""
     if current_user.role != "superadmin":
         raise HTTPException(
@@ -50,7 +75,7 @@ def require_superadmin(current_user: User = Depends(get_current_user)) -> User:
 
 def require_tenant_access_factory(tenant_id: UUID):
     """Factory function to create a dependency that checks tenant access."""
-    def _require_tenant_access(current_user: User = Depends(get_current_user)) -> User:
+    def _require_tenant_access(current_user: Principal = Depends(get_current_user)) -> Principal:
         """Require user to be superadmin or tenant_admin of this tenant."""
         if current_user.role == "superadmin":
             return current_user
@@ -67,8 +92,8 @@ def require_tenant_access_factory(tenant_id: UUID):
 
 def require_tenant_access(
     tenant_id: UUID,
-    current_user: User = Depends(get_current_user),
-) -> User:
+    current_user: Principal = Depends(get_current_user),
+) -> Principal:
     """Require user to be superadmin or tenant_admin of this tenant."""
     if current_user.role == "superadmin":
         return current_user
@@ -1,28 +1,107 @@
 """
 Export endpoints for findings and reports.
 """
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status, Response
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, status
 from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from uuid import UUID
-import csv
-import io
 from datetime import datetime
 
 from app.db.session import get_db
-from app.models.finding import Finding
 from app.models.scan_run import ScanRun
 from app.models.user import User
 from app.api.deps import get_current_user
+from app.models.types import CATEGORY_CODES
+from app.services.finding_counts import SEVERITIES
+from app.services.finding_export import (
+    EXPORT_COLUMNS,
+    export_query,
+    resolve_export_columns,
+    resolve_remediation_status,
+    stream_arrow,
+    stream_csv,
+    stream_json,
+    stream_ndjson,
+    stream_parquet,
+)
+from app.services.sarif_export import SARIF_COLUMNS, stream_sarif
 
 router = APIRouter()
 
 
+def _check_export_access(current_user: User, tenant_id: UUID):
+    # Check tenant access
+    if current_user.role != "superadmin" and (current_user.role != "tenant_admin" or current_user.tenant_id != tenant_id):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions to access this tenant",
+        )
+
+
+def _filtered_export_query(
+    db: Session,
+    tenant_id: UUID,
+    columns: Optional[str],
+    scan_run_id: Optional[UUID],
+    severity: Optional[str],
+    category: Optional[str],
+    remediation_status: Optional[str],
+):
+    """Validate export parameters and build the (column-projected) export query."""
+    try:
+        export_columns = resolve_export_columns(columns)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    if severity:
+        severity = severity.upper()
+        if severity not in SEVERITIES:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid severity. Must be one of: {', '.join(SEVERITIES)}",
+            )
+    
+    if category:
+        category = category.upper()
+        if category not in CATEGORY_CODES:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid category. Must be one of: {', '.join(CATEGORY_CODES)}",
+            )
+    
+    try:
+        remediation_status = resolve_remediation_status(remediation_status)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    scan = None
+    if scan_run_id:
+        scan = db.query(ScanRun).filter(ScanRun.id == scan_run_id, ScanRun.tenant_id == tenant_id).first()
+        if not scan:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Scan not found",
+            )
+    
+    query = export_query(
+        db, tenant_id, export_columns,
+        scan=scan,
+        severity=severity,
+        category=category,
+        remediation_status=remediation_status,
+    )
+    return query, export_columns
+
+
 @router.get("/findings/{tenant_id}/csv")
 def export_findings_csv(
     tenant_id: UUID,
     scan_run_id: UUID = None,
+    columns: Optional[str] = Query(None, description=f"Comma-separated fields to export ({', '.join(EXPORT_COLUMNS)})"),
+    severity: Optional[str] = Query(None, description="Filter by severity (LOW, MEDIUM, HIGH, CRITICAL)"),
+    category: Optional[str] = Query(None, description="Filter by category (IAM, S3, LOGGING, EC2, EBS, RDS, LAMBDA, CLOUDWATCH)"),
+    remediation_status: Optional[str] = Query(None, description="Filter by remediation status (open, marked_fixed, verified_fixed, false_positive)"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
@@ -30,62 +109,20 @@ def export_findings_csv(
     Export findings to CSV format.
     If scan_run_id is provided, exports findings from that scan only.
     Otherwise, exports all findings for the tenant.
+    
+    The file is streamed from a server-side cursor in chunks, so large
+    exports start immediately and use constant memory.
     """
-    # Check tenant access
-    if current_user.role != "superadmin" and (current_user.role != "tenant_admin" or current_user.tenant_id != tenant_id):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not enough permissions to access this tenant",
-        )
+    _check_export_access(current_user, tenant_id)
     
-    # Get findings
-    query = db.query(Finding).filter(Finding.tenant_id == tenant_id)
+    query, export_columns = _filtered_export_query(
+        db, tenant_id, columns, scan_run_id, severity, category, remediation_status,
+    )
     
-    if scan_run_id:
-        query = query.filter(Finding.scan_run_id == scan_run_id)
-    
-    findings = query.order_by(
-        Finding.severity.desc(),
-        Finding.created_at.desc(),
-    ).all()
-    
-    # Create CSV in memory
-    output = io.StringIO()
-    writer = csv.writer(output)
-    
-    # Write header
-    writer.writerow([
-        "ID",
-        "Category",
-        "Title",
-        "Description",
-        "Severity",
-        "Resource ID",
-        "Remediation",
-        "Mapped Control",
-        "Created At",
-    ])
-    
-    # Write data
-    for finding in findings:
-        writer.writerow([
-            str(finding.id),
-            finding.category,
-            finding.title,
-            finding.description or "",
-            finding.severity,
-            finding.resource_id or "",
-            finding.remediation or "",
-            finding.mapped_control or "",
-            finding.created_at.isoformat() if finding.created_at else "",
-        ])
-    
-    # Create response
-    output.seek(0)
     filename = f"findings-{tenant_id}-{datetime.now().strftime('%Y%m%d-%H%M%S')}.csv"
     
     return StreamingResponse(
-        iter([output.getvalue()]),
+        stream_csv(db, query, export_columns),
         media_type="text/csv",
         headers={
             "Content-Disposition": f"attachment; filename={filename}",
@@ -97,57 +134,146 @@ def export_findings_csv(
 def export_findings_json(
     tenant_id: UUID,
     scan_run_id: UUID = None,
+    columns: Optional[str] = Query(None, description=f"Comma-separated fields to export ({', '.join(EXPORT_COLUMNS)})"),
+    severity: Optional[str] = Query(None, description="Filter by severity (LOW, MEDIUM, HIGH, CRITICAL)"),
+    category: Optional[str] = Query(None, description="Filter by category (IAM, S3, LOGGING, EC2, EBS, RDS, LAMBDA, CLOUDWATCH)"),
+    remediation_status: Optional[str] = Query(None, description="Filter by remediation status (open, marked_fixed, verified_fixed, false_positive)"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
     """
-    Export findings to JSON format.
+    Export findings to JSON format (a single array).
     If scan_run_id is provided, exports findings from that scan only.
     Otherwise, exports all findings for the tenant.
     """
-    # Check tenant access
-    if current_user.role != "superadmin" and (current_user.role != "tenant_admin" or current_user.tenant_id != tenant_id):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not enough permissions to access this tenant",
-        )
-    
-    # Get findings
-    query = db.query(Finding).filter(Finding.tenant_id == tenant_id)
+    _check_export_access(current_user, tenant_id)
     
-    if scan_run_id:
-        query = query.filter(Finding.scan_run_id == scan_run_id)
-    
-    findings = query.order_by(
-        Finding.severity.desc(),
-        Finding.created_at.desc(),
-    ).all()
-    
-    # Convert to dict
-    findings_data = []
-    for finding in findings:
-        findings_data.append({
-            "id": str(finding.id),
-            "category": finding.category,
-            "title": finding.title,
-            "description": finding.description,
-            "severity": finding.severity,
-            "resource_id": finding.resource_id,
-            "remediation": finding.remediation,
-            "mapped_control": finding.mapped_control,
-            "created_at": finding.created_at.isoformat() if finding.created_at else None,
-        })
-    
-    import json
-    json_data = json.dumps(findings_data, indent=2)
+    query, export_columns = _filtered_export_query(
+        db, tenant_id, columns, scan_run_id, severity, category, remediation_status,
+    )
     
     filename = f"findings-{tenant_id}-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
     
-    return Response(
-        content=json_data,
+    return StreamingResponse(
+        stream_json(db, query, export_columns),
         media_type="application/json",
         headers={
             "Content-Disposition": f"attachment; filename={filename}",
         },
     )
 
+
+@router.get("/findings/{tenant_id}/ndjson")
+def export_findings_ndjson(
+    tenant_id: UUID,
+    scan_run_id: UUID = None,
+    columns: Optional[str] = Query(None, description=f"Comma-separated fields to export ({', '.join(EXPORT_COLUMNS)})"),
+    severity: Optional[str] = Query(None, description="Filter by severity (LOW, MEDIUM, HIGH, CRITICAL)"),
+    category: Optional[str] = Query(None, description="Filter by category (IAM, S3, LOGGING, EC2, EBS, RDS, LAMBDA, CLOUDWATCH)"),
+    remediation_status: Optional[str] = Query(None, description="Filter by remediation status (open, marked_fixed, verified_fixed, false_positive)"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Export findings as newline-delimited JSON (one object per line).
+    Suited to log pipelines and SIEM ingestion; streamed from a DB cursor.
+    """
+    _check_export_access(current_user, tenant_id)
+    
+    query, export_columns = _filtered_export_query(
+        db, tenant_id, columns, scan_run_id, severity, category, remediation_status,
+    )
+    
+    filename = f"findings-{tenant_id}-{datetime.now().strftime('%Y%m%d-%H%M%S')}.ndjson"
+    
+    return StreamingResponse(
+        stream_ndjson(db, query, export_columns),
+        media_type="application/x-ndjson",
+        headers={
+            "Content-Disposition": f"attachment; filename={filename}",
+        },
+    )
+
+
+@router.get("/findings/{tenant_id}/sarif")
+def export_findings_sarif(
+    tenant_id: UUID,
+    scan_run_id: UUID = None,
+    severity: Optional[str] = Query(None, description="Filter by severity (LOW, MEDIUM, HIGH, CRITICAL)"),
+    category: Optional[str] = Query(None, description="Filter by category (IAM, S3, LOGGING, EC2, EBS, RDS, LAMBDA, CLOUDWATCH)"),
+    remediation_status: Optional[str] = Query(None, description="Filter by remediation status (open, marked_fixed, verified_fixed, false_positive)"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Export findings as a SARIF 2.1.0 log for code-scanning uploads and CI.
+    Each rule is described once; results reference it by ruleId.
+    """
+    _check_export_access(current_user, tenant_id)
+    
+    query, _ = _filtered_export_query(
+        db, tenant_id, ",".join(column.name for column in SARIF_COLUMNS),
+        scan_run_id, severity, category, remediation_status,
+    )
+    
+    filename = f"findings-{tenant_id}-{datetime.now().strftime('%Y%m%d-%H%M%S')}.sarif"
+    
+    return StreamingResponse(
+        stream_sarif(db, query, tenant_id, scan_run_id),
+        media_type="application/sarif+json",
+        headers={
+            "Content-Disposition": f"attachment; filename={filename}",
+        },
+    )
+
+
+# Declared last: the {export_format} segment would otherwise shadow the routes above
+@router.get("/findings/{tenant_id}/{export_format}")
+def export_findings_columnar(
+    tenant_id: UUID,
+    export_format: str = Path(..., pattern="^(parquet|arrow)$", description="parquet (file) or arrow (IPC stream)"),
+    scan_run_id: UUID = None,
+    columns: Optional[str] = Query(None, description=f"Comma-separated fields to export ({', '.join(EXPORT_COLUMNS)})"),
+    severity: Optional[str] = Query(None, description="Filter by severity (LOW, MEDIUM, HIGH, CRITICAL)"),
+    category: Optional[str] = Query(None, description="Filter by category (IAM, S3, LOGGING, EC2, EBS, RDS, LAMBDA, CLOUDWATCH)"),
+    remediation_status: Optional[str] = Query(None, description="Filter by remediation status (open, marked_fixed, verified_fixed, false_positive)"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Export findings in a columnar format for analytics tools.
+    Category, severity, control and status are dictionary-encoded columns;
+    the file is written incrementally, one row group / record batch per chunk.
+    """
+    _check_export_access(current_user, tenant_id)
+    
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError as e:
+        # Installed but unimportable (e.g. a binary mismatch) is reported as such
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Columnar export library unavailable ({e}). Install the pyarrow version from requirements.txt",
+        )
+    
+    query, export_columns = _filtered_export_query(
+        db, tenant_id, columns, scan_run_id, severity, category, remediation_status,
+    )
+    
+    timestamp = datetime.now().strftime('%Y%m%d-%H%M%S')
+    if export_format == "parquet":
+        content = stream_parquet(db, query, export_columns)
+        media_type = "application/vnd.apache.parquet"
+        filename = f"findings-{tenant_id}-{timestamp}.parquet"
+    else:
+        content = stream_arrow(db, query, export_columns)
+        media_type = "application/vnd.apache.arrow.stream"
+        filename = f"findings-{tenant_id}-{timestamp}.arrows"
+    
+    return StreamingResponse(
+        content,
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f"attachment; filename={filename}",
+        },
+    )
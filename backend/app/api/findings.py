@@ -1,15 +1,23 @@
 from typing import List, Optional
-from fastapi import APIRouter, Depends, Query, HTTPException, status
+from fastapi import APIRouter, Depends, Query, HTTPException, Request, Response, status
 from sqlalchemy.orm import Session
 from uuid import UUID
 from datetime import datetime
 
 from app.db.session import get_db
 from app.models.finding import Finding
+from app.models.finding_occurrence import FindingOccurrence
+from app.models.scan_finding_count import ScanFindingCount
 from app.models.user import User
-from app.schemas.finding import FindingResponse
+from app.schemas.finding import FindingOccurrenceResponse, FindingResponse
 from app.api.deps import get_current_user
-from app.api.pagination import paginate_query, PaginatedResponse
+from app.api.conditional import check_not_modified, make_etag
+from app.api.pagination import estimate_count, paginate_keyset, set_page_headers
+from app.api.responses import orm_list_response
+from app.services.finding_counts import refresh_scan_finding_counts
+from app.services.finding_history import scan_ids_for_findings
+from app.services.resource_versions import touch_tenant
+from app.services.response_cache import response_cache
 
 router = APIRouter()
 
@@ -17,14 +25,25 @@ router = APIRouter()
 @router.get("/{tenant_id}", response_model=List[FindingResponse])
 def list_findings(
     tenant_id: UUID,
+    request: Request,
+    response: Response,
     severity: Optional[str] = Query(None, description="Filter by severity (LOW, MEDIUM, HIGH, CRITICAL)"),
     category: Optional[str] = Query(None, description="Filter by category (IAM, S3, LOGGING, EC2, EBS, RDS, LAMBDA, CLOUDWATCH)"),
-    page: int = Query(1, ge=1, description="Page number"),
+    page: int = Query(1, ge=1, description="Page number (deprecated, prefer cursor)"),
     page_size: int = Query(20, ge=1, le=100, description="Items per page"),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
+    include_total: bool = Query(False, description="Return an approximate total in X-Total-Count"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    """List findings for a tenant with optional filters and pagination."""
+    """
+    List findings for a tenant with optional filters and pagination.
+    Follow the X-Next-Cursor response header to fetch the next page.
+    
+    Pages carry an ETag over the returned rows' ids and row versions; send
+    If-None-Match to get 304 when nothing on the page changed. (No
+    Last-Modified: a deleted row would not make the page any newer.)
+    """
     # Check tenant access
     if current_user.role != "superadmin" and (
         (current_user.role not in ("tenant_admin", "viewer")) or current_user.tenant_id != tenant_id
@@ -57,24 +76,42 @@ def list_findings(
             )
         query = query.filter(Finding.category == category_upper)
     
-    # Apply ordering
-    query = query.order_by(
-        Finding.severity.desc(),
-        Finding.created_at.desc(),
-    )
+    total = estimate_count(query) if include_total else None
+    
+    # Paginate (severity, newest first)
+    sort_columns = [Finding.severity, Finding.created_at, Finding.id]
+    if page > 1 and not cursor:
+        # Legacy page numbers: OFFSET without the COUNT
+        findings = (
+            query.order_by(*[column.desc() for column in sort_columns])
+            .offset((page - 1) * page_size)
+            .limit(page_size)
+            .all()
+        )
+        next_cursor = None
+    else:
+        findings, next_cursor = paginate_keyset(query, sort_columns, cursor, page_size)
     
-    # Paginate
-    findings, total, total_pages = paginate_query(query, page, page_size)
+    # For backward compatibility, return list directly; paging info travels in headers
+    set_page_headers(response, next_cursor, total)
+    
+    not_modified = check_not_modified(
+        request,
+        response,
+        make_etag("findings", [(finding.id, finding.updated_at) for finding in findings], next_cursor, total),
+    )
+    if not_modified:
+        return not_modified
     
-    # For backward compatibility, return list directly
-    # In future, could return PaginatedResponse[FindingResponse]
-    return findings
+    return orm_list_response(FindingResponse, findings, response)
 
 
 @router.get("/{tenant_id}/{finding_id}", response_model=FindingResponse)
 def get_finding(
     tenant_id: UUID,
     finding_id: UUID,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
@@ -100,9 +137,50 @@ def get_finding(
             detail="Finding not found",
         )
     
+    not_modified = check_not_modified(
+        request, response, make_etag("finding", finding.id, finding.updated_at), finding.updated_at,
+    )
+    if not_modified:
+        return not_modified
+    
     return finding
 
 
+@router.get("/{tenant_id}/{finding_id}/history", response_model=List[FindingOccurrenceResponse])
+def get_finding_history(
+    tenant_id: UUID,
+    finding_id: UUID,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Get the scan ranges in which a finding was detected, newest first."""
+    # Check tenant access
+    if current_user.role != "superadmin" and (
+        (current_user.role not in ("tenant_admin", "viewer")) or current_user.tenant_id != tenant_id
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions to access this tenant",
+        )
+    
+    occurrences = (
+        db.query(FindingOccurrence)
+        .filter(FindingOccurrence.finding_id == finding_id, FindingOccurrence.tenant_id == tenant_id)
+        .order_by(FindingOccurrence.last_seen_at.desc())
+        .all()
+    )
+    
+    if not occurrences and not db.query(Finding.id).filter(
+        Finding.id == finding_id, Finding.tenant_id == tenant_id
+    ).first():
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Finding not found",
+        )
+    
+    return occurrences
+
+
 @router.post("/{tenant_id}/{finding_id}/mark-fixed", response_model=FindingResponse)
 def mark_finding_as_fixed(
     tenant_id: UUID,
@@ -136,6 +214,7 @@ def mark_finding_as_fixed(
     finding.marked_as_fixed_by = current_user.id
     
     db.commit()
+    response_cache.invalidate_tenant(tenant_id)
     db.refresh(finding)
     
     return finding
@@ -174,6 +253,7 @@ def mark_finding_as_false_positive(
     finding.marked_as_fixed_by = current_user.id
     
     db.commit()
+    response_cache.invalidate_tenant(tenant_id)
     db.refresh(finding)
     
     return finding
@@ -214,6 +294,7 @@ def bulk_mark_findings_as_fixed(
         updated_count += 1
     
     db.commit()
+    response_cache.invalidate_tenant(tenant_id)
     
     return {"message": f"Marked {updated_count} findings as fixed", "count": updated_count}
 
@@ -245,8 +326,15 @@ def cleanup_disabled_scanner_findings(
         )
         .delete(synchronize_session=False)
     )
+    db.query(ScanFindingCount).filter(
+        ScanFindingCount.tenant_id == tenant_id,
+        ScanFindingCount.category.in_(disabled_categories)
+    ).delete(synchronize_session=False)
+    # Deleted rows leave no newer row version behind
+    touch_tenant(db, tenant_id)
     
     db.commit()
+    response_cache.invalidate_tenant(tenant_id)
     
     return {
         "message": f"Deleted {deleted} findings from disabled scanners",
@@ -294,13 +382,22 @@ def deduplicate_findings(
         else:
             findings_by_key[key] = finding
     
+    # Scans whose counts include the duplicates, before their occurrences go away
+    affected_scan_ids = scan_ids_for_findings(db, [d.id for d in duplicates_to_delete])
+    
     # Delete duplicates
     deleted_count = 0
     for duplicate in duplicates_to_delete:
         db.delete(duplicate)
         deleted_count += 1
     
+    # Keep per-scan counts in line with the remaining findings
+    refresh_scan_finding_counts(db, affected_scan_ids, tenant_id)
+    # Deleted rows leave no newer row version behind
+    touch_tenant(db, tenant_id)
+    
     db.commit()
+    response_cache.invalidate_tenant(tenant_id)
     
     return {
         "message": f"Removed {deleted_count} duplicate findings",
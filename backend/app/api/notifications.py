@@ -3,7 +3,7 @@ Notification API endpoints for configuring and managing alerts.
 """
 from typing import List, Optional, Dict, Any
 from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, status, Body
+from fastapi import APIRouter, Depends, HTTPException, Response, status, Body
 from sqlalchemy.orm import Session
 from uuid import UUID
 from pydantic import BaseModel, EmailStr
@@ -13,6 +13,7 @@ from app.models.tenant import Tenant
 from app.models.user import User
 from app.models.alert import Alert
 from app.api.deps import get_current_user, require_superadmin
+from app.api.pagination import paginate_keyset, set_page_headers
 from app.services.notification_service import send_email_notification, send_slack_notification, send_notifications_for_findings
 
 router = APIRouter()
@@ -253,19 +254,30 @@ async def test_slack_notification(
         )
 
 
-def _query_alerts_with_findings(db: Session, tenant_ids: Optional[List[UUID]], limit: int):
+def _query_alerts_with_findings(
+    db: Session,
+    tenant_ids: Optional[List[UUID]],
+    limit: int,
+    cursor: Optional[str] = None,
+):
+    """One page of alerts (newest first) with their findings, plus the next cursor."""
     from app.models.finding import Finding
 
     query = (
         db.query(Alert, Finding)
         .outerjoin(Finding, Alert.finding_id == Finding.id)
-        .order_by(Alert.created_at.desc())
     )
 
     if tenant_ids:
         query = query.filter(Alert.tenant_id.in_(tenant_ids))
 
-    return query.limit(limit).all()
+    return paginate_keyset(
+        query,
+        [Alert.created_at, Alert.id],
+        cursor,
+        limit,
+        row_key=lambda row: (row[0].created_at, row[0].id),
+    )
 
 
 def _serialize_alert_rows(alert_rows) -> List[NotificationHistoryItem]:
@@ -299,11 +311,16 @@ def _serialize_alert_rows(alert_rows) -> List[NotificationHistoryItem]:
 @router.get("/history/{tenant_id}", response_model=List[NotificationHistoryItem])
 def get_notification_history(
     tenant_id: UUID,
+    response: Response,
     limit: int = 50,
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    """Get notification history for a specific tenant."""
+    """
+    Get notification history for a specific tenant.
+    Pass the X-Next-Cursor response header back as `cursor` for the next page.
+    """
     # Check tenant access
     if current_user.role != "superadmin" and (current_user.role != "tenant_admin" or current_user.tenant_id != tenant_id):
         raise HTTPException(
@@ -311,14 +328,17 @@ def get_notification_history(
             detail="Not enough permissions to access this tenant",
         )
 
-    alert_rows = _query_alerts_with_findings(db, [tenant_id], limit)
+    alert_rows, next_cursor = _query_alerts_with_findings(db, [tenant_id], limit, cursor)
+    set_page_headers(response, next_cursor)
     return _serialize_alert_rows(alert_rows)
 
 
 @router.get("/history", response_model=List[NotificationHistoryItem])
 def get_notification_history_all(
+    response: Response,
     tenant_id: Optional[UUID] = None,
     limit: int = 50,
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
@@ -330,7 +350,9 @@ def get_notification_history_all(
         # Reuse existing per-tenant logic (will perform access checks)
         return get_notification_history(
             tenant_id=tenant_id,
+            response=response,
             limit=limit,
+            cursor=cursor,
             db=db,
             current_user=current_user,
         )
@@ -341,6 +363,7 @@ def get_notification_history_all(
             detail="Not enough permissions to access notification history for all tenants",
         )
 
-    alert_rows = _query_alerts_with_findings(db, tenant_ids=None, limit=limit)
+    alert_rows, next_cursor = _query_alerts_with_findings(db, tenant_ids=None, limit=limit, cursor=cursor)
+    set_page_headers(response, next_cursor)
     return _serialize_alert_rows(alert_rows)
 
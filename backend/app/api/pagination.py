@@ -1,8 +1,19 @@
 """
 Pagination utilities for API endpoints.
 """
-from typing import Generic, TypeVar, Optional
+import base64
+import json
+from datetime import datetime
+from typing import Any, Callable, Generic, List, Optional, Sequence, Tuple, TypeVar
+from uuid import UUID
+
+from fastapi import HTTPException, Response, status
 from pydantic import BaseModel
+from sqlalchemy import literal, tuple_
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+from app.models.types import CodedString
 
 T = TypeVar('T')
 
@@ -42,3 +53,152 @@ def paginate_query(query, page: int = 1, page_size: int = 20):
     
     return items, total, total_pages
 
+
+
+# Keyset (cursor) pagination
+#
+# Instead of OFFSET, each page continues strictly after the sort key of the
+# last row returned, so a query over an index on the sort columns costs the
+# same at any depth. Cursors are opaque to clients (base64 of the last key).
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+TOTAL_COUNT_HEADER = "X-Total-Count"
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Encode the sort key of the last row of a page."""
+    encoded = []
+    for value in values:
+        if isinstance(value, datetime):
+            encoded.append({"t": "dt", "v": value.isoformat()})
+        elif isinstance(value, UUID):
+            encoded.append({"t": "uuid", "v": str(value)})
+        else:
+            encoded.append({"t": "raw", "v": value})
+    raw = json.dumps(encoded, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _check_cursor_value(column, value: Any) -> Any:
+    """Raise ValueError unless `value` can be bound to `column` (a sort key column)."""
+    column_type = column.type
+    if isinstance(column_type, CodedString):
+        if not isinstance(value, str) or value not in column_type.codes:
+            raise ValueError(f"Invalid cursor value for {column.key}")
+        return value
+    try:
+        expected = column_type.python_type
+    except NotImplementedError:
+        return value
+    if not isinstance(value, expected) or (isinstance(value, bool) and expected is not bool):
+        raise ValueError(f"Invalid cursor value for {column.key}")
+    return value
+
+
+def decode_cursor(cursor: str, sort_columns: Sequence) -> List[Any]:
+    """
+    Decode a cursor produced by encode_cursor for `sort_columns` (400 if it
+    was tampered with). Values are checked against the columns' Python types,
+    so a forged cursor cannot reach the database as a mistyped comparison.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        encoded = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        values = []
+        for item in encoded:
+            if item["t"] == "dt":
+                values.append(datetime.fromisoformat(item["v"]))
+            elif item["t"] == "uuid":
+                values.append(UUID(item["v"]))
+            else:
+                values.append(item["v"])
+        if len(values) != len(sort_columns):
+            raise ValueError("Cursor does not match the sort key")
+        values = [_check_cursor_value(column, value) for column, value in zip(sort_columns, values)]
+    except (ValueError, KeyError, TypeError):
+        values = None
+    if values is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor",
+        )
+    return values
+
+
+class _Explain(Executable, ClauseElement):
+    """EXPLAIN (FORMAT JSON) of a statement, executed like any other statement."""
+    inherit_cache = False
+
+    def __init__(self, statement):
+        self.statement = statement
+
+
+@compiles(_Explain)
+def _compile_explain(element, compiler, **kw):
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+def estimate_count(query) -> int:
+    """
+    Planner row estimate for a query (EXPLAIN, no execution).
+    Cheap at any table size but approximate: good enough for "about N results".
+    
+    The EXPLAIN goes through normal statement execution, so parameters pass
+    the columns' bind processing (e.g. severity names become SMALLINT codes).
+    """
+    plan = query.session.execute(_Explain(query.order_by(None).statement)).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def paginate_keyset(
+    query,
+    sort_columns: Sequence,
+    cursor: Optional[str] = None,
+    limit: int = 50,
+    row_key: Optional[Callable[[Any], Sequence[Any]]] = None,
+) -> Tuple[list, Optional[str]]:
+    """
+    Keyset-paginate a SQLAlchemy query ordered by `sort_columns`, all descending.
+    
+    Args:
+        query: SQLAlchemy query object (unordered)
+        sort_columns: Non-null columns that uniquely order rows; end with the primary key
+        cursor: Cursor from the previous page, or None for the first page
+        limit: Number of items per page
+        row_key: Extracts the sort key from a result row (default: the columns'
+            attributes on the row, which works for single-entity queries)
+    
+    Returns:
+        Tuple of (items, next_cursor); next_cursor is None on the last page
+    """
+    limit = max(1, min(limit, 500))
+    
+    if cursor:
+        after = decode_cursor(cursor, sort_columns)
+        # Bind cursor values with the columns' types (e.g. coded severities)
+        after = [literal(value, column.type) for column, value in zip(sort_columns, after)]
+        query = query.filter(tuple_(*sort_columns) < tuple_(*after))
+    
+    query = query.order_by(*[column.desc() for column in sort_columns])
+    rows = query.limit(limit + 1).all()
+    
+    if len(rows) <= limit:
+        return rows, None
+    
+    rows = rows[:limit]
+    last = rows[-1]
+    if row_key is not None:
+        key = row_key(last)
+    else:
+        key = [getattr(last, column.key) for column in sort_columns]
+    return rows, encode_cursor(key)
+
+
+def set_page_headers(response: Response, next_cursor: Optional[str], total: Optional[int] = None):
+    """Expose the next cursor (and optional approximate total) on a list response."""
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    if total is not None:
+        response.headers[TOTAL_COUNT_HEADER] = str(total)
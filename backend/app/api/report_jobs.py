@@ -0,0 +1,126 @@
+"""
+Background report jobs: request a report or export, poll it, download it.
+
+A `report_job` WebSocket event is sent when a job starts and when it finishes.
+"""
+from datetime import datetime
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Response, status
+from fastapi.responses import FileResponse
+from sqlalchemy.orm import Session
+from uuid import UUID
+
+from app.db.session import get_db
+from app.models.report_job import ReportJob
+from app.models.user import User
+from app.schemas.report_job import ReportJobCreate, ReportJobResponse
+from app.api.deps import get_current_user
+from app.services.report_jobs import (
+    create_report_job,
+    download_path,
+    normalize_job_params,
+    run_report_job,
+)
+
+router = APIRouter()
+
+
+def _check_report_access(current_user: User, tenant_id: UUID):
+    # Check tenant access
+    if current_user.role != "superadmin" and (current_user.role != "tenant_admin" or current_user.tenant_id != tenant_id):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions to access this tenant",
+        )
+
+
+def _job_response(job: ReportJob) -> ReportJobResponse:
+    response = ReportJobResponse.model_validate(job)
+    if job.status == "completed":
+        response.download_url = download_path(job)
+    return response
+
+
+def _get_job(db: Session, tenant_id: UUID, job_id: UUID) -> ReportJob:
+    job = db.query(ReportJob).filter(ReportJob.id == job_id, ReportJob.tenant_id == tenant_id).first()
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Report job not found",
+        )
+    return job
+
+
+@router.post("/{tenant_id}", response_model=ReportJobResponse, status_code=status.HTTP_202_ACCEPTED)
+def create_job(
+    tenant_id: UUID,
+    job_in: ReportJobCreate,
+    background_tasks: BackgroundTasks,
+    response: Response,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Queue a report or export (kind: pdf, compliance, csv, json, ndjson,
+    parquet, arrow, sarif) and return the job without waiting for it.
+    
+    params take the same filters as the synchronous endpoints (scan_run_id,
+    columns, severity, category, remediation_status). An identical request
+    that is still pending or running is returned instead of a new job.
+    """
+    _check_report_access(current_user, tenant_id)
+    
+    try:
+        params = normalize_job_params(job_in.kind, job_in.params)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    job, created = create_report_job(db, tenant_id, job_in.kind, params, requested_by=current_user.id)
+    if created:
+        background_tasks.add_task(run_report_job, job.id)
+    else:
+        response.headers["X-Report-Job-Deduplicated"] = "true"
+    
+    return _job_response(job)
+
+
+@router.get("/{tenant_id}/{job_id}", response_model=ReportJobResponse)
+def get_job(
+    tenant_id: UUID,
+    job_id: UUID,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Get the status of a report job."""
+    _check_report_access(current_user, tenant_id)
+    return _job_response(_get_job(db, tenant_id, job_id))
+
+
+@router.get("/{tenant_id}/{job_id}/download")
+def download_job_artifact(
+    tenant_id: UUID,
+    job_id: UUID,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    """Download the artifact of a completed report job (until it expires)."""
+    _check_report_access(current_user, tenant_id)
+    job = _get_job(db, tenant_id, job_id)
+    
+    if job.status == "expired" or (
+        job.status == "completed" and job.expires_at and job.expires_at <= datetime.utcnow()
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_410_GONE,
+            detail="Report artifact has expired, request a new report",
+        )
+    if job.status != "completed":
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Report job is not completed (status: {job.status})",
+        )
+    
+    return FileResponse(
+        job.artifact_path,
+        media_type=job.content_type,
+        filename=job.filename,
+    )
@@ -0,0 +1,62 @@
+"""
+Fast JSON responses.
+
+FastAPI's default path validates an endpoint's return value against its
+response model, turns it into plain Python objects (model serialization or
+jsonable_encoder) and only then encodes JSON. For large payloads these
+helpers produce the bytes in one pass instead: pydantic-core validates ORM
+rows and writes JSON directly, and plain dicts (e.g. cached statistics) are
+encoded by orjson without the jsonable_encoder walk.
+
+orjson is optional; without it FastJSONResponse falls back to the standard
+library encoder.
+"""
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, List, Optional, Sequence, Type
+
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, TypeAdapter
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+def _default(value: Any):
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse encoded with orjson (datetimes, UUIDs and non-str keys handled natively)."""
+
+    def render(self, content: Any) -> bytes:
+        if orjson is None:
+            return super().render(content)
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+def _headers(response: Optional[Response]):
+    """Headers endpoints set on the injected Response (paging, ETag), which a returned Response would drop."""
+    return dict(response.headers) if response is not None else None
+
+
+@lru_cache(maxsize=None)
+def _list_adapter(model: Type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(List[model])
+
+
+def orm_list_response(model: Type[BaseModel], rows: Sequence[Any], response: Optional[Response] = None) -> Response:
+    """A JSON array of `model` built straight from ORM rows, validated and encoded by pydantic-core."""
+    adapter = _list_adapter(model)
+    body = adapter.dump_json(adapter.validate_python(rows, from_attributes=True))
+    return Response(content=body, media_type="application/json", headers=_headers(response))
+
+
+def json_response(content: Any, response: Optional[Response] = None) -> Response:
+    """Encode plain data (dicts, lists, datetimes, UUIDs) without jsonable_encoder."""
+    return FastJSONResponse(content, headers=_headers(response))
@@ -1,5 +1,5 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status, BackgroundTasks
 from sqlalchemy.orm import Session
 from uuid import UUID
 
@@ -10,6 +10,10 @@ from app.schemas.scan_run import ScanRunResponse
 from app.services.scan_service import run_scan
 from app.services.background_tasks import run_scan_background
 from app.api.deps import get_current_user
+from app.api.conditional import check_not_modified, make_etag
+from app.api.pagination import estimate_count, paginate_keyset, set_page_headers
+from app.api.responses import orm_list_response
+from app.services.resource_versions import data_version
 
 router = APIRouter()
 
@@ -64,10 +68,18 @@ def trigger_scan(
 @router.get("/{tenant_id}", response_model=List[ScanRunResponse])
 def list_scans(
     tenant_id: UUID,
+    request: Request,
+    response: Response,
+    limit: int = Query(50, ge=1, le=500, description="Scans per page"),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
+    include_total: bool = Query(False, description="Return an approximate total in X-Total-Count"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    """List all scan runs for a tenant."""
+    """
+    List scan runs for a tenant, newest first, one page at a time.
+    Supports If-None-Match / If-Modified-Since (304 when the page is unchanged).
+    """
     # Check tenant access
     if current_user.role != "superadmin" and (
         (current_user.role not in ("tenant_admin", "viewer")) or current_user.tenant_id != tenant_id
@@ -76,19 +88,30 @@ def list_scans(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not enough permissions to access this tenant",
         )
-    scans = (
-        db.query(ScanRun)
-        .filter(ScanRun.tenant_id == tenant_id)
-        .order_by(ScanRun.started_at.desc())
-        .all()
+    query = db.query(ScanRun).filter(ScanRun.tenant_id == tenant_id)
+    total = estimate_count(query) if include_total else None
+    scans, next_cursor = paginate_keyset(query, [ScanRun.started_at, ScanRun.id], cursor, limit)
+    set_page_headers(response, next_cursor, total)
+    
+    # The page is unchanged if the same rows come back at the same row versions
+    versions = [scan.updated_at for scan in scans if scan.updated_at]
+    not_modified = check_not_modified(
+        request,
+        response,
+        make_etag("scans", [(scan.id, scan.updated_at) for scan in scans], next_cursor, total),
+        max(versions) if versions else None,
     )
+    if not_modified:
+        return not_modified
     
-    return scans
+    return orm_list_response(ScanRunResponse, scans, response)
 
 
 @router.get("/{tenant_id}/latest", response_model=ScanRunResponse)
 def get_latest_scan(
     tenant_id: UUID,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
@@ -99,6 +122,15 @@ def get_latest_scan(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not enough permissions to access this tenant",
         )
+    
+    # The summary below depends on the tenant, its scans and findings
+    version = data_version(db, tenant_id)
+    not_modified = check_not_modified(
+        request, response, make_etag("scans.latest", version.token), version.last_modified,
+    )
+    if not_modified:
+        return not_modified
+    
     scan = (
         db.query(ScanRun)
         .filter(ScanRun.tenant_id == tenant_id)
@@ -112,43 +144,27 @@ def get_latest_scan(
             detail="No scans found for this tenant",
         )
     
-    # Recalculate summary from actual findings to ensure accuracy
+    # Recalculate summary from the scan's finding counts to ensure accuracy
     # This handles cases where findings were deduplicated or updated after scan completion
-    from app.models.finding import Finding
     from app.models.tenant import Tenant
+    from app.services.finding_counts import get_scan_counts
     
     tenant = db.query(Tenant).filter(Tenant.id == tenant_id).first()
     if tenant:
-        # Get all findings for this scan
-        all_findings = db.query(Finding).filter(Finding.scan_run_id == scan.id).all()
-        
         # Filter by enabled scanners
         enabled_scanners = tenant.enabled_scanners if tenant.enabled_scanners else ["IAM", "S3", "LOGGING", "EC2", "EBS", "RDS", "LAMBDA", "CLOUDWATCH"]
-        findings = [f for f in all_findings if f.category in enabled_scanners]
-        
-        # Recalculate summary from actual findings
-        by_severity = {
-            "CRITICAL": 0,
-            "HIGH": 0,
-            "MEDIUM": 0,
-            "LOW": 0,
-        }
-        by_category = {}
-        
-        for finding in findings:
-            by_severity[finding.severity] = by_severity.get(finding.severity, 0) + 1
-            by_category[finding.category] = by_category.get(finding.category, 0) + 1
+        counts = get_scan_counts(db, [scan.id], categories=enabled_scanners)[scan.id]
         
         # Update summary with recalculated values
         if scan.summary:
-            scan.summary["total_findings"] = len(findings)
-            scan.summary["by_severity"] = by_severity
-            scan.summary["by_category"] = by_category
+            scan.summary["total_findings"] = counts["total"]
+            scan.summary["by_severity"] = counts["by_severity"]
+            scan.summary["by_category"] = counts["by_category"]
         else:
             scan.summary = {
-                "total_findings": len(findings),
-                "by_severity": by_severity,
-                "by_category": by_category,
+                "total_findings": counts["total"],
+                "by_severity": counts["by_severity"],
+                "by_category": counts["by_category"],
             }
     
     return scan
@@ -2,172 +2,145 @@
 Statistics and analytics endpoints for dashboards.
 """
 from typing import Dict, Any
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 from uuid import UUID
 from datetime import datetime, timedelta
 
 from app.db.session import get_db
-from app.models.finding import Finding
+from app.models.scan_finding_count import ScanFindingCount
 from app.models.scan_run import ScanRun
 from app.models.tenant import Tenant
 from app.models.user import User
+from app.api.conditional import check_not_modified, make_etag
 from app.api.deps import get_current_user, require_superadmin
+from app.api.responses import json_response
+from app.services.finding_counts import (
+    empty_severity_counts,
+    enabled_category_clause,
+    get_scan_counts,
+)
+from app.services.resource_versions import data_version
+from app.services.response_cache import response_cache
 
 router = APIRouter()
 
 
 @router.get("/dashboard")
 def get_dashboard_stats(
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ) -> Dict[str, Any]:
     """
     Get dashboard statistics.
     Superadmin sees all tenants, others see only their tenant.
+    Supports If-None-Match / If-Modified-Since (304 while the data is unchanged).
     """
     # Determine which tenants to include
     if current_user.role == "superadmin":
-        tenant_ids = [t.id for t in db.query(Tenant.id).all()]
+        tenant_scope = None
     elif current_user.tenant_id:
-        tenant_ids = [current_user.tenant_id]
+        tenant_scope = current_user.tenant_id
     else:
-        tenant_ids = []
+        return _empty_dashboard_stats()
     
-    if not tenant_ids:
-        return {
-            "total_tenants": 0,
-            "total_findings": 0,
-            "findings_by_severity": {
-                "CRITICAL": 0,
-                "HIGH": 0,
-                "MEDIUM": 0,
-                "LOW": 0,
-            },
-            "findings_by_category": {},
-            "total_scans": 0,
-            "recent_scans": [],
-        }
-    
-    # Get total tenants
-    total_tenants = len(tenant_ids)
-    
-    # Get findings stats (from latest scans only)
-    latest_scan_ids = []
-    for tenant_id in tenant_ids:
-        latest_scan = (
-            db.query(ScanRun)
-            .filter(ScanRun.tenant_id == tenant_id)
-            .order_by(ScanRun.started_at.desc())
-            .first()
-        )
-        if latest_scan:
-            latest_scan_ids.append(latest_scan.id)
-    
-    # Count findings by severity (only if we have scans)
-    # Filter by enabled scanners for each tenant
-    findings_by_severity = {
-        "CRITICAL": 0,
-        "HIGH": 0,
-        "MEDIUM": 0,
-        "LOW": 0,
+    version = data_version(db, tenant_scope)
+    not_modified = check_not_modified(
+        request, response, make_etag("statistics.dashboard", version.token), version.last_modified,
+    )
+    if not_modified:
+        return not_modified
+    
+    return json_response(response_cache.get_or_compute(
+        "statistics.dashboard",
+        None if tenant_scope is None else [tenant_scope],
+        {},
+        lambda: _compute_dashboard_stats(db, tenant_scope),
+    ), response)
+
+
+def _empty_dashboard_stats() -> Dict[str, Any]:
+    return {
+        "total_tenants": 0,
+        "total_findings": 0,
+        "findings_by_severity": {
+            "CRITICAL": 0,
+            "HIGH": 0,
+            "MEDIUM": 0,
+            "LOW": 0,
+        },
+        "findings_by_category": {},
+        "total_scans": 0,
+        "recent_scans": [],
     }
+
+
+def _compute_dashboard_stats(db: Session, tenant_scope) -> Dict[str, Any]:
+    """Dashboard statistics for one tenant, or every tenant when tenant_scope is None."""
+    if tenant_scope is None:
+        total_tenants = db.query(func.count(Tenant.id)).scalar() or 0
+    else:
+        total_tenants = 1
+    
+    if not total_tenants:
+        return _empty_dashboard_stats()
+    
+    def scoped(query):
+        """Restrict a ScanRun query to the tenants this user can see."""
+        if tenant_scope is None:
+            return query
+        return query.filter(ScanRun.tenant_id == tenant_scope)
+    
+    # Latest scan per tenant (DISTINCT ON tenant_id)
+    latest_scans = (
+        scoped(db.query(ScanRun.id.label("scan_id"), ScanRun.tenant_id.label("tenant_id")))
+        .distinct(ScanRun.tenant_id)
+        .order_by(ScanRun.tenant_id, ScanRun.started_at.desc())
+        .subquery()
+    )
     
-    if latest_scan_ids:
-        # Get tenants with their enabled scanners
-        tenants = db.query(Tenant).filter(Tenant.id.in_(tenant_ids)).all()
-        tenant_enabled_scanners = {
-            t.id: (t.enabled_scanners if t.enabled_scanners else ["IAM", "S3", "LOGGING"])
-            for t in tenants
-        }
-        
-        # Get scan to tenant mapping
-        scan_tenant_map = {}
-        for tenant_id in tenant_ids:
-            latest_scan = (
-                db.query(ScanRun)
-                .filter(ScanRun.tenant_id == tenant_id)
-                .order_by(ScanRun.started_at.desc())
-                .first()
-            )
-            if latest_scan:
-                scan_tenant_map[latest_scan.id] = tenant_id
-        
-        # Filter findings by enabled scanners
-        all_findings = (
-            db.query(Finding)
-            .filter(Finding.scan_run_id.in_(latest_scan_ids))
-            .all()
+    # Count findings by severity and category from the latest scans,
+    # only including each tenant's enabled scanners
+    count_rows = (
+        db.query(
+            ScanFindingCount.severity,
+            ScanFindingCount.category,
+            func.sum(ScanFindingCount.count),
         )
-        
-        # Count by severity, only including enabled scanners
-        for finding in all_findings:
-            tenant_id = scan_tenant_map.get(finding.scan_run_id)
-            if tenant_id:
-                enabled = tenant_enabled_scanners.get(tenant_id, ["IAM", "S3", "LOGGING"])
-                if finding.category in enabled:
-                    findings_by_severity[finding.severity] = findings_by_severity.get(finding.severity, 0) + 1
+        .join(latest_scans, ScanFindingCount.scan_id == latest_scans.c.scan_id)
+        .join(Tenant, Tenant.id == latest_scans.c.tenant_id)
+        .filter(enabled_category_clause(ScanFindingCount.category, Tenant.enabled_scanners))
+        .group_by(ScanFindingCount.severity, ScanFindingCount.category)
+        .all()
+    )
     
-    # Count findings by category (only if we have scans)
-    # Filter by enabled scanners for each tenant
-    if latest_scan_ids:
-        # Get tenants with their enabled scanners
-        tenants = db.query(Tenant).filter(Tenant.id.in_(tenant_ids)).all()
-        tenant_enabled_scanners = {
-            t.id: (t.enabled_scanners if t.enabled_scanners else ["IAM", "S3", "LOGGING"])
-            for t in tenants
-        }
-        
-        # Get scan to tenant mapping
-        scan_tenant_map = {}
-        for tenant_id in tenant_ids:
-            latest_scan = (
-                db.query(ScanRun)
-                .filter(ScanRun.tenant_id == tenant_id)
-                .order_by(ScanRun.started_at.desc())
-                .first()
-            )
-            if latest_scan:
-                scan_tenant_map[latest_scan.id] = tenant_id
-        
-        # Filter findings by enabled scanners
-        all_findings = (
-            db.query(Finding)
-            .filter(Finding.scan_run_id.in_(latest_scan_ids))
-            .all()
-        )
-        
-        # Count by category, only including enabled scanners
-        findings_by_category = {}
-        for finding in all_findings:
-            tenant_id = scan_tenant_map.get(finding.scan_run_id)
-            if tenant_id:
-                enabled = tenant_enabled_scanners.get(tenant_id, ["IAM", "S3", "LOGGING"])
-                if finding.category in enabled:
-                    findings_by_category[finding.category] = findings_by_category.get(finding.category, 0) + 1
-    else:
-        findings_by_category = {}
+    findings_by_severity = empty_severity_counts()
+    findings_by_category = {}
+    for severity, category, count in count_rows:
+        findings_by_severity[severity] = findings_by_severity.get(severity, 0) + int(count)
+        findings_by_category[category] = findings_by_category.get(category, 0) + int(count)
     
     # Total findings
     total_findings = sum(findings_by_severity.values())
     
-    # Get recent scans
+    # Get recent scans with their tenant names
     recent_scans = (
-        db.query(ScanRun)
-        .filter(ScanRun.tenant_id.in_(tenant_ids))
+        scoped(db.query(ScanRun, Tenant.name))
+        .outerjoin(Tenant, Tenant.id == ScanRun.tenant_id)
         .order_by(ScanRun.started_at.desc())
         .limit(5)
         .all()
     )
     
     recent_scans_data = []
-    for scan in recent_scans:
-        tenant = db.query(Tenant).filter(Tenant.id == scan.tenant_id).first()
+    for scan, tenant_name in recent_scans:
         recent_scans_data.append({
             "id": str(scan.id),
             "tenant_id": str(scan.tenant_id),
-            "tenant_name": tenant.name if tenant else "Unknown",
+            "tenant_name": tenant_name or "Unknown",
             "status": scan.status,
             "started_at": scan.started_at.isoformat() if scan.started_at else None,
             "finished_at": scan.finished_at.isoformat() if scan.finished_at else None,
@@ -175,11 +148,7 @@ def get_dashboard_stats(
         })
     
     # Total scans
-    total_scans = (
-        db.query(func.count(ScanRun.id))
-        .filter(ScanRun.tenant_id.in_(tenant_ids))
-        .scalar()
-    ) or 0
+    total_scans = scoped(db.query(func.count(ScanRun.id))).scalar() or 0
     
     return {
         "total_tenants": total_tenants,
@@ -194,6 +163,8 @@ def get_dashboard_stats(
 @router.get("/tenant/{tenant_id}")
 def get_tenant_statistics(
     tenant_id: UUID,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ) -> Dict[str, Any]:
@@ -207,6 +178,22 @@ def get_tenant_statistics(
             detail="Not enough permissions to access this tenant",
         )
     
+    version = data_version(db, tenant_id)
+    not_modified = check_not_modified(
+        request, response, make_etag("statistics.tenant", version.token), version.last_modified,
+    )
+    if not_modified:
+        return not_modified
+    
+    return json_response(response_cache.get_or_compute(
+        "statistics.tenant",
+        [tenant_id],
+        {},
+        lambda: _compute_tenant_statistics(db, tenant_id),
+    ), response)
+
+
+def _compute_tenant_statistics(db: Session, tenant_id: UUID) -> Dict[str, Any]:
     tenant = db.query(Tenant).filter(Tenant.id == tenant_id).first()
     if not tenant:
         raise HTTPException(
@@ -239,29 +226,11 @@ def get_tenant_statistics(
             "scan_status": None,
         }
     
-    # Get findings for latest scan, filtered by enabled scanners
-    all_findings = db.query(Finding).filter(Finding.scan_run_id == latest_scan.id).all()
-    
-    # Filter by enabled scanners
+    # Get finding counts for latest scan, filtered by enabled scanners
     enabled_scanners = tenant.enabled_scanners if tenant.enabled_scanners else ["IAM", "S3", "LOGGING"]
-    findings = [f for f in all_findings if f.category in enabled_scanners]
-    
-    findings_by_severity = {
-        "CRITICAL": 0,
-        "HIGH": 0,
-        "MEDIUM": 0,
-        "LOW": 0,
-    }
-    
-    findings_by_category = {}
-    
-    for finding in findings:
-        findings_by_severity[finding.severity] = (
-            findings_by_severity.get(finding.severity, 0) + 1
-        )
-        findings_by_category[finding.category] = (
-            findings_by_category.get(finding.category, 0) + 1
-        )
+    counts = get_scan_counts(db, [latest_scan.id], categories=enabled_scanners)[latest_scan.id]
+    findings_by_severity = counts["by_severity"]
+    findings_by_category = counts["by_category"]
     
     # Total scans
     total_scans = (
@@ -273,7 +242,7 @@ def get_tenant_statistics(
     return {
         "tenant_id": str(tenant_id),
         "tenant_name": tenant.name,
-        "total_findings": len(findings),
+        "total_findings": counts["total"],
         "findings_by_severity": findings_by_severity,
         "findings_by_category": findings_by_category,
         "total_scans": total_scans,
@@ -13,6 +13,7 @@ from app.core.validation import (
     validate_aws_account_id,
     validate_external_id,
 )
+from app.services.response_cache import response_cache
 
 router = APIRouter()
 
@@ -71,6 +72,7 @@ def create_tenant(
     db.add(tenant)
     db.commit()
     db.refresh(tenant)
+    response_cache.invalidate_tenant(tenant.id)
     
     return tenant
 
@@ -145,6 +147,7 @@ def update_tenant(
     
     db.commit()
     db.refresh(tenant)
+    response_cache.invalidate_tenant(tenant.id)
     
     return tenant
 
@@ -182,6 +185,7 @@ def update_enabled_scanners(
     tenant.enabled_scanners = enabled_scanners
     db.commit()
     db.refresh(tenant)
+    response_cache.invalidate_tenant(tenant.id)
     
     return tenant
 
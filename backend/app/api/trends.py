@@ -9,10 +9,14 @@ from uuid import UUID
 from datetime import datetime, timedelta
 
 from app.db.session import get_db
-from app.models.finding import Finding
+from app.models.scan_finding_count import ScanFindingCount
 from app.models.scan_run import ScanRun
 from app.models.user import User
 from app.api.deps import get_current_user
+from app.api.responses import json_response
+from app.core.config import settings
+from app.services.finding_counts import empty_severity_counts, get_scan_counts
+from app.services.response_cache import response_cache
 
 router = APIRouter()
 
@@ -44,16 +48,39 @@ def calculate_security_score(findings_by_severity: Dict[str, int]) -> float:
     return max(0.0, min(100.0, score))
 
 
+def resolve_bucket(bucket: str, days: int, scan_count: int) -> str:
+    """
+    Pick the granularity of the history series.
+    "auto" keeps one point per scan while the window holds few scans
+    (TRENDS_AUTO_MAX_SCAN_POINTS), and beyond that bounds the number of
+    points: daily up to 90 days, weekly beyond.
+    """
+    if bucket != "auto":
+        return bucket
+    if scan_count <= settings.TRENDS_AUTO_MAX_SCAN_POINTS:
+        return "scan"
+    return "day" if days <= 90 else "week"
+
+
 @router.get("/{tenant_id}/history")
 def get_scan_history(
     tenant_id: UUID,
     days: int = Query(30, ge=1, le=365, description="Number of days of history to retrieve"),
+    bucket: str = Query(
+        "auto",
+        pattern="^(auto|scan|day|week)$",
+        description="Series granularity: one point per scan, per day or per week (auto picks scan/day/week from the window)",
+    ),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ) -> Dict[str, Any]:
     """
     Get scan history and trends for a tenant.
     Returns historical scan data with security scores and trend analysis.
+    
+    When bucketed by day or week, each point is the latest completed scan in
+    that bucket (the posture at the end of the period), with `scans_in_bucket`
+    telling how many scans it stands for.
     """
     # Check tenant access
     if current_user.role != "superadmin" and (current_user.role != "tenant_admin" or current_user.tenant_id != tenant_id):
@@ -62,13 +89,49 @@ def get_scan_history(
             detail="Not enough permissions to access this tenant",
         )
     
+    return json_response(response_cache.get_or_compute(
+        "trends.history",
+        [tenant_id],
+        {"days": days, "bucket": bucket},
+        lambda: _compute_scan_history(db, tenant_id, days, bucket),
+    ))
+
+
+def _compute_scan_history(db: Session, tenant_id: UUID, days: int, bucket: str) -> Dict[str, Any]:
     # Calculate date range
     end_date = datetime.utcnow()
     start_date = end_date - timedelta(days=days)
     
-    # Get all completed scans in the date range
-    scans = (
-        db.query(ScanRun)
+    scan_count = 0
+    if bucket == "auto":
+        scan_count = (
+            db.query(func.count(ScanRun.id))
+            .filter(
+                ScanRun.tenant_id == tenant_id,
+                ScanRun.status == "completed",
+                ScanRun.started_at >= start_date,
+                ScanRun.started_at <= end_date,
+            )
+            .scalar()
+        )
+    granularity = resolve_bucket(bucket, days, scan_count)
+    
+    # Rank completed scans in the date range within their bucket
+    if granularity == "scan":
+        partition = ScanRun.id
+    else:
+        partition = func.date_trunc(granularity, ScanRun.started_at)
+    
+    ranked_scans = (
+        db.query(
+            ScanRun.id.label("scan_id"),
+            ScanRun.started_at.label("started_at"),
+            ScanRun.finished_at.label("finished_at"),
+            func.row_number().over(
+                partition_by=partition, order_by=ScanRun.started_at.desc()
+            ).label("rank"),
+            func.count(ScanRun.id).over(partition_by=partition).label("scans_in_bucket"),
+        )
         .filter(
             and_(
                 ScanRun.tenant_id == tenant_id,
@@ -77,14 +140,31 @@ def get_scan_history(
                 ScanRun.started_at <= end_date
             )
         )
-        .order_by(ScanRun.started_at.asc())
+        .subquery()
+    )
+    
+    # One query: the representative scan of each bucket with its finding counts
+    rows = (
+        db.query(
+            ranked_scans.c.scan_id,
+            ranked_scans.c.started_at,
+            ranked_scans.c.finished_at,
+            ranked_scans.c.scans_in_bucket,
+            ScanFindingCount.category,
+            ScanFindingCount.severity,
+            ScanFindingCount.count,
+        )
+        .outerjoin(ScanFindingCount, ScanFindingCount.scan_id == ranked_scans.c.scan_id)
+        .filter(ranked_scans.c.rank == 1)
+        .order_by(ranked_scans.c.started_at.asc())
         .all()
     )
     
-    if not scans:
+    if not rows:
         return {
             "tenant_id": str(tenant_id),
             "period_days": days,
+            "bucket": granularity,
             "scans": [],
             "trends": {
                 "security_score_trend": [],
@@ -106,38 +186,27 @@ def get_scan_history(
         }
     
     # Build scan history with findings and scores
-    scan_history = []
-    for scan in scans:
-        findings = db.query(Finding).filter(Finding.scan_run_id == scan.id).all()
-        
-        findings_by_severity = {
-            "CRITICAL": 0,
-            "HIGH": 0,
-            "MEDIUM": 0,
-            "LOW": 0,
-        }
-        
-        findings_by_category = {}
-        
-        for finding in findings:
-            findings_by_severity[finding.severity] = (
-                findings_by_severity.get(finding.severity, 0) + 1
-            )
-            findings_by_category[finding.category] = (
-                findings_by_category.get(finding.category, 0) + 1
-            )
-        
-        security_score = calculate_security_score(findings_by_severity)
-        
-        scan_history.append({
-            "scan_id": str(scan.id),
-            "scan_date": scan.started_at.isoformat() if scan.started_at else None,
-            "finished_at": scan.finished_at.isoformat() if scan.finished_at else None,
-            "total_findings": len(findings),
-            "findings_by_severity": findings_by_severity,
-            "findings_by_category": findings_by_category,
-            "security_score": round(security_score, 2),
-        })
+    history_by_scan = {}
+    for scan_id, started_at, finished_at, scans_in_bucket, category, severity, count in rows:
+        entry = history_by_scan.get(scan_id)
+        if entry is None:
+            entry = history_by_scan[scan_id] = {
+                "scan_id": str(scan_id),
+                "scan_date": started_at.isoformat() if started_at else None,
+                "finished_at": finished_at.isoformat() if finished_at else None,
+                "scans_in_bucket": scans_in_bucket,
+                "total_findings": 0,
+                "findings_by_severity": empty_severity_counts(),
+                "findings_by_category": {},
+            }
+        if category is not None:
+            entry["total_findings"] += count
+            entry["findings_by_severity"][severity] = entry["findings_by_severity"].get(severity, 0) + count
+            entry["findings_by_category"][category] = entry["findings_by_category"].get(category, 0) + count
+    
+    scan_history = list(history_by_scan.values())
+    for entry in scan_history:
+        entry["security_score"] = round(calculate_security_score(entry["findings_by_severity"]), 2)
     
     # Calculate trends
     security_score_trend = [
@@ -185,7 +254,7 @@ def get_scan_history(
         ]
     
     # Calculate summary statistics
-    total_scans = len(scan_history)
+    total_scans = sum(scan["scans_in_bucket"] for scan in scan_history)
     
     if total_scans > 0:
         scores = [scan["security_score"] for scan in scan_history]
@@ -205,6 +274,7 @@ def get_scan_history(
     return {
         "tenant_id": str(tenant_id),
         "period_days": days,
+        "bucket": granularity,
         "scans": scan_history,
         "trends": {
             "security_score_trend": security_score_trend,
@@ -241,6 +311,15 @@ def compare_scans(
             detail="Not enough permissions to access this tenant",
         )
     
+    return json_response(response_cache.get_or_compute(
+        "trends.compare",
+        [tenant_id],
+        {"scan_id_1": scan_id_1, "scan_id_2": scan_id_2},
+        lambda: _compute_scan_comparison(db, tenant_id, scan_id_1, scan_id_2),
+    ))
+
+
+def _compute_scan_comparison(db: Session, tenant_id: UUID, scan_id_1: UUID, scan_id_2: UUID) -> Dict[str, Any]:
     # Get scans
     scan1 = db.query(ScanRun).filter(
         and_(ScanRun.id == scan_id_1, ScanRun.tenant_id == tenant_id)
@@ -255,30 +334,22 @@ def compare_scans(
             detail="One or both scans not found",
         )
     
-    # Get findings for both scans
-    findings1 = db.query(Finding).filter(Finding.scan_run_id == scan1.id).all()
-    findings2 = db.query(Finding).filter(Finding.scan_run_id == scan2.id).all()
+    # Get finding counts for both scans
+    scan_counts = get_scan_counts(db, [scan1.id, scan2.id])
     
     # Calculate statistics for each scan
-    def get_scan_stats(findings):
-        findings_by_severity = {"CRITICAL": 0, "HIGH": 0, "MEDIUM": 0, "LOW": 0}
-        findings_by_category = {}
-        
-        for finding in findings:
-            findings_by_severity[finding.severity] = findings_by_severity.get(finding.severity, 0) + 1
-            findings_by_category[finding.category] = findings_by_category.get(finding.category, 0) + 1
-        
-        security_score = calculate_security_score(findings_by_severity)
+    def get_scan_stats(counts):
+        security_score = calculate_security_score(counts["by_severity"])
         
         return {
-            "total_findings": len(findings),
-            "findings_by_severity": findings_by_severity,
-            "findings_by_category": findings_by_category,
+            "total_findings": counts["total"],
+            "findings_by_severity": counts["by_severity"],
+            "findings_by_category": counts["by_category"],
             "security_score": round(security_score, 2),
         }
     
-    stats1 = get_scan_stats(findings1)
-    stats2 = get_scan_stats(findings2)
+    stats1 = get_scan_stats(scan_counts[scan1.id])
+    stats2 = get_scan_stats(scan_counts[scan2.id])
     
     # Calculate differences
     findings_diff = stats2["total_findings"] - stats1["total_findings"]
@@ -1,15 +1,19 @@
 """
 WebSocket endpoints for real-time scan progress updates.
 """
+import asyncio
 import json
 import logging
-from typing import Dict, Set
+import time
+from collections import OrderedDict, deque
+from typing import Deque, Dict, List, Optional, Tuple
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from uuid import UUID
+from fastapi.concurrency import run_in_threadpool
+from uuid import UUID, uuid4
 
-from app.models.user import User
 from app.models.scan_run import ScanRun
+from app.core.auth_cache import Principal, load_principal, principal_cache, token_version
+from app.core.config import settings
 from app.core.security import decode_access_token
 
 logger = logging.getLogger(__name__)
@@ -17,57 +21,295 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
+class _Connection:
+    """
+    A WebSocket plus its bounded outgoing queue.
+
+    A dedicated writer task drains the queue, so a slow client only ever
+    delays its own messages, never the rest of the tenant's sockets.
+    """
+    
+    def __init__(self, websocket: WebSocket, tenant_id: str, max_queue: int, policy: str):
+        self.websocket = websocket
+        self.tenant_id = tenant_id
+        self.max_queue = max_queue
+        self.policy = policy
+        # Entries are (coalesce_key, serialized_text)
+        self.queue: Deque[Tuple[Optional[tuple], str]] = deque()
+        self.ready = asyncio.Event()
+        self.writer: Optional[asyncio.Task] = None
+        self.dropped = 0
+    
+    def enqueue(self, text: str, coalesce_key: Optional[tuple] = None):
+        """Queue serialized text without blocking; applies the slow-consumer policy."""
+        if self.policy == "coalesce" and coalesce_key is not None:
+            for index, (queued_key, _) in enumerate(self.queue):
+                if queued_key == coalesce_key:
+                    # Only the latest status for this key is worth sending
+                    del self.queue[index]
+                    break
+        
+        if len(self.queue) >= self.max_queue:
+            self.queue.popleft()
+            self.dropped += 1
+            if self.dropped % 100 == 1:
+                logger.warning(f"WebSocket client for tenant {self.tenant_id} is slow, dropped {self.dropped} messages")
+        
+        self.queue.append((coalesce_key, text))
+        self.ready.set()
+
+
+def _coalesce_key(message: dict) -> Optional[tuple]:
+    """Messages that describe the same state share a key and can replace each other."""
+    message_type = message.get("type")
+    if message_type in ("scan_update", "scan_status"):
+        return ("scan_status", message.get("scan_id"))
+    if message_type == "scan_progress":
+        return ("scan_progress", message.get("scan_id"), message.get("scanner") or message.get("event"))
+    return None
+
+
+def _serialize(message: dict) -> str:
+    # Same encoding as WebSocket.send_json, done once per broadcast instead of per socket
+    return json.dumps(message, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+class TenantEventLog:
+    """
+    Recent sequenced events for one tenant, kept in a bounded ring buffer.
+
+    Sequence numbers are assigned by this process and tagged with its epoch, so
+    a client reconnecting to a different (or restarted) process gets a snapshot
+    instead of a replay with mismatched numbering.
+    """
+    
+    MAX_SNAPSHOT_SCANS = 5
+    
+    def __init__(self, epoch: str, size: int):
+        self.epoch = epoch
+        self.seq = 0
+        self.events: Deque[Tuple[int, str]] = deque(maxlen=size)
+        # Latest status message per recent scan, and latest progress per scanner
+        self.scan_status: "OrderedDict[str, dict]" = OrderedDict()
+        self.progress: "OrderedDict[tuple, dict]" = OrderedDict()
+    
+    def record(self, message: dict) -> Tuple[dict, str]:
+        """Stamp a message with the next sequence number and remember it."""
+        self.seq += 1
+        message = {**message, "seq": self.seq, "epoch": self.epoch}
+        text = _serialize(message)
+        self.events.append((self.seq, text))
+        
+        scan_id = message.get("scan_id")
+        if message.get("type") in ("scan_update", "scan_status"):
+            self.scan_status.pop(scan_id, None)
+            self.scan_status[scan_id] = message
+            while len(self.scan_status) > self.MAX_SNAPSHOT_SCANS:
+                self.scan_status.popitem(last=False)
+            if message.get("status") in ("completed", "failed"):
+                for key in [k for k in self.progress if k[0] == scan_id]:
+                    del self.progress[key]
+        elif message.get("type") == "scan_progress":
+            key = (scan_id, message.get("scanner") or message.get("event"))
+            self.progress.pop(key, None)
+            self.progress[key] = message
+        return message, text
+    
+    def replay_since(self, since: int, epoch: Optional[str]) -> Optional[List[str]]:
+        """Events after `since`, or None if they are no longer (or never were) in the buffer."""
+        if epoch is not None and epoch != self.epoch:
+            return None
+        if since > self.seq:
+            return None
+        if since == self.seq:
+            return []
+        oldest = self.events[0][0] if self.events else self.seq + 1
+        if since + 1 < oldest:
+            return None
+        return [text for seq, text in self.events if seq > since]
+    
+    def snapshot(self) -> Optional[dict]:
+        """Compact current state, built from memory only."""
+        if not self.scan_status:
+            return None
+        return {
+            "type": "snapshot",
+            "seq": self.seq,
+            "epoch": self.epoch,
+            "scans": list(self.scan_status.values()),
+            "progress": list(self.progress.values()),
+        }
+
+
 class ConnectionManager:
     """Manages WebSocket connections."""
     
-    def __init__(self):
-        # tenant_id -> set of WebSocket connections
-        self.active_connections: Dict[str, Set[WebSocket]] = {}
+    def __init__(
+        self,
+        max_queue: int = settings.WS_SEND_QUEUE_SIZE,
+        policy: str = settings.WS_SLOW_CONSUMER_POLICY,
+        send_timeout: float = settings.WS_SEND_TIMEOUT_SECONDS,
+        replay_buffer_size: int = settings.WS_REPLAY_BUFFER_SIZE,
+    ):
+        # tenant_id -> {WebSocket: connection state}
+        self.active_connections: Dict[str, Dict[WebSocket, _Connection]] = {}
+        self._by_socket: Dict[WebSocket, _Connection] = {}
+        # Per-tenant replay buffers; the epoch changes every time the process starts
+        self.epoch = uuid4().hex[:12]
+        self.replay_buffer_size = replay_buffer_size
+        self.event_logs: Dict[str, TenantEventLog] = {}
+        self.max_queue = max_queue
+        self.policy = policy
+        self.send_timeout = send_timeout
+    
+    def event_log(self, tenant_id: str) -> TenantEventLog:
+        """Get (or create) the replay buffer for a tenant."""
+        log = self.event_logs.get(tenant_id)
+        if log is None:
+            log = TenantEventLog(self.epoch, self.replay_buffer_size)
+            self.event_logs[tenant_id] = log
+        return log
     
-    async def connect(self, websocket: WebSocket, tenant_id: str):
-        """Add a WebSocket connection for a tenant."""
+    async def connect(
+        self,
+        websocket: WebSocket,
+        tenant_id: str,
+        since: Optional[int] = None,
+        epoch: Optional[str] = None,
+    ) -> bool:
+        """
+        Add a WebSocket connection for a tenant.
+        
+        If `since` is given, events after that sequence number are queued for
+        the client before any new broadcast. Returns False when they cannot be
+        replayed from memory and the caller should send a snapshot instead.
+        """
         await websocket.accept()
-        if tenant_id not in self.active_connections:
-            self.active_connections[tenant_id] = set()
-        self.active_connections[tenant_id].add(websocket)
-        logger.info(f"WebSocket connected for tenant {tenant_id}. Total connections: {len(self.active_connections.get(tenant_id, set()))}")
+        connection = _Connection(websocket, tenant_id, self.max_queue + self.replay_buffer_size, self.policy)
+        connection.writer = asyncio.create_task(self._writer(connection))
+        
+        # No awaits from here on: the replay and registration must be atomic
+        # with respect to broadcasts, or events could be missed or duplicated.
+        replayed = False
+        if since is not None:
+            missed = self.event_log(tenant_id).replay_since(since, epoch)
+            if missed is not None:
+                for text in missed:
+                    connection.queue.append((None, text))
+                connection.ready.set()
+                replayed = True
+        
+        self.active_connections.setdefault(tenant_id, {})[websocket] = connection
+        self._by_socket[websocket] = connection
+        logger.info(f"WebSocket connected for tenant {tenant_id}. Total connections: {len(self.active_connections.get(tenant_id, {}))}")
+        return replayed
     
     def disconnect(self, websocket: WebSocket, tenant_id: str):
         """Remove a WebSocket connection."""
-        if tenant_id in self.active_connections:
-            self.active_connections[tenant_id].discard(websocket)
-            if not self.active_connections[tenant_id]:
-                del self.active_connections[tenant_id]
+        connections = self.active_connections.get(tenant_id)
+        if connections is None:
+            return
+        connection = connections.pop(websocket, None)
+        self._by_socket.pop(websocket, None)
+        if not connections:
+            del self.active_connections[tenant_id]
+        if connection is None:
+            return
+        if connection.writer and connection.writer is not asyncio.current_task():
+            connection.writer.cancel()
         logger.info(f"WebSocket disconnected for tenant {tenant_id}")
     
-    async def send_personal_message(self, message: dict, websocket: WebSocket):
-        """Send a message to a specific WebSocket connection."""
+    async def _writer(self, connection: _Connection):
+        """Send queued messages for one connection, in order."""
+        websocket = connection.websocket
         try:
-            await websocket.send_json(message)
+            while True:
+                if not connection.queue:
+                    connection.ready.clear()
+                    await connection.ready.wait()
+                    continue
+                _, text = connection.queue.popleft()
+                # Not wait_for: on Python 3.11 it can swallow a cancellation that races
+                # with the send completing, leaving this task alive after disconnect
+                async with asyncio.timeout(self.send_timeout):
+                    await websocket.send_text(text)
+        except asyncio.CancelledError:
+            raise
+        except asyncio.TimeoutError:
+            logger.warning(f"WebSocket send timed out for tenant {connection.tenant_id}, closing connection")
+            self.disconnect(websocket, connection.tenant_id)
+            try:
+                await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+            except Exception:
+                pass
         except Exception as e:
-            logger.error(f"Error sending WebSocket message: {e}")
+            logger.error(f"Error broadcasting to WebSocket: {e}")
+            self.disconnect(websocket, connection.tenant_id)
     
-    async def broadcast_to_tenant(self, tenant_id: str, message: dict):
-        """Broadcast a message to all connections for a tenant."""
-        if tenant_id not in self.active_connections:
-            return
-        
-        disconnected = set()
-        for connection in self.active_connections[tenant_id]:
+    async def send_personal_message(self, message: dict, websocket: WebSocket):
+        """Send a message to a specific WebSocket connection."""
+        connection = self._by_socket.get(websocket)
+        if connection is None:
             try:
-                await connection.send_json(message)
+                await websocket.send_json(message)
             except Exception as e:
-                logger.error(f"Error broadcasting to WebSocket: {e}")
-                disconnected.add(connection)
+                logger.error(f"Error sending WebSocket message: {e}")
+            return
+        # Route through the writer so sends on one socket never interleave
+        connection.enqueue(_serialize(message), _coalesce_key(message))
+    
+    async def broadcast_to_tenant(self, tenant_id: str, message: dict):
+        """Broadcast a message to all connections for a tenant without waiting on any of them."""
+        # Sequence and buffer every event, even with nobody connected, so
+        # clients that are reconnecting right now can catch up.
+        message, text = self.event_log(tenant_id).record(message)
+        
+        connections = self.active_connections.get(tenant_id)
+        if not connections:
+            return
         
-        # Clean up disconnected connections
-        for connection in disconnected:
-            self.disconnect(connection, tenant_id)
+        key = _coalesce_key(message)
+        for connection in list(connections.values()):
+            connection.enqueue(text, key)
 
 
 manager = ConnectionManager()
 
 
+def _load_principal(email: str, version: int) -> Optional[Principal]:
+    """Look a user up in a short-lived session and cache the result."""
+    from app.db.session import SessionLocal
+    db = SessionLocal()
+    try:
+        return load_principal(db, email, version)
+    finally:
+        db.close()
+
+
+def _load_scan_status(tenant_id: str) -> Optional[dict]:
+    """Latest scan status from the database, in a short-lived session."""
+    from app.db.session import SessionLocal
+    db = SessionLocal()
+    try:
+        latest_scan = (
+            db.query(ScanRun)
+            .filter(ScanRun.tenant_id == UUID(tenant_id))
+            .order_by(ScanRun.started_at.desc())
+            .first()
+        )
+        if not latest_scan:
+            return None
+        return {
+            "type": "scan_status",
+            "scan_id": str(latest_scan.id),
+            "status": latest_scan.status,
+            "started_at": latest_scan.started_at.isoformat() if latest_scan.started_at else None,
+            "summary": latest_scan.summary,
+        }
+    finally:
+        db.close()
+
+
 @router.websocket("/scan-progress/{tenant_id}")
 async def websocket_scan_progress(
     websocket: WebSocket,
@@ -78,6 +320,20 @@ async def websocket_scan_progress(
     
     Client should connect with a JWT token in query params:
     ws://host/ws/scan-progress/{tenant_id}?token=JWT_TOKEN
+    
+    Broadcast events carry `seq` and `epoch`. To resume after a disconnect,
+    reconnect with ?since=<last seq>&epoch=<epoch>: missed events are replayed
+    from memory, or a `snapshot` message is sent if they are no longer buffered.
+    Sequence numbers are increasing but may skip values for coalesced updates.
+    
+    The server sends {"type": "ping"} after WS_HEARTBEAT_INTERVAL_SECONDS of
+    silence from the client. Clients must answer it with {"type": "pong"} (any
+    message counts): sockets that send nothing for WS_IDLE_TIMEOUT_SECONDS are
+    closed, since server-sent traffic says nothing about whether the client is
+    still there. Sockets are also closed when their token expires or is
+    revoked (the user's role, tenant or password changed); authorization is
+    re-checked at least every heartbeat interval. No database connection is
+    held while connected.
     """
     try:
         # Get token from query params
@@ -100,56 +356,84 @@ async def websocket_scan_progress(
             await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
             return
         
-        # Get database session
-        from app.db.session import SessionLocal
-        db = SessionLocal()
+        # Authorize from the principal cache, loading the user only on a miss
+        version = token_version(payload)
+        current_user = principal_cache.get(email, version)
+        if current_user is None:
+            current_user = await run_in_threadpool(_load_principal, email, version)
+        if current_user is None or not current_user.can_manage_tenant(tenant_id):
+            await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+            return
+        
         try:
-            current_user = db.query(User).filter(User.email == email).first()
-            if current_user is None:
-                await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
-                return
-            
-            # Check tenant access
-            if current_user.role != "superadmin" and (
-                current_user.role != "tenant_admin" or str(current_user.tenant_id) != tenant_id
-            ):
-                await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
-                return
-            # Connect after authentication
-            await manager.connect(websocket, tenant_id)
+            # Connect after authentication, replaying missed events if possible
+            since = query_params.get("since")
+            since = int(since) if since and since.isdigit() else None
+            replayed = await manager.connect(websocket, tenant_id, since=since, epoch=query_params.get("epoch"))
             
-            # Send initial scan status
-            latest_scan = (
-                db.query(ScanRun)
-                .filter(ScanRun.tenant_id == UUID(tenant_id))
-                .order_by(ScanRun.started_at.desc())
-                .first()
-            )
+            if not replayed:
+                # Send initial scan status, from memory when this process has seen events
+                event_log = manager.event_log(tenant_id)
+                snapshot = event_log.snapshot()
+                if snapshot:
+                    await manager.send_personal_message(snapshot, websocket)
+                else:
+                    scan_status = await run_in_threadpool(_load_scan_status, tenant_id)
+                    if scan_status:
+                        await manager.send_personal_message({
+                            **scan_status,
+                            "seq": event_log.seq,
+                            "epoch": event_log.epoch,
+                        }, websocket)
             
-            if latest_scan:
-                await manager.send_personal_message({
-                    "type": "scan_status",
-                    "scan_id": str(latest_scan.id),
-                    "status": latest_scan.status,
-                    "started_at": latest_scan.started_at.isoformat() if latest_scan.started_at else None,
-                    "summary": latest_scan.summary,
-                }, websocket)
-            
-            # Keep connection alive and listen for messages
+            # Keep connection alive with heartbeats and listen for messages
+            loop = asyncio.get_running_loop()
+            token_expires_at = payload.get("exp")
+            last_seen = loop.time()
+            next_auth_check = loop.time() + settings.WS_HEARTBEAT_INTERVAL_SECONDS
             while True:
+                # Checked on every iteration: a chatty client never times out below
+                if token_expires_at and time.time() >= token_expires_at:
+                    await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+                    break
+                if loop.time() >= next_auth_check:
+                    current_user = principal_cache.get(email, version)
+                    if current_user is None:
+                        current_user = await run_in_threadpool(_load_principal, email, version)
+                    if current_user is None or not current_user.can_manage_tenant(tenant_id):
+                        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+                        break
+                    next_auth_check = loop.time() + settings.WS_HEARTBEAT_INTERVAL_SECONDS
+                
+                timeout = settings.WS_HEARTBEAT_INTERVAL_SECONDS
+                if token_expires_at:
+                    timeout = max(0.0, min(timeout, token_expires_at - time.time()))
                 try:
-                    data = await websocket.receive_text()
-                    # Echo back or handle client messages if needed
-                    message = json.loads(data) if data else {}
-                    if message.get("type") == "ping":
-                        await manager.send_personal_message({"type": "pong"}, websocket)
+                    data = await asyncio.wait_for(websocket.receive_text(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    if token_expires_at and time.time() >= token_expires_at:
+                        continue
+                    if loop.time() - last_seen > settings.WS_IDLE_TIMEOUT_SECONDS:
+                        logger.info(f"Closing idle WebSocket for tenant {tenant_id}")
+                        await websocket.close(code=status.WS_1001_GOING_AWAY)
+                        break
+                    await manager.send_personal_message({"type": "ping"}, websocket)
+                    continue
                 except WebSocketDisconnect:
                     break
                 except Exception as e:
                     logger.error(f"Error in WebSocket loop: {e}")
                     break
+                
+                last_seen = loop.time()
+                try:
+                    # Echo back or handle client messages if needed
+                    message = json.loads(data) if data else {}
+                except ValueError:
+                    continue
+                if isinstance(message, dict) and message.get("type") == "ping":
+                    await manager.send_personal_message({"type": "pong"}, websocket)
         finally:
-            db.close()
             manager.disconnect(websocket, tenant_id)
     
     except WebSocketDisconnect:
@@ -161,21 +445,3 @@ async def websocket_scan_progress(
         except:
             pass
         manager.disconnect(websocket, tenant_id)
-
-
-async def notify_scan_update(tenant_id: UUID, scan_run: ScanRun, db: Session):
-    """
-    Notify all WebSocket connections for a tenant about a scan update.
-    Call this from the scan service when scan status changes.
-    """
-    message = {
-        "type": "scan_update",
-        "scan_id": str(scan_run.id),
-        "status": scan_run.status,
-        "started_at": scan_run.started_at.isoformat() if scan_run.started_at else None,
-        "finished_at": scan_run.finished_at.isoformat() if scan_run.finished_at else None,
-        "summary": scan_run.summary,
-    }
-    
-    await manager.broadcast_to_tenant(str(tenant_id), message)
-
@@ -0,0 +1,124 @@
+"""
+Short-lived in-process cache of authenticated principals.
+
+Holds just enough about a user (id, role, tenant) to authorize a request
+without loading the users row every time.
+
+Entries are keyed by the token's subject and auth version. Changing a user's
+role, tenant or password bumps users.auth_version (bump_auth_version), which
+revokes tokens issued before the change: their version no longer matches the
+row, so the next cache miss rejects them. The process that made the change
+also evicts the user's entries at once; other processes serve them until
+AUTH_CACHE_TTL_SECONDS runs out.
+"""
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.user import User
+
+
+@dataclass(frozen=True)
+class Principal:
+    """The authorization-relevant view of a user."""
+    id: UUID
+    email: str
+    role: str
+    tenant_id: Optional[UUID]
+    auth_version: int = 0
+
+    @classmethod
+    def from_user(cls, user) -> "Principal":
+        return cls(
+            id=user.id,
+            email=user.email,
+            role=user.role,
+            tenant_id=user.tenant_id,
+            auth_version=user.auth_version or 0,
+        )
+
+    def can_manage_tenant(self, tenant_id) -> bool:
+        """Superadmin, or tenant_admin of this tenant."""
+        if self.role == "superadmin":
+            return True
+        return self.role == "tenant_admin" and str(self.tenant_id) == str(tenant_id)
+
+
+class PrincipalCache:
+    """Thread-safe TTL + LRU cache of principals keyed by (email, auth version) from the JWT."""
+
+    def __init__(self, ttl_seconds: float, max_entries: int = 10000):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple[str, int], tuple]" = OrderedDict()
+
+    def get(self, email: str, version: int = 0) -> Optional[Principal]:
+        key = (email, version)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            principal, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return principal
+
+    def put(self, principal: Principal):
+        key = (principal.email, principal.auth_version)
+        with self._lock:
+            self._entries[key] = (principal, time.monotonic() + self.ttl_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, email: Optional[str] = None):
+        """Forget every version of one principal, or everything when no email is given."""
+        with self._lock:
+            if email is None:
+                self._entries.clear()
+                return
+            for key in [key for key in self._entries if key[0] == email]:
+                del self._entries[key]
+
+
+principal_cache = PrincipalCache(settings.AUTH_CACHE_TTL_SECONDS)
+
+
+def token_version(payload: dict) -> int:
+    """Auth version a token was issued for (tokens from before versioning count as 0)."""
+    try:
+        return int(payload.get("ver") or 0)
+    except (TypeError, ValueError):
+        return -1
+
+
+def load_principal(db: Session, email: str, version: int) -> Optional[Principal]:
+    """
+    Load a principal on a cache miss and cache it.
+
+    None if the user is gone or the token was issued before the user's last
+    role, tenant or password change.
+    """
+    user = db.query(User).filter(User.email == email).first()
+    if user is None or (user.auth_version or 0) != version:
+        return None
+    principal = Principal.from_user(user)
+    principal_cache.put(principal)
+    return principal
+
+
+def bump_auth_version(user: User):
+    """
+    Revoke the user's existing tokens. Does not commit; evict the cache
+    (principal_cache.invalidate) after committing.
+    """
+    user.auth_version = (user.auth_version or 0) + 1
@@ -13,6 +13,47 @@ class Settings(BaseSettings):
     # AWS
     AWS_REGION: str = "us-east-1"
     
+    # Real-time events: "memory" (single process) or "postgres" (LISTEN/NOTIFY fan-out)
+    EVENT_BACKBONE: str = "memory"
+    
+    # WebSocket delivery: per-connection queue size, "coalesce" or "drop_oldest" when full
+    WS_SEND_QUEUE_SIZE: int = 100
+    WS_SLOW_CONSUMER_POLICY: str = "coalesce"
+    WS_SEND_TIMEOUT_SECONDS: float = 10.0
+    # Events kept per tenant for clients resuming with ?since=<seq>
+    WS_REPLAY_BUFFER_SIZE: int = 256
+    # Server pings after this much client silence; clients must answer with a pong,
+    # sockets that send nothing for the idle timeout are closed
+    WS_HEARTBEAT_INTERVAL_SECONDS: float = 25.0
+    WS_IDLE_TIMEOUT_SECONDS: float = 75.0
+    
+    # Seconds an authenticated user's role/tenant may be served from cache
+    AUTH_CACHE_TTL_SECONDS: int = 60
+    
+    # Dashboard/statistics/trends/report result cache: "memory", "postgres" (shared) or "none"
+    RESPONSE_CACHE_BACKEND: str = "memory"
+    # Backstop expiry; entries are normally invalidated by scan and remediation events
+    RESPONSE_CACHE_TTL_SECONDS: int = 300
+    
+    # Trend history with bucket=auto keeps one point per scan up to this many scans in the window
+    TRENDS_AUTO_MAX_SCAN_POINTS: int = 120
+    
+    # PDF reports: rendered in worker processes, finished scans cached on local disk
+    REPORT_RENDER_WORKERS: int = 2
+    REPORT_RENDER_TIMEOUT_SECONDS: float = 120.0
+    REPORT_CACHE_DIR: str = "/tmp/s3ntracs/reports"
+    # Findings listed per severity in a PDF; the rest are summarized per rule in an appendix
+    REPORT_MAX_FINDINGS_PER_SEVERITY: int = 500
+    
+    # Report jobs: artifacts of background reports/exports, deleted after the TTL
+    REPORT_ARTIFACT_DIR: str = "/tmp/s3ntracs/report-jobs"
+    REPORT_ARTIFACT_TTL_HOURS: int = 24
+    # Jobs still pending/running after this long are assumed lost (e.g. a restart) and failed
+    REPORT_JOB_STALE_MINUTES: int = 60
+    
+    # Responses smaller than this are sent uncompressed (compression costs more than it saves)
+    RESPONSE_COMPRESSION_MIN_BYTES: int = 1024
+    
     # Application
     LOG_LEVEL: str = "INFO"
     DEBUG: bool = False
@@ -3,11 +3,14 @@ from fastapi.middleware.cors import CORSMiddleware
 import sqlalchemy as sa
 from sqlalchemy.orm import Session
 from contextlib import asynccontextmanager
+import asyncio
 from app.core.config import settings
 from app.core.app_config import APP_NAME, APP_DESCRIPTION, APP_VERSION
 from app.core.logging_config import setup_logging
 from app.db.session import get_db
-from app.api import auth, tenants, scans, findings, reports, statistics, exports, admin, trends, websocket, pdf_reports, github, notifications, schedules, scheduler, aws_credentials
+from app.api.responses import FastJSONResponse
+from app.core.compression import CompressionMiddleware
+from app.api import auth, tenants, scans, findings, reports, statistics, exports, admin, trends, websocket, pdf_reports, github, notifications, schedules, scheduler, aws_credentials, report_jobs
 
 # Setup logging
 setup_logging()
@@ -15,6 +18,10 @@ setup_logging()
 # Background scheduler for scheduled scans
 from apscheduler.schedulers.background import BackgroundScheduler
 from app.services.scheduler_service import check_and_run_scheduled_scans
+from app.services.scan_progress import progress_bus
+from app.services.event_backbone import create_backbone
+from app.services.report_artifacts import shutdown_render_pool
+from app.services.report_jobs import purge_report_jobs
 
 scheduler_instance = BackgroundScheduler()
 
@@ -28,16 +35,35 @@ async def lifespan(app: FastAPI):
         id='check_scheduled_scans',
         replace_existing=True
     )
+    scheduler_instance.add_job(
+        purge_report_jobs,
+        'interval',
+        minutes=15,
+        id='purge_report_jobs',
+        replace_existing=True
+    )
     scheduler_instance.start()
+    # Startup: Fan tenant events out to this process's WebSocket clients
+    event_backbone = create_backbone()
+    await event_backbone.start(websocket.manager.broadcast_to_tenant)
+    # Startup: Drain scan progress events from worker threads into the backbone
+    progress_bus.attach(asyncio.get_running_loop())
+    progress_task = asyncio.create_task(progress_bus.run(event_backbone.publish))
     yield
     # Shutdown: Stop scheduler
     scheduler_instance.shutdown()
+    progress_task.cancel()
+    progress_bus.detach()
+    await event_backbone.stop()
+    shutdown_render_pool()
 
 app = FastAPI(
     title=f"{APP_NAME} API",
     description=APP_DESCRIPTION,
     version=APP_VERSION,
     lifespan=lifespan,
+    # orjson encoding for every JSON response
+    default_response_class=FastJSONResponse,
 )
 
 # CORS middleware
@@ -56,8 +82,13 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Let browsers read paging headers of list endpoints and the report job dedupe flag
+    expose_headers=["X-Next-Cursor", "X-Total-Count", "X-Report-Job-Deduplicated"],
 )
 
+# Brotli/gzip for JSON, CSV and other text bodies above the size threshold
+app.add_middleware(CompressionMiddleware, minimum_size=settings.RESPONSE_COMPRESSION_MIN_BYTES)
+
 # Include routers
 app.include_router(auth.router, prefix="/auth", tags=["auth"])
 app.include_router(tenants.router, prefix="/tenants", tags=["tenants"])
@@ -68,6 +99,7 @@ app.include_router(statistics.router, prefix="/statistics", tags=["statistics"])
 app.include_router(trends.router, prefix="/trends", tags=["trends"])
 app.include_router(websocket.router, prefix="/ws", tags=["websocket"])
 app.include_router(pdf_reports.router, prefix="/pdf", tags=["pdf"])
+app.include_router(report_jobs.router, prefix="/report-jobs", tags=["report-jobs"])
 app.include_router(admin.router, prefix="/admin", tags=["admin"])
 app.include_router(exports.router, prefix="/exports", tags=["exports"])
 app.include_router(github.router, prefix="/github", tags=["github"])
@@ -2,7 +2,10 @@ from app.models.user import User, UserActivity
 from app.models.tenant import Tenant
 from app.models.scan_run import ScanRun
 from app.models.finding import Finding
+from app.models.finding_occurrence import FindingOccurrence
+from app.models.scan_finding_count import ScanFindingCount
 from app.models.alert import Alert
+from app.models.report_job import ReportJob
 
-__all__ = ["User", "UserActivity", "Tenant", "ScanRun", "Finding", "Alert"]
+__all__ = ["User", "UserActivity", "Tenant", "ScanRun", "Finding", "FindingOccurrence", "ScanFindingCount", "Alert", "ReportJob"]
 
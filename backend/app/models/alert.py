@@ -1,14 +1,14 @@
-import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, ForeignKey, Text, DateTime
+from sqlalchemy import Column, String, ForeignKey, Text, DateTime, Index
 from sqlalchemy.dialects.postgresql import UUID
+from app.core.ids import uuid7
 from app.db.base import Base
 
 
 class Alert(Base):
     __tablename__ = "alerts"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     tenant_id = Column(UUID(as_uuid=True), ForeignKey("tenants.id"), nullable=False)
     finding_id = Column(UUID(as_uuid=True), ForeignKey("findings.id"), nullable=False)
     channel = Column(String, nullable=False)  # email, slack, webhook
@@ -17,3 +17,8 @@ class Alert(Base):
     sent_at = Column(DateTime, nullable=True)
     error_message = Column(Text, nullable=True)
 
+    __table_args__ = (
+        Index('ix_alerts_tenant_created', 'tenant_id', created_at.desc(), id.desc()),
+        Index('ix_alerts_created', created_at.desc(), id.desc()),
+        Index('ix_alerts_finding_id', 'finding_id'),
+    )
@@ -1,23 +1,30 @@
-import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, DateTime, ForeignKey, Text, Index
+from sqlalchemy import Column, String, DateTime, ForeignKey, Text, Index, text
 from sqlalchemy.dialects.postgresql import UUID, JSON
 from sqlalchemy.orm import relationship
+from app.core.ids import uuid7
 from app.db.base import Base
+from app.models.types import Category, Severity
+from app.services.finding_rules import render_rule_text
 
 
 class Finding(Base):
     __tablename__ = "findings"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     tenant_id = Column(UUID(as_uuid=True), ForeignKey("tenants.id"), nullable=False)
-    scan_run_id = Column(UUID(as_uuid=True), ForeignKey("scan_runs.id"), nullable=False)
-    category = Column(String, nullable=False)  # IAM, S3, LOGGING
+    scan_run_id = Column(UUID(as_uuid=True), ForeignKey("scan_runs.id"), nullable=False)  # Scan that first detected it
+    category = Column(Category, nullable=False)  # IAM, S3, LOGGING (SMALLINT code)
     title = Column(String, nullable=False)
-    description = Column(Text, nullable=True)
-    severity = Column(String, nullable=False)  # LOW, MEDIUM, HIGH, CRITICAL
+    severity = Column(Severity, nullable=False)  # LOW, MEDIUM, HIGH, CRITICAL (SMALLINT rank)
     resource_id = Column(String, nullable=True)
-    remediation = Column(Text, nullable=True)
+    
+    # Text of catalog findings is rendered from rule_id + params (app.services.finding_rules);
+    # the stored text columns are only filled for findings without a rule (e.g. scanner errors)
+    rule_id = Column(String, nullable=True)  # e.g., "S3_BUCKET_PUBLIC_ACL"
+    params = Column(JSON, nullable=True)  # e.g., {"bucket_name": "logs"}
+    description_text = Column("description", Text, nullable=True)
+    remediation_text = Column("remediation", Text, nullable=True)
     mapped_control = Column(String, nullable=True)  # e.g., "ISO 27001 A.9.4.3"
     
     # Remediation tracking
@@ -28,12 +35,48 @@ class Finding(Base):
     remediation_metadata = Column(JSON, nullable=True)  # Store AWS CLI commands, Terraform code, etc.
     
     created_at = Column(DateTime, default=datetime.utcnow)
+    # Row version: bumped on every ORM update, used for ETag/Last-Modified
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    @property
+    def description(self):
+        if self.rule_id:
+            return render_rule_text(self.rule_id, "description", self.params)
+        return self.description_text
+
+    @description.setter
+    def description(self, value):
+        self.description_text = value
+
+    @property
+    def remediation(self):
+        if self.rule_id:
+            return render_rule_text(self.rule_id, "remediation", self.params)
+        return self.remediation_text
+
+    @remediation.setter
+    def remediation(self, value):
+        self.remediation_text = value
 
     tenant = relationship("Tenant", back_populates="findings")
     scan_run = relationship("ScanRun", back_populates="findings")
     marked_by_user = relationship("User", foreign_keys=[marked_as_fixed_by])
+    occurrences = relationship(
+        "FindingOccurrence",
+        back_populates="finding",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
 
     __table_args__ = (
         Index('ix_findings_remediation_status', 'remediation_status'),
+        Index('ix_findings_tenant_severity_created', 'tenant_id', severity.desc(), created_at.desc(), id.desc()),
+        Index('ix_findings_scan_run_category_severity', 'scan_run_id', 'category', 'severity'),
+        Index(
+            'ix_findings_tenant_pending_verification',
+            'tenant_id',
+            postgresql_where=text("remediation_status = 'marked_fixed' AND verified_fixed_at IS NULL"),
+        ),
+        Index('ix_findings_tenant_updated', 'tenant_id', updated_at.desc()),
     )
 
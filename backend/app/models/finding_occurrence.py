@@ -0,0 +1,34 @@
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, Index
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import relationship
+from app.core.ids import uuid7
+from app.db.base import Base
+
+
+class FindingOccurrence(Base):
+    """
+    A run of consecutive completed scans in which a finding was detected.
+
+    A finding present in every scan has a single row whose range is extended
+    on each re-detection; a new row is appended only when the finding comes
+    back after a scan that did not report it. Ranges are expressed with the
+    scans' started_at, so "findings in scan S" are the rows covering S.started_at.
+    """
+    __tablename__ = "finding_occurrences"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
+    finding_id = Column(UUID(as_uuid=True), ForeignKey("findings.id", ondelete="CASCADE"), nullable=False)
+    tenant_id = Column(UUID(as_uuid=True), ForeignKey("tenants.id"), nullable=False)
+    first_scan_run_id = Column(UUID(as_uuid=True), ForeignKey("scan_runs.id", ondelete="SET NULL"), nullable=True)
+    last_scan_run_id = Column(UUID(as_uuid=True), ForeignKey("scan_runs.id", ondelete="SET NULL"), nullable=True)
+    first_seen_at = Column(DateTime, nullable=False)
+    last_seen_at = Column(DateTime, nullable=False)
+    scan_count = Column(Integer, nullable=False, default=1)
+
+    finding = relationship("Finding", back_populates="occurrences")
+
+    __table_args__ = (
+        Index('ix_finding_occurrences_finding_last_seen', 'finding_id', last_seen_at.desc()),
+        Index('ix_finding_occurrences_tenant_range', 'tenant_id', 'last_seen_at', 'first_seen_at'),
+        Index('ix_finding_occurrences_last_scan', 'last_scan_run_id'),
+    )
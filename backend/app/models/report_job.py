@@ -0,0 +1,39 @@
+from datetime import datetime
+from sqlalchemy import Column, String, DateTime, ForeignKey, Text, BigInteger, Index, text
+from sqlalchemy.dialects.postgresql import UUID, JSON
+from app.core.ids import uuid7
+from app.db.base import Base
+
+
+class ReportJob(Base):
+    """A report or export built in the background; the artifact is kept until expires_at."""
+    __tablename__ = "report_jobs"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
+    tenant_id = Column(UUID(as_uuid=True), ForeignKey("tenants.id"), nullable=False)
+    requested_by = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+    kind = Column(String, nullable=False)  # pdf, compliance, csv, json, ndjson, parquet, arrow, sarif
+    params = Column(JSON, nullable=False, default=dict)
+    # Hash of (tenant, kind, params): identical in-flight requests share one job
+    dedupe_key = Column(String, nullable=False)
+    status = Column(String, nullable=False, default="pending")  # pending, running, completed, failed, expired
+    error = Column(Text, nullable=True)
+    artifact_path = Column(String, nullable=True)
+    content_type = Column(String, nullable=True)
+    filename = Column(String, nullable=True)
+    size_bytes = Column(BigInteger, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    expires_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        Index('ix_report_jobs_tenant_created', 'tenant_id', created_at.desc(), id.desc()),
+        Index(
+            'uq_report_jobs_in_flight',
+            'dedupe_key',
+            unique=True,
+            postgresql_where=text("status IN ('pending', 'running')"),
+        ),
+        Index('ix_report_jobs_expires', 'expires_at', postgresql_where=text("status = 'completed'")),
+    )
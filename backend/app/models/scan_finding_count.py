@@ -0,0 +1,22 @@
+from sqlalchemy import Column, Integer, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import relationship
+from app.db.base import Base
+from app.models.types import Category, Severity
+
+
+class ScanFindingCount(Base):
+    """Finding counts per scan, category and severity, written when a scan completes."""
+    __tablename__ = "scan_finding_counts"
+
+    scan_id = Column(UUID(as_uuid=True), ForeignKey("scan_runs.id", ondelete="CASCADE"), primary_key=True)
+    category = Column(Category, primary_key=True)
+    severity = Column(Severity, primary_key=True)
+    tenant_id = Column(UUID(as_uuid=True), ForeignKey("tenants.id"), nullable=False)
+    count = Column(Integer, nullable=False, default=0)
+
+    scan_run = relationship("ScanRun", back_populates="finding_counts")
+
+    __table_args__ = (
+        Index('ix_scan_finding_counts_tenant_id', 'tenant_id'),
+    )
@@ -1,22 +1,36 @@
-import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, DateTime, ForeignKey, Text
+from sqlalchemy import Column, String, DateTime, ForeignKey, Text, Index, text
 from sqlalchemy.dialects.postgresql import UUID, JSON
 from sqlalchemy.orm import relationship
+from app.core.ids import uuid7
 from app.db.base import Base
 
 
 class ScanRun(Base):
     __tablename__ = "scan_runs"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     tenant_id = Column(UUID(as_uuid=True), ForeignKey("tenants.id"), nullable=False)
     status = Column(String, nullable=False, default="pending")  # pending, running, completed, failed
     started_at = Column(DateTime, nullable=True)
     finished_at = Column(DateTime, nullable=True)
     summary = Column(JSON, nullable=True)
     scan_metadata = Column(JSON, nullable=True)  # Store scan metadata (scheduled, trigger source, etc.)
+    # Row version: bumped on every ORM update, used for ETag/Last-Modified
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     tenant = relationship("Tenant", back_populates="scan_runs")
     findings = relationship("Finding", back_populates="scan_run", cascade="all, delete-orphan")
+    finding_counts = relationship("ScanFindingCount", back_populates="scan_run", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        Index('ix_scan_runs_tenant_started', 'tenant_id', started_at.desc(), id.desc()),
+        Index(
+            'ix_scan_runs_tenant_completed_started',
+            'tenant_id',
+            started_at.desc(),
+            postgresql_where=text("status = 'completed'"),
+        ),
+        Index('ix_scan_runs_tenant_running', 'tenant_id', postgresql_where=text("status = 'running'")),
+        Index('ix_scan_runs_tenant_updated', 'tenant_id', updated_at.desc()),
+    )
@@ -0,0 +1,70 @@
+"""
+Compact column types for finding severity and category.
+
+Both are stored as SMALLINT codes but read and written as their names
+("HIGH", "IAM"), so application code and API payloads keep using strings.
+Severity codes are ranks: ORDER BY severity DESC lists CRITICAL first and
+can be served straight from an index.
+"""
+from sqlalchemy import SmallInteger, case, type_coerce
+from sqlalchemy.types import TypeDecorator
+
+# Rank order: higher is more severe
+SEVERITY_CODES = {
+    "LOW": 1,
+    "MEDIUM": 2,
+    "HIGH": 3,
+    "CRITICAL": 4,
+}
+
+CATEGORY_CODES = {
+    "IAM": 1,
+    "S3": 2,
+    "LOGGING": 3,
+    "EC2": 4,
+    "EBS": 5,
+    "RDS": 6,
+    "LAMBDA": 7,
+    "CLOUDWATCH": 8,
+    "SYSTEM": 9,
+}
+
+
+class CodedString(TypeDecorator):
+    """A string drawn from a fixed vocabulary, stored as its SMALLINT code."""
+    impl = SmallInteger
+    cache_ok = True
+
+    codes: dict = {}
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.names = {code: name for name, code in self.codes.items()}
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        try:
+            return self.codes[value]
+        except KeyError:
+            raise ValueError(f"Unknown {type(self).__name__.lower()} value: {value!r}")
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return self.names.get(value, str(value))
+
+    def name_expression(self, column):
+        """SQL expression giving the name for a coded column (for text/JSON comparisons)."""
+        return case(
+            {code: name for code, name in self.names.items()},
+            value=type_coerce(column, SmallInteger),
+        )
+
+
+class Severity(CodedString):
+    codes = SEVERITY_CODES
+
+
+class Category(CodedString):
+    codes = CATEGORY_CODES
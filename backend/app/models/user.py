@@ -1,8 +1,9 @@
 import uuid
 from datetime import datetime
-from sqlalchemy import Column, String, ForeignKey, DateTime, Text
+from sqlalchemy import Column, String, ForeignKey, DateTime, Text, Index, Integer
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
+from app.core.ids import uuid7
 from app.db.base import Base
 
 
@@ -10,7 +11,7 @@ class UserActivity(Base):
     """User activity log for audit trail."""
     __tablename__ = "user_activities"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     action = Column(String, nullable=False)  # e.g., "user_created", "scan_triggered", "tenant_updated"
     resource_type = Column(String, nullable=True)  # e.g., "user", "tenant", "scan"
@@ -22,6 +23,11 @@ class UserActivity(Base):
 
     user = relationship("User", back_populates="activities")
 
+    __table_args__ = (
+        Index('ix_user_activities_created', created_at.desc(), id.desc()),
+        Index('ix_user_activities_user_created', 'user_id', created_at.desc(), id.desc()),
+    )
+
 
 class User(Base):
     __tablename__ = "users"
@@ -38,6 +44,8 @@ class User(Base):
     # Password reset fields
     reset_token = Column(String, nullable=True, index=True)  # Password reset token
     reset_token_expires = Column(DateTime, nullable=True)  # Token expiration time
+    # Bumped on role, tenant or password changes; tokens carry it as "ver"
+    auth_version = Column(Integer, nullable=False, default=0)
 
     tenant = relationship("Tenant", back_populates="users")
     activities = relationship("UserActivity", back_populates="user", cascade="all, delete-orphan")
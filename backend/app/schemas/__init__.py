@@ -3,6 +3,7 @@ from app.schemas.tenant import TenantCreate, TenantUpdate, TenantResponse
 from app.schemas.scan_run import ScanRunResponse, ScanRunCreate
 from app.schemas.finding import FindingResponse, FindingFilter
 from app.schemas.token import Token, TokenData
+from app.schemas.report_job import ReportJobCreate, ReportJobResponse
 
 __all__ = [
     "UserCreate",
@@ -17,5 +18,7 @@ __all__ = [
     "FindingFilter",
     "Token",
     "TokenData",
+    "ReportJobCreate",
+    "ReportJobResponse",
 ]
 
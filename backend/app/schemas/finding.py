@@ -9,6 +9,7 @@ class FindingResponse(BaseModel):
     tenant_id: UUID
     scan_run_id: UUID
     category: str
+    rule_id: Optional[str] = None
     title: str
     description: Optional[str] = None
     severity: str
@@ -26,6 +27,17 @@ class FindingResponse(BaseModel):
         from_attributes = True
 
 
+class FindingOccurrenceResponse(BaseModel):
+    first_scan_run_id: Optional[UUID] = None
+    last_scan_run_id: Optional[UUID] = None
+    first_seen_at: datetime
+    last_seen_at: datetime
+    scan_count: int
+
+    class Config:
+        from_attributes = True
+
+
 class FindingFilter(BaseModel):
     severity: Optional[str] = None
     category: Optional[str] = None
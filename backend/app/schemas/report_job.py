@@ -0,0 +1,29 @@
+from pydantic import BaseModel
+from typing import Optional, Dict, Any
+from uuid import UUID
+from datetime import datetime
+
+
+class ReportJobCreate(BaseModel):
+    kind: str  # pdf, compliance, csv, json, ndjson, parquet, arrow, sarif
+    params: Dict[str, Any] = {}
+
+
+class ReportJobResponse(BaseModel):
+    id: UUID
+    tenant_id: UUID
+    kind: str
+    params: Dict[str, Any]
+    status: str
+    error: Optional[str] = None
+    filename: Optional[str] = None
+    content_type: Optional[str] = None
+    size_bytes: Optional[int] = None
+    download_url: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    expires_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,215 @@
+"""
+Batch reports: the PDF and compliance reports of many tenants in one zip.
+
+Month-end reporting would otherwise mean two requests per tenant, each
+looking up the latest scan and counting its findings again. Here the report
+scan of every tenant is found with one DISTINCT ON query and the finding
+counts of all those scans come from scan_finding_counts in one query per
+set of enabled scanners. PDFs are rendered in parallel in the report process
+pool (a bounded number in flight, so memory stays flat), reports that are
+already cached on disk are reused, and the archive is streamed out entry by
+entry as the reports become ready.
+"""
+import json
+import logging
+import re
+import zipfile
+from collections import deque
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.scan_run import ScanRun
+from app.models.tenant import Tenant
+from app.services.compliance_report import compliance_report_for_scan, enabled_scanners
+from app.services.finding_counts import get_scan_counts
+from app.services.finding_export import StreamSink
+from app.services.pdf_report import render_scan_report
+from app.services.report_artifacts import report_cache, scan_report_data, submit_render
+
+logger = logging.getLogger(__name__)
+
+BATCH_REPORT_KINDS = ("pdf", "compliance")
+
+
+def parse_month(month: str) -> Tuple[datetime, datetime]:
+    """'YYYY-MM' -> [first day of the month, first day of the next month)."""
+    try:
+        start = datetime.strptime(month, "%Y-%m")
+    except ValueError:
+        raise ValueError("Invalid month. Use the YYYY-MM format")
+    if start.month == 12:
+        end = start.replace(year=start.year + 1, month=1)
+    else:
+        end = start.replace(month=start.month + 1)
+    return start, end
+
+
+def batch_report_scans(
+    db: Session,
+    tenant_ids: Optional[Sequence[UUID]] = None,
+    month: Optional[str] = None,
+) -> Tuple[List[Tenant], Dict[UUID, ScanRun]]:
+    """
+    Tenants to report on and the scan each report is built from: the latest
+    completed scan (started within `month`, if given).
+
+    Returns (tenants ordered by name, {tenant_id: scan}); tenants without a
+    matching scan are missing from the dict.
+    """
+    tenant_query = db.query(Tenant)
+    if tenant_ids:
+        tenant_query = tenant_query.filter(Tenant.id.in_(tenant_ids))
+    tenants = tenant_query.order_by(Tenant.name, Tenant.id).all()
+    if not tenants:
+        return [], {}
+
+    # Latest completed scan per tenant (DISTINCT ON tenant_id)
+    scan_query = db.query(ScanRun).filter(
+        ScanRun.status == "completed",
+        ScanRun.tenant_id.in_([tenant.id for tenant in tenants]),
+    )
+    if month:
+        start, end = parse_month(month)
+        scan_query = scan_query.filter(ScanRun.started_at >= start, ScanRun.started_at < end)
+    scans = (
+        scan_query
+        .distinct(ScanRun.tenant_id)
+        .order_by(ScanRun.tenant_id, ScanRun.started_at.desc())
+        .all()
+    )
+    return tenants, {scan.tenant_id: scan for scan in scans}
+
+
+def _batch_counts(db: Session, tenants: List[Tenant], scans: Dict[UUID, ScanRun]):
+    """
+    Finding counts of every report scan: all categories (PDF severity totals)
+    and the tenant's enabled scanners only (compliance report).
+    """
+    scan_ids = [scan.id for scan in scans.values()]
+    all_counts = get_scan_counts(db, scan_ids)
+
+    # One query per distinct set of enabled scanners, usually just a few
+    by_scanners: Dict[Tuple[str, ...], List[UUID]] = {}
+    for tenant in tenants:
+        if tenant.id in scans:
+            by_scanners.setdefault(tuple(sorted(enabled_scanners(tenant))), []).append(scans[tenant.id].id)
+    enabled_counts = {}
+    for scanners, ids in by_scanners.items():
+        enabled_counts.update(get_scan_counts(db, ids, categories=list(scanners)))
+
+    return all_counts, enabled_counts
+
+
+def _entry_prefix(tenant: Tenant) -> str:
+    """Archive folder of a tenant: readable name plus id prefix (names need not be unique)."""
+    name = re.sub(r"[^A-Za-z0-9._-]+", "_", tenant.name).strip("_") or "tenant"
+    return f"{name}-{str(tenant.id)[:8]}"
+
+
+def stream_batch_reports(
+    db: Session,
+    tenant_ids: Optional[Sequence[UUID]] = None,
+    month: Optional[str] = None,
+    kinds: Sequence[str] = BATCH_REPORT_KINDS,
+) -> Iterator[bytes]:
+    """
+    A zip archive with one folder per tenant (report.pdf, compliance.json)
+    and a manifest.json listing every tenant, its scan and any error.
+
+    A tenant whose report fails is recorded in the manifest and skipped;
+    the rest of the archive is still produced.
+    """
+    tenants, scans = batch_report_scans(db, tenant_ids, month)
+    all_counts, enabled_counts = _batch_counts(db, tenants, scans)
+
+    sink = StreamSink()
+    archive = zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_DEFLATED)
+    manifest: List[Dict[str, Any]] = []
+
+    # PDFs being rendered, oldest first: (tenant, entry, future)
+    in_flight = deque()
+    max_in_flight = max(1, settings.REPORT_RENDER_WORKERS * 2)
+
+    def finish_oldest():
+        tenant, entry, future = in_flight.popleft()
+        try:
+            # Stored through the cache's single flight: a concurrent /pdf request for
+            # this scan waits for this render, or this one reuses the file it stored
+            cached = report_cache.get_or_render(
+                scans[tenant.id].id,
+                tenant.name,
+                lambda: future.result(timeout=settings.REPORT_RENDER_TIMEOUT_SECONDS),
+            )
+            archive.write(cached.path, f"{entry['folder']}/report.pdf", compress_type=zipfile.ZIP_STORED)
+            entry["files"].append("report.pdf")
+        except Exception as e:
+            logger.error(f"Batch PDF report failed for tenant {tenant.id}: {e}", exc_info=True)
+            entry["errors"].append(f"pdf: {e}")
+        finally:
+            # Not needed if another request stored the report first
+            future.cancel()
+
+    try:
+        for tenant in tenants:
+            scan = scans.get(tenant.id)
+            entry = {
+                "tenant_id": str(tenant.id),
+                "tenant_name": tenant.name,
+                "folder": _entry_prefix(tenant),
+                "scan_run_id": str(scan.id) if scan else None,
+                "scan_date": scan.started_at.isoformat() if scan and scan.started_at else None,
+                "files": [],
+                "errors": [],
+            }
+            manifest.append(entry)
+            if scan is None:
+                entry["errors"].append("No completed scan in the reporting period")
+                continue
+
+            if "compliance" in kinds:
+                try:
+                    report = compliance_report_for_scan(db, tenant, scan, counts=enabled_counts[scan.id])
+                    archive.writestr(f"{entry['folder']}/compliance.json", json.dumps(report, default=str))
+                    entry["files"].append("compliance.json")
+                except Exception as e:
+                    logger.error(f"Batch compliance report failed for tenant {tenant.id}: {e}", exc_info=True)
+                    entry["errors"].append(f"compliance: {e}")
+
+            if "pdf" in kinds:
+                cached = report_cache.get(scan.id, tenant.name)
+                if cached:
+                    archive.write(cached.path, f"{entry['folder']}/report.pdf", compress_type=zipfile.ZIP_STORED)
+                    entry["files"].append("report.pdf")
+                else:
+                    try:
+                        data = scan_report_data(db, scan, tenant, severity_totals=all_counts[scan.id]["by_severity"])
+                        in_flight.append((tenant, entry, submit_render(render_scan_report, data)))
+                    except Exception as e:
+                        logger.error(f"Batch PDF report failed for tenant {tenant.id}: {e}", exc_info=True)
+                        entry["errors"].append(f"pdf: {e}")
+                    while len(in_flight) >= max_in_flight:
+                        finish_oldest()
+                        yield sink.drain()
+
+            yield sink.drain()
+
+        while in_flight:
+            finish_oldest()
+            yield sink.drain()
+    finally:
+        # Client went away: don't leave renders queued in the pool
+        for _, _, future in in_flight:
+            future.cancel()
+
+    archive.writestr("manifest.json", json.dumps({
+        "generated_at": datetime.utcnow().isoformat(),
+        "month": month,
+        "kinds": list(kinds),
+        "tenants": manifest,
+    }, indent=2))
+    archive.close()
+    yield sink.drain()
@@ -0,0 +1,143 @@
+"""
+Compliance snapshot report: findings of a tenant's latest scan mapped to
+common compliance frameworks.
+"""
+from typing import Any, Dict, List, Optional
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Session
+from uuid import UUID
+
+from app.models.finding import Finding
+from app.models.scan_run import ScanRun
+from app.models.tenant import Tenant
+from app.services.finding_counts import DEFAULT_ENABLED_SCANNERS, get_scan_counts
+from app.services.finding_history import seen_in_scan
+
+
+def build_compliance_report(db: Session, tenant_id: UUID) -> Dict[str, Any]:
+    """
+    Build the report for the latest scan.
+    
+    Raises HTTPException when there is no completed latest scan or no tenant.
+    """
+    # Get latest scan
+    scan = (
+        db.query(ScanRun)
+        .filter(ScanRun.tenant_id == tenant_id)
+        .order_by(ScanRun.started_at.desc())
+        .first()
+    )
+    
+    if not scan:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No scans found for this tenant",
+        )
+    
+    if scan.status != "completed":
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Latest scan is not completed (status: {scan.status})",
+        )
+    
+    # Get tenant to check enabled scanners
+    tenant = db.query(Tenant).filter(Tenant.id == tenant_id).first()
+    if not tenant:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Tenant not found",
+        )
+    
+    return compliance_report_for_scan(db, tenant, scan)
+
+
+def enabled_scanners(tenant: Tenant) -> List[str]:
+    return tenant.enabled_scanners if tenant.enabled_scanners else DEFAULT_ENABLED_SCANNERS
+
+
+def compliance_report_for_scan(
+    db: Session,
+    tenant: Tenant,
+    scan: ScanRun,
+    counts: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Build the report for a given completed scan.
+    
+    counts (a get_scan_counts entry limited to the tenant's enabled scanners)
+    can be passed in when the caller has already fetched them for many scans.
+    """
+    tenant_id = tenant.id
+    
+    # Get all findings for this scan, filtered by enabled scanners
+    scanners = enabled_scanners(tenant)
+    findings = (
+        db.query(Finding)
+        .filter(seen_in_scan(scan), Finding.category.in_(scanners))
+        .all()
+    )
+    if counts is None:
+        counts = get_scan_counts(db, [scan.id], categories=scanners)[scan.id]
+    
+    # Group by compliance framework
+    compliance_mapping = {
+        "ISO 27001": [],
+        "GDPR": [],
+        "SOC 2": [],
+        "NIST CSF": [],
+    }
+    
+    # Map findings to controls
+    for finding in findings:
+        if finding.mapped_control:
+            if "ISO 27001" in finding.mapped_control:
+                compliance_mapping["ISO 27001"].append({
+                    "control": finding.mapped_control,
+                    "finding_id": str(finding.id),
+                    "title": finding.title,
+                    "severity": finding.severity,
+                    "category": finding.category,
+                })
+            elif "GDPR" in finding.mapped_control:
+                compliance_mapping["GDPR"].append({
+                    "control": finding.mapped_control,
+                    "finding_id": str(finding.id),
+                    "title": finding.title,
+                    "severity": finding.severity,
+                    "category": finding.category,
+                })
+        
+        # Generic mappings
+        if finding.severity in ["HIGH", "CRITICAL"]:
+            compliance_mapping["SOC 2"].append({
+                "control": "CC6 - Logical and Physical Access Controls",
+                "finding_id": str(finding.id),
+                "title": finding.title,
+                "severity": finding.severity,
+            })
+    
+    # Build report
+    report = {
+        "tenant_id": str(tenant_id),
+        "scan_run_id": str(scan.id),
+        "scan_date": scan.started_at.isoformat() if scan.started_at else None,
+        "summary": scan.summary or {},
+        "findings_by_severity": counts["by_severity"],
+        "findings_by_category": counts["by_category"],
+        "compliance_mapping": compliance_mapping,
+        "all_findings": [
+            {
+                "id": str(f.id),
+                "category": f.category,
+                "title": f.title,
+                "severity": f.severity,
+                "resource_id": f.resource_id,
+                "remediation": f.remediation,
+                "mapped_control": f.mapped_control,
+            }
+            for f in findings
+        ],
+    }
+    
+    return report
+
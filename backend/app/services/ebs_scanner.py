@@ -2,6 +2,7 @@ import boto3
 from typing import List, Dict
 from botocore.exceptions import ClientError
 from app.core.config import settings
+from app.services.finding_rules import rule_finding
 
 
 def scan_ebs(session: boto3.Session) -> List[Dict]:
@@ -33,29 +34,16 @@ def scan_ebs(session: boto3.Session) -> List[Dict]:
                     attachments = volume.get("Attachments", [])
                     attached_to = attachments[0].get("InstanceId", "unknown") if attachments else "unattached"
                     
-                    findings.append({
-                        "category": "EBS",
-                        "title": f"EBS volume not encrypted: {volume_id}",
-                        "description": f"EBS volume '{volume_id}' is not encrypted at rest. State: {volume_state}. Attached to: {attached_to if attachments else 'unattached'}.",
-                        "severity": "HIGH",
-                        "resource_id": volume_arn,
-                        "remediation": f"Enable encryption for EBS volume '{volume_id}'. Note: This requires creating a new encrypted volume and migrating data, or enabling encryption during volume creation.",
-                        "mapped_control": "ISO 27001 A.10.1.1",
-                    })
+                    findings.append(rule_finding(
+                        "EBS_VOLUME_NOT_ENCRYPTED", volume_arn,
+                        volume_id=volume_id, volume_state=volume_state, attached_to=attached_to,
+                    ))
                 
                 # Check if volume has a KMS key (if encrypted)
                 if encrypted:
                     kms_key_id = volume.get("KmsKeyId")
                     if not kms_key_id:
-                        findings.append({
-                            "category": "EBS",
-                            "title": f"EBS volume encrypted but no KMS key specified: {volume_id}",
-                            "description": f"EBS volume '{volume_id}' is encrypted but does not have a KMS key ID specified. This may use the default AWS-managed key.",
-                            "severity": "LOW",
-                            "resource_id": volume_arn,
-                            "remediation": f"Consider using a customer-managed KMS key for EBS volume '{volume_id}' for better key management and compliance.",
-                            "mapped_control": "ISO 27001 A.10.1.2",
-                        })
+                        findings.append(rule_finding("EBS_VOLUME_NO_KMS_KEY", volume_arn, volume_id=volume_id))
                 
                 # Check volume type (performance/security consideration)
                 volume_type = volume.get("VolumeType", "unknown")
@@ -72,15 +60,10 @@ def scan_ebs(session: boto3.Session) -> List[Dict]:
                         age_days = (now - create_time.replace(tzinfo=timezone.utc)).days
                         
                         if age_days > 30:
-                            findings.append({
-                                "category": "EBS",
-                                "title": f"Orphaned EBS volume detected: {volume_id}",
-                                "description": f"EBS volume '{volume_id}' has been in 'available' state (unattached) for {age_days} days. This may indicate an orphaned volume incurring unnecessary costs.",
-                                "severity": "LOW",
-                                "resource_id": volume_arn,
-                                "remediation": f"Review EBS volume '{volume_id}' - if it's no longer needed, delete it to reduce costs. If it's needed, attach it to an instance or create a snapshot and delete the volume.",
-                                "mapped_control": None,
-                            })
+                            findings.append(rule_finding(
+                                "EBS_VOLUME_ORPHANED", volume_arn,
+                                volume_id=volume_id, age_days=age_days,
+                            ))
         
         # Check EBS snapshots for encryption
         try:
@@ -99,15 +82,10 @@ def scan_ebs(session: boto3.Session) -> List[Dict]:
                     # Check encryption status
                     encrypted = snapshot.get("Encrypted", False)
                     if not encrypted:
-                        findings.append({
-                            "category": "EBS",
-                            "title": f"EBS snapshot not encrypted: {snapshot_id}",
-                            "description": f"EBS snapshot '{snapshot_id}' is not encrypted, which may contain sensitive data.",
-                            "severity": "MEDIUM",
-                            "resource_id": snapshot_arn,
-                            "remediation": f"Ensure future snapshots are encrypted. Copy this snapshot to create an encrypted version if needed.",
-                            "mapped_control": "ISO 27001 A.10.1.1",
-                        })
+                        findings.append(rule_finding(
+                            "EBS_SNAPSHOT_NOT_ENCRYPTED", snapshot_arn,
+                            snapshot_id=snapshot_id,
+                        ))
         except ClientError as e:
             # May not have permission to list snapshots or get account ID
             if "AccessDenied" not in str(e) and "UnauthorizedOperation" not in str(e):
@@ -2,6 +2,7 @@ import boto3
 from typing import List, Dict
 from botocore.exceptions import ClientError
 from app.core.config import settings
+from app.services.finding_rules import rule_finding
 
 
 def scan_ec2(session: boto3.Session) -> List[Dict]:
@@ -45,27 +46,14 @@ def scan_ec2(session: boto3.Session) -> List[Dict]:
                     if ip_protocol == "-1":
                         for ip_range in rule.get("IpRanges", []):
                             if ip_range.get("CidrIp") == "0.0.0.0/0":
-                                findings.append({
-                                    "category": "EC2",
-                                    "title": f"Security Group allows all inbound traffic: {sg_id}",
-                                    "description": f"Security Group '{sg_id}' ({sg_name}) allows all inbound traffic from the internet (0.0.0.0/0).",
-                                    "severity": "CRITICAL",
-                                    "resource_id": sg_id,
-                                    "remediation": f"Restrict Security Group '{sg_id}' to specific IP ranges or VPC CIDR blocks only.",
-                                    "mapped_control": "ISO 27001 A.9.1.2",
-                                })
+                                findings.append(rule_finding("EC2_SG_ALL_INBOUND", sg_id, sg_id=sg_id, sg_name=sg_name))
                                 break
                         for ipv6_range in rule.get("Ipv6Ranges", []):
                             if ipv6_range.get("CidrIpv6") == "::/0":
-                                findings.append({
-                                    "category": "EC2",
-                                    "title": f"Security Group allows all inbound traffic (IPv6): {sg_id}",
-                                    "description": f"Security Group '{sg_id}' ({sg_name}) allows all inbound traffic from the internet (::/0).",
-                                    "severity": "CRITICAL",
-                                    "resource_id": sg_id,
-                                    "remediation": f"Restrict Security Group '{sg_id}' to specific IPv6 ranges only.",
-                                    "mapped_control": "ISO 27001 A.9.1.2",
-                                })
+                                findings.append(rule_finding(
+                                    "EC2_SG_ALL_INBOUND_IPV6", sg_id,
+                                    sg_id=sg_id, sg_name=sg_name,
+                                ))
                                 break
                     
                     # Check for specific risky ports open to the world
@@ -79,42 +67,24 @@ def scan_ec2(session: boto3.Session) -> List[Dict]:
                                 # Check if open to internet
                                 for ip_range in rule.get("IpRanges", []):
                                     if ip_range.get("CidrIp") == "0.0.0.0/0":
-                                        findings.append({
-                                            "category": "EC2",
-                                            "title": f"Security Group has {service_name} (port {port}) open to internet: {sg_id}",
-                                            "description": f"Security Group '{sg_id}' ({sg_name}) allows inbound {service_name} traffic (port {port}) from the internet (0.0.0.0/0).",
-                                            "severity": "HIGH",
-                                            "resource_id": sg_id,
-                                            "remediation": f"Restrict port {port} access in Security Group '{sg_id}' to specific IP ranges or remove the rule if not needed.",
-                                            "mapped_control": "ISO 27001 A.9.1.2",
-                                        })
+                                        findings.append(rule_finding(
+                                            "EC2_SG_RISKY_PORT_OPEN", sg_id,
+                                            service_name=service_name, port=port, sg_id=sg_id, sg_name=sg_name,
+                                        ))
                                         break
                                 
                                 # Check IPv6
                                 for ipv6_range in rule.get("Ipv6Ranges", []):
                                     if ipv6_range.get("CidrIpv6") == "::/0":
-                                        findings.append({
-                                            "category": "EC2",
-                                            "title": f"Security Group has {service_name} (port {port}) open to internet (IPv6): {sg_id}",
-                                            "description": f"Security Group '{sg_id}' ({sg_name}) allows inbound {service_name} traffic (port {port}) from the internet (::/0).",
-                                            "severity": "HIGH",
-                                            "resource_id": sg_id,
-                                            "remediation": f"Restrict port {port} access in Security Group '{sg_id}' to specific IPv6 ranges only.",
-                                            "mapped_control": "ISO 27001 A.9.1.2",
-                                        })
+                                        findings.append(rule_finding(
+                                            "EC2_SG_RISKY_PORT_OPEN_IPV6", sg_id,
+                                            service_name=service_name, port=port, sg_id=sg_id, sg_name=sg_name,
+                                        ))
                                         break
                 
                 # Check for empty security groups (may indicate misconfiguration)
                 if len(sg.get("IpPermissions", [])) == 0:
-                    findings.append({
-                        "category": "EC2",
-                        "title": f"Security Group with no ingress rules: {sg_id}",
-                        "description": f"Security Group '{sg_id}' ({sg_name}) has no inbound rules. This may indicate a misconfiguration.",
-                        "severity": "LOW",
-                        "resource_id": sg_id,
-                        "remediation": f"Review Security Group '{sg_id}' - ensure it's intentional that no ingress rules exist.",
-                        "mapped_control": None,
-                    })
+                    findings.append(rule_finding("EC2_SG_NO_INGRESS", sg_id, sg_id=sg_id, sg_name=sg_name))
     
     except ClientError as e:
         print(f"Error scanning EC2 Security Groups: {e}")
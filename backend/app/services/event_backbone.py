@@ -0,0 +1,217 @@
+"""
+Pub/sub backbone for tenant events (scan progress, scan updates).
+
+Every API process owns WebSocket connections for some tenants, while scans can
+run in any process. Events are published to a backbone and each process fans
+them out locally to its own sockets.
+
+Backends:
+- memory: single process, delivers straight to the local connection manager
+- postgres: LISTEN/NOTIFY on the application database (no extra infrastructure)
+"""
+import asyncio
+import json
+import logging
+import threading
+from typing import Awaitable, Callable, Optional
+
+from sqlalchemy.engine import make_url
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+Deliver = Callable[[str, dict], Awaitable[None]]
+
+
+class EventBackbone:
+    """Base class for event backbones."""
+
+    async def start(self, deliver: Deliver):
+        """Start receiving events; `deliver` fans them out to local sockets."""
+        raise NotImplementedError
+
+    async def publish(self, tenant_id: str, message: dict):
+        """Publish an event to every process."""
+        raise NotImplementedError
+
+    async def stop(self):
+        """Release backbone resources."""
+
+
+class InProcessBackbone(EventBackbone):
+    """Delivers events to the current process only."""
+
+    def __init__(self):
+        self._deliver: Optional[Deliver] = None
+
+    async def start(self, deliver: Deliver):
+        self._deliver = deliver
+
+    async def publish(self, tenant_id: str, message: dict):
+        if self._deliver is not None:
+            await self._deliver(tenant_id, message)
+
+
+class PostgresBackbone(EventBackbone):
+    """
+    Fans events out across processes with Postgres LISTEN/NOTIFY.
+
+    Each process holds one dedicated listener connection registered with the
+    event loop (no polling thread) and a separate connection for NOTIFY.
+    Events published by this process come back through LISTEN like everyone
+    else's, so local sockets are only ever fed from the listener.
+    """
+
+    CHANNEL = "s3ntracs_events"
+    # Postgres rejects NOTIFY payloads of 8000 bytes or more
+    MAX_PAYLOAD_BYTES = 7900
+    RECONNECT_DELAY_SECONDS = 5
+
+    def __init__(self, database_url: str):
+        # psycopg2 expects a libpq URL, not an SQLAlchemy driver URL
+        self.dsn = make_url(database_url).set(drivername="postgresql").render_as_string(
+            hide_password=False
+        )
+        self._deliver: Optional[Deliver] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._listen_conn = None
+        self._notify_conn = None
+        self._notify_lock = threading.Lock()
+        self._queue: Optional[asyncio.Queue] = None
+        self._delivery_task: Optional[asyncio.Task] = None
+        self._reconnect_task: Optional[asyncio.Task] = None
+        self._stopped = False
+
+    def _connect(self):
+        import psycopg2
+        from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+
+        conn = psycopg2.connect(self.dsn)
+        conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+        return conn
+
+    async def start(self, deliver: Deliver):
+        self._deliver = deliver
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue()
+        self._stopped = False
+        self._delivery_task = asyncio.create_task(self._deliver_loop())
+        try:
+            await self._listen()
+        except Exception as e:
+            logger.error(f"Failed to start Postgres event listener: {e}", exc_info=True)
+            self._schedule_reconnect()
+
+    async def _listen(self):
+        conn = await self._loop.run_in_executor(None, self._connect)
+        with conn.cursor() as cursor:
+            cursor.execute(f"LISTEN {self.CHANNEL}")
+        self._listen_conn = conn
+        self._loop.add_reader(conn.fileno(), self._on_readable)
+        logger.info(f"Listening for tenant events on Postgres channel '{self.CHANNEL}'")
+
+    def _on_readable(self):
+        conn = self._listen_conn
+        try:
+            conn.poll()
+        except Exception as e:
+            logger.error(f"Postgres event listener lost its connection: {e}")
+            self._drop_listener()
+            self._schedule_reconnect()
+            return
+
+        while conn.notifies:
+            notify = conn.notifies.pop(0)
+            try:
+                event = json.loads(notify.payload)
+                self._queue.put_nowait((event["tenant_id"], event["message"]))
+            except (ValueError, KeyError) as e:
+                logger.warning(f"Ignoring malformed tenant event: {e}")
+
+    def _drop_listener(self):
+        conn = self._listen_conn
+        self._listen_conn = None
+        if conn is None:
+            return
+        try:
+            self._loop.remove_reader(conn.fileno())
+        except Exception:
+            pass
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def _schedule_reconnect(self):
+        if self._stopped or (self._reconnect_task and not self._reconnect_task.done()):
+            return
+        self._reconnect_task = self._loop.create_task(self._reconnect())
+
+    async def _reconnect(self):
+        while not self._stopped:
+            await asyncio.sleep(self.RECONNECT_DELAY_SECONDS)
+            try:
+                await self._listen()
+                return
+            except Exception as e:
+                logger.warning(f"Postgres event listener reconnect failed: {e}")
+
+    async def _deliver_loop(self):
+        while True:
+            tenant_id, message = await self._queue.get()
+            try:
+                await self._deliver(tenant_id, message)
+            except Exception as e:
+                logger.error(f"Failed to deliver tenant event: {e}", exc_info=True)
+
+    def _encode(self, tenant_id: str, message: dict) -> str:
+        payload = json.dumps({"tenant_id": tenant_id, "message": message}, default=str)
+        if len(payload.encode("utf-8")) > self.MAX_PAYLOAD_BYTES and "summary" in message:
+            # Scan summaries are the only unbounded field; clients can refetch the scan
+            trimmed = {**message, "summary": None, "summary_truncated": True}
+            payload = json.dumps({"tenant_id": tenant_id, "message": trimmed}, default=str)
+        return payload
+
+    def _notify(self, payload: str):
+        with self._notify_lock:
+            for attempt in range(2):
+                try:
+                    if self._notify_conn is None or self._notify_conn.closed:
+                        self._notify_conn = self._connect()
+                    with self._notify_conn.cursor() as cursor:
+                        cursor.execute("SELECT pg_notify(%s, %s)", (self.CHANNEL, payload))
+                    return
+                except Exception:
+                    self._notify_conn = None
+                    if attempt:
+                        raise
+
+    async def publish(self, tenant_id: str, message: dict):
+        payload = self._encode(tenant_id, message)
+        if len(payload.encode("utf-8")) > self.MAX_PAYLOAD_BYTES:
+            logger.error(f"Tenant event too large for NOTIFY ({message.get('type')}), dropping")
+            return
+        await asyncio.get_running_loop().run_in_executor(None, self._notify, payload)
+
+    async def stop(self):
+        self._stopped = True
+        if self._reconnect_task:
+            self._reconnect_task.cancel()
+        if self._delivery_task:
+            self._delivery_task.cancel()
+        self._drop_listener()
+        with self._notify_lock:
+            if self._notify_conn is not None:
+                self._notify_conn.close()
+                self._notify_conn = None
+
+
+def create_backbone(name: Optional[str] = None) -> EventBackbone:
+    """Create the backbone selected by settings.EVENT_BACKBONE."""
+    name = (name or settings.EVENT_BACKBONE).lower()
+    if name == "postgres":
+        return PostgresBackbone(settings.DATABASE_URL)
+    if name != "memory":
+        logger.warning(f"Unknown EVENT_BACKBONE '{name}', falling back to in-process delivery")
+    return InProcessBackbone()
@@ -0,0 +1,123 @@
+"""
+Per-scan finding counts (scan_finding_counts).
+
+Counts are written in the same transaction that completes a scan, so
+statistics, trends and reports can aggregate a few small rows instead of
+loading every Finding.
+"""
+import json
+from typing import Dict, Iterable, List, Optional
+from uuid import UUID
+from sqlalchemy import and_, case, cast, func, literal
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Session
+
+from app.models.finding import Finding
+from app.models.scan_finding_count import ScanFindingCount
+from app.models.scan_run import ScanRun
+from app.models.types import SEVERITY_CODES
+from app.services.finding_history import seen_in_scan
+
+SEVERITIES = sorted(SEVERITY_CODES, key=SEVERITY_CODES.get, reverse=True)
+DEFAULT_ENABLED_SCANNERS = ["IAM", "S3", "LOGGING"]
+
+
+def empty_severity_counts() -> Dict[str, int]:
+    return {severity: 0 for severity in SEVERITIES}
+
+
+def record_scan_finding_counts(db: Session, scan_id: UUID, tenant_id: UUID):
+    """
+    (Re)write the counts for a scan from its findings.
+    Does not commit: call it before the commit that completes the scan.
+    """
+    db.flush()
+    scan_run = db.query(ScanRun).filter(ScanRun.id == scan_id).first()
+    rows = (
+        db.query(Finding.category, Finding.severity, func.count(Finding.id))
+        .filter(seen_in_scan(scan_run))
+        .group_by(Finding.category, Finding.severity)
+        .all()
+    )
+    db.query(ScanFindingCount).filter(ScanFindingCount.scan_id == scan_id).delete(synchronize_session=False)
+    db.add_all([
+        ScanFindingCount(
+            scan_id=scan_id,
+            tenant_id=tenant_id,
+            category=category,
+            severity=severity,
+            count=count,
+        )
+        for category, severity, count in rows
+    ])
+
+
+def refresh_scan_finding_counts(db: Session, scan_ids: Iterable[UUID], tenant_id: UUID):
+    """Recompute counts after findings were deleted outside of a scan."""
+    for scan_id in set(scan_ids):
+        if scan_id is not None:
+            record_scan_finding_counts(db, scan_id, tenant_id)
+
+
+def get_scan_counts(
+    db: Session,
+    scan_ids: List[UUID],
+    categories: Optional[List[str]] = None,
+) -> Dict[UUID, Dict]:
+    """
+    Severity and category breakdowns for each scan.
+
+    Returns {scan_id: {"total": int, "by_severity": {...}, "by_category": {...}}};
+    scans without findings get zeroed entries.
+    """
+    result = {
+        scan_id: {"total": 0, "by_severity": empty_severity_counts(), "by_category": {}}
+        for scan_id in scan_ids
+    }
+    if not scan_ids:
+        return result
+
+    query = (
+        db.query(
+            ScanFindingCount.scan_id,
+            ScanFindingCount.category,
+            ScanFindingCount.severity,
+            ScanFindingCount.count,
+        )
+        .filter(ScanFindingCount.scan_id.in_(scan_ids))
+    )
+    if categories is not None:
+        query = query.filter(ScanFindingCount.category.in_(categories))
+
+    for scan_id, category, severity, count in query.all():
+        counts = result[scan_id]
+        counts["total"] += count
+        counts["by_severity"][severity] = counts["by_severity"].get(severity, 0) + count
+        counts["by_category"][category] = counts["by_category"].get(category, 0) + count
+
+    return result
+
+
+def enabled_category_clause(category_column, enabled_scanners_column, default: List[str] = DEFAULT_ENABLED_SCANNERS):
+    """
+    SQL condition: `category_column` is one of the tenant's enabled scanners.
+
+    Mirrors `tenant.enabled_scanners if tenant.enabled_scanners else default`:
+    a NULL, JSON null or empty list falls back to `default`.
+    """
+    enabled = cast(enabled_scanners_column, JSONB)
+    effective = case(
+        (
+            and_(
+                func.jsonb_typeof(enabled) == "array",
+                enabled != cast(literal("[]"), JSONB),
+            ),
+            enabled,
+        ),
+        else_=cast(literal(json.dumps(default)), JSONB),
+    )
+    # Coded category columns are compared by name
+    if hasattr(category_column.type, "name_expression"):
+        category_column = category_column.type.name_expression(category_column)
+    # jsonb `?` tests whether the string is a top-level array element
+    return effective.op("?")(category_column)
@@ -0,0 +1,307 @@
+"""
+Streaming finding exports (CSV, JSON, NDJSON, Parquet, Arrow).
+
+Exports read findings through a server-side cursor (yield_per) and hand them
+out in fixed-size chunks, so memory use does not grow with the number of
+findings and the first bytes go out as soon as the first chunk is fetched.
+Only the columns needed for the requested fields are selected; description
+and remediation are rendered from the rule catalog per row.
+
+Parquet and Arrow output need pyarrow, which is imported on first use.
+"""
+import csv
+import io
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Iterator, List, Optional, Sequence, Tuple
+from uuid import UUID
+from sqlalchemy.orm import Session
+
+from app.models.finding import Finding
+from app.models.scan_run import ScanRun
+from app.services.finding_history import seen_in_scan
+from app.services.finding_rules import render_rule_text
+
+# Rows fetched from the cursor (and written) per chunk
+EXPORT_CHUNK_SIZE = 1000
+
+# Rows per Parquet row group / Arrow record batch
+COLUMNAR_CHUNK_SIZE = 10000
+
+# Low-cardinality fields written as dictionary-encoded columns
+DICTIONARY_COLUMNS = {"category", "severity", "mapped_control", "remediation_status"}
+
+# Values of Finding.remediation_status accepted as an export filter
+REMEDIATION_STATUSES = ("open", "marked_fixed", "verified_fixed", "false_positive")
+
+
+def _text(field: str) -> Callable[[Any], Optional[str]]:
+    stored = f"{field}_text"
+
+    def value(row):
+        if row.rule_id:
+            return render_rule_text(row.rule_id, field, row.params)
+        return getattr(row, stored)
+
+    return value
+
+
+def _plain(value):
+    """Text-format value: timestamps as ISO 8601."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+@dataclass(frozen=True)
+class ExportColumn:
+    """One exported field: its CSV header, the columns it reads and how to build the value."""
+    name: str
+    header: str
+    sources: Tuple
+    value: Callable[[Any], Any]
+
+
+EXPORT_COLUMNS = {
+    column.name: column
+    for column in [
+        ExportColumn("id", "ID", (Finding.id,), lambda row: str(row.id)),
+        ExportColumn("category", "Category", (Finding.category,), lambda row: row.category),
+        ExportColumn("title", "Title", (Finding.title,), lambda row: row.title),
+        ExportColumn(
+            "description", "Description",
+            (Finding.rule_id, Finding.params, Finding.description_text),
+            _text("description"),
+        ),
+        ExportColumn("severity", "Severity", (Finding.severity,), lambda row: row.severity),
+        ExportColumn("resource_id", "Resource ID", (Finding.resource_id,), lambda row: row.resource_id),
+        ExportColumn(
+            "remediation", "Remediation",
+            (Finding.rule_id, Finding.params, Finding.remediation_text),
+            _text("remediation"),
+        ),
+        ExportColumn("mapped_control", "Mapped Control", (Finding.mapped_control,), lambda row: row.mapped_control),
+        ExportColumn(
+            "remediation_status", "Remediation Status",
+            (Finding.remediation_status,), lambda row: row.remediation_status,
+        ),
+        ExportColumn("created_at", "Created At", (Finding.created_at,), lambda row: row.created_at),
+    ]
+}
+
+# Fields exported when no projection is requested
+DEFAULT_EXPORT_COLUMNS = [
+    "id", "category", "title", "description", "severity",
+    "resource_id", "remediation", "mapped_control", "created_at",
+]
+
+
+def resolve_export_columns(columns: Optional[str]) -> List[ExportColumn]:
+    """
+    Parse a comma-separated field list ("id,title,severity").
+
+    Raises ValueError for unknown fields; no list means the default fields.
+    """
+    if not columns:
+        return [EXPORT_COLUMNS[name] for name in DEFAULT_EXPORT_COLUMNS]
+
+    names = [name.strip().lower() for name in columns.split(",") if name.strip()]
+    unknown = [name for name in names if name not in EXPORT_COLUMNS]
+    if unknown or not names:
+        raise ValueError(
+            f"Unknown export columns: {', '.join(unknown) or columns}. "
+            f"Must be any of: {', '.join(EXPORT_COLUMNS)}"
+        )
+    # Keep the requested order, drop repeats
+    return [EXPORT_COLUMNS[name] for name in dict.fromkeys(names)]
+
+
+def resolve_remediation_status(remediation_status: Optional[str]) -> Optional[str]:
+    """Normalize a remediation_status filter. Raises ValueError for unknown statuses."""
+    if not remediation_status:
+        return None
+    value = remediation_status.strip().lower()
+    if value not in REMEDIATION_STATUSES:
+        raise ValueError(f"Invalid remediation_status. Must be one of: {', '.join(REMEDIATION_STATUSES)}")
+    return value
+
+
+def export_query(
+    db: Session,
+    tenant_id: UUID,
+    columns: Sequence[ExportColumn],
+    scan: Optional[ScanRun] = None,
+    severity: Optional[str] = None,
+    category: Optional[str] = None,
+    remediation_status: Optional[str] = None,
+):
+    """Findings to export, selecting only the columns the export reads, most severe first."""
+    entities = []
+    for column in columns:
+        for source in column.sources:
+            if source not in entities:
+                entities.append(source)
+
+    query = db.query(*entities).filter(Finding.tenant_id == tenant_id)
+    if scan is not None:
+        query = query.filter(seen_in_scan(scan))
+    if severity:
+        query = query.filter(Finding.severity == severity)
+    if category:
+        query = query.filter(Finding.category == category)
+    if remediation_status:
+        query = query.filter(Finding.remediation_status == remediation_status)
+
+    return query.order_by(
+        Finding.severity.desc(),
+        Finding.created_at.desc(),
+        Finding.id.desc(),
+    )
+
+
+def iter_export_chunks(db: Session, query, chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[List]:
+    """Yield lists of at most chunk_size rows, streamed from a server-side cursor."""
+    result = db.execute(query.statement.execution_options(yield_per=chunk_size))
+    try:
+        for partition in result.partitions():
+            yield partition
+    finally:
+        result.close()
+
+
+def stream_csv(db: Session, query, columns: Sequence[ExportColumn]) -> Iterator[str]:
+    """CSV text, one header chunk and then one chunk per cursor partition."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def flush() -> str:
+        text = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
+        return text
+
+    writer.writerow([column.header for column in columns])
+    yield flush()
+
+    for rows in iter_export_chunks(db, query):
+        for row in rows:
+            writer.writerow([
+                "" if value is None else _plain(value)
+                for value in (column.value(row) for column in columns)
+            ])
+        yield flush()
+
+
+def _record(row, columns: Sequence[ExportColumn]) -> dict:
+    return {column.name: _plain(column.value(row)) for column in columns}
+
+
+def stream_json(db: Session, query, columns: Sequence[ExportColumn]) -> Iterator[str]:
+    """A JSON array, written incrementally one chunk of objects at a time."""
+    separator = "\n"
+    yield "["
+    for rows in iter_export_chunks(db, query):
+        parts = []
+        for row in rows:
+            parts.append(separator + json.dumps(_record(row, columns)))
+            separator = ",\n"
+        yield "".join(parts)
+    yield "\n]\n"
+
+
+def stream_ndjson(db: Session, query, columns: Sequence[ExportColumn]) -> Iterator[str]:
+    """Newline-delimited JSON: one finding object per line."""
+    for rows in iter_export_chunks(db, query):
+        yield "".join(json.dumps(_record(row, columns)) + "\n" for row in rows)
+
+
+class StreamSink(io.RawIOBase):
+    """
+    Write-only file object that hands written bytes back to a generator.
+
+    tell() keeps counting across drains, because the Parquet writer records
+    absolute offsets in the file footer.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def _arrow_schema(columns: Sequence[ExportColumn]):
+    import pyarrow as pa
+
+    fields = []
+    for column in columns:
+        if column.name == "created_at":
+            arrow_type = pa.timestamp("us")
+        elif column.name in DICTIONARY_COLUMNS:
+            arrow_type = pa.dictionary(pa.int32(), pa.string())
+        else:
+            arrow_type = pa.string()
+        fields.append(pa.field(column.name, arrow_type))
+    return pa.schema(fields)
+
+
+def _arrow_batch(rows, columns: Sequence[ExportColumn], schema):
+    import pyarrow as pa
+
+    arrays = []
+    for column, field in zip(columns, schema):
+        values = [column.value(row) for row in rows]
+        if pa.types.is_dictionary(field.type):
+            arrays.append(pa.array(values, type=pa.string()).dictionary_encode())
+        else:
+            arrays.append(pa.array(values, type=field.type))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def stream_parquet(db: Session, query, columns: Sequence[ExportColumn]) -> Iterator[bytes]:
+    """A Parquet file, one row group per cursor chunk."""
+    import pyarrow.parquet as pq
+
+    schema = _arrow_schema(columns)
+    sink = StreamSink()
+    writer = pq.ParquetWriter(sink, schema, compression="zstd")
+    try:
+        for rows in iter_export_chunks(db, query, COLUMNAR_CHUNK_SIZE):
+            writer.write_batch(_arrow_batch(rows, columns, schema))
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+def stream_arrow(db: Session, query, columns: Sequence[ExportColumn]) -> Iterator[bytes]:
+    """An Arrow IPC stream, one record batch per cursor chunk."""
+    import pyarrow as pa
+
+    schema = _arrow_schema(columns)
+    sink = StreamSink()
+    writer = pa.ipc.new_stream(sink, schema)
+    try:
+        for rows in iter_export_chunks(db, query, COLUMNAR_CHUNK_SIZE):
+            writer.write_batch(_arrow_batch(rows, columns, schema))
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
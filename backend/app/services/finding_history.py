@@ -0,0 +1,156 @@
+"""
+Finding occurrence history (finding_occurrences).
+
+A finding is one row for as long as the issue persists; which scans saw it is
+recorded as ranges of consecutive completed scans. Re-detecting a finding in
+the next scan extends its open range in place, so a scan no longer rewrites
+every active finding row, and older scans keep their findings.
+"""
+from datetime import datetime
+from typing import Iterable, List, Optional
+from uuid import UUID
+from sqlalchemy import and_, exists
+from sqlalchemy.orm import Session
+
+from app.models.finding import Finding
+from app.models.finding_occurrence import FindingOccurrence
+from app.models.scan_run import ScanRun
+
+
+def scan_seen_at(scan_run: ScanRun) -> datetime:
+    """Point in time that represents a scan inside occurrence ranges."""
+    return scan_run.started_at or datetime.utcnow()
+
+
+def previous_completed_scan_id(db: Session, scan_run: ScanRun) -> Optional[UUID]:
+    """The tenant's last completed scan before this one, if any."""
+    row = (
+        db.query(ScanRun.id)
+        .filter(
+            ScanRun.tenant_id == scan_run.tenant_id,
+            ScanRun.status == "completed",
+            ScanRun.id != scan_run.id,
+            ScanRun.started_at <= scan_seen_at(scan_run),
+        )
+        .order_by(ScanRun.started_at.desc())
+        .first()
+    )
+    return row[0] if row else None
+
+
+def record_occurrences(
+    db: Session,
+    scan_run: ScanRun,
+    redetected: Iterable[Finding],
+    new: Iterable[Finding],
+):
+    """
+    Record that a scan saw these findings. Does not commit.
+
+    Findings also seen by the previous completed scan get their open range
+    extended with one UPDATE; the others (new findings, or findings coming
+    back after a gap) get a fresh range.
+    """
+    seen_at = scan_seen_at(scan_run)
+    redetected_ids = {finding.id for finding in redetected}
+
+    extendable_ids: List[UUID] = []
+    if redetected_ids:
+        previous_scan_id = previous_completed_scan_id(db, scan_run)
+        if previous_scan_id is not None:
+            open_ranges = (
+                db.query(FindingOccurrence.id, FindingOccurrence.finding_id)
+                .filter(
+                    FindingOccurrence.tenant_id == scan_run.tenant_id,
+                    FindingOccurrence.last_scan_run_id == previous_scan_id,
+                )
+                .all()
+            )
+            for occurrence_id, finding_id in open_ranges:
+                if finding_id in redetected_ids:
+                    extendable_ids.append(occurrence_id)
+                    redetected_ids.discard(finding_id)
+
+    if extendable_ids:
+        (
+            db.query(FindingOccurrence)
+            .filter(FindingOccurrence.id.in_(extendable_ids))
+            .update(
+                {
+                    FindingOccurrence.last_scan_run_id: scan_run.id,
+                    FindingOccurrence.last_seen_at: seen_at,
+                    FindingOccurrence.scan_count: FindingOccurrence.scan_count + 1,
+                },
+                synchronize_session=False,
+            )
+        )
+
+    # redetected_ids now only holds findings that reappeared after a gap
+    for finding_id in redetected_ids:
+        db.add(_new_occurrence(scan_run, seen_at, finding_id=finding_id))
+    for finding in new:
+        db.add(_new_occurrence(scan_run, seen_at, finding=finding))
+
+
+def _new_occurrence(scan_run: ScanRun, seen_at: datetime, **target) -> FindingOccurrence:
+    return FindingOccurrence(
+        tenant_id=scan_run.tenant_id,
+        first_scan_run_id=scan_run.id,
+        last_scan_run_id=scan_run.id,
+        first_seen_at=seen_at,
+        last_seen_at=seen_at,
+        scan_count=1,
+        **target,
+    )
+
+
+def seen_in_scan(scan_run: ScanRun):
+    """
+    SQL condition: the Finding was detected by this scan.
+
+    Ranges only span completed scans, so a completed scan is matched by time.
+    Any other scan (failed, or still running and recording its results) saw
+    exactly the findings whose range it opened or extended last; a failed
+    scan between two completed ones does not fall inside their ranges.
+    """
+    if scan_run.status == "completed":
+        seen_at = scan_seen_at(scan_run)
+        in_range = and_(
+            FindingOccurrence.first_seen_at <= seen_at,
+            FindingOccurrence.last_seen_at >= seen_at,
+        )
+    else:
+        in_range = FindingOccurrence.last_scan_run_id == scan_run.id
+    return and_(
+        Finding.tenant_id == scan_run.tenant_id,
+        exists().where(
+            FindingOccurrence.finding_id == Finding.id,
+            FindingOccurrence.tenant_id == scan_run.tenant_id,
+            in_range,
+        ),
+    )
+
+
+def scan_findings_query(db: Session, scan_run: ScanRun):
+    """Query for every finding detected by a scan."""
+    return db.query(Finding).filter(seen_in_scan(scan_run))
+
+
+def scan_ids_for_findings(db: Session, finding_ids: Iterable[UUID]) -> List[UUID]:
+    """Completed scans whose results include any of these findings."""
+    finding_ids = list(finding_ids)
+    if not finding_ids:
+        return []
+    rows = (
+        db.query(ScanRun.id)
+        .join(FindingOccurrence, FindingOccurrence.tenant_id == ScanRun.tenant_id)
+        .filter(
+            FindingOccurrence.finding_id.in_(finding_ids),
+            ScanRun.status == "completed",
+            ScanRun.started_at >= FindingOccurrence.first_seen_at,
+            ScanRun.started_at <= FindingOccurrence.last_seen_at,
+        )
+        .distinct()
+        .all()
+    )
+    return [row[0] for row in rows]
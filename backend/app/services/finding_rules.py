@@ -0,0 +1,350 @@
+"""
+Finding rule catalog.
+
+Scanners report findings as a rule ID plus a small parameter map (bucket
+name, user name, port, ...). The rule holds the category, severity, control
+mapping and the text templates, so a finding row stores only the rule ID and
+its parameters instead of the fully rendered description and remediation.
+Text is rendered when a finding is read (see Finding.description).
+
+Rule IDs are persisted: never rename or remove one. Rewording a template is
+fine - existing findings pick up the new wording on the next read.
+"""
+import logging
+import re
+import string
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class FindingRule:
+    """Static part of a finding; text fields are str.format templates over the params."""
+    rule_id: str
+    category: str
+    severity: str
+    title: str
+    description: str
+    remediation: str
+    mapped_control: Optional[str] = None
+
+
+_RULES = [
+    # IAM
+    FindingRule(
+        "IAM_USER_NO_MFA", "IAM", "HIGH",
+        title="IAM user without MFA: {username}",
+        description="The IAM user '{username}' does not have MFA enabled.",
+        remediation="Enable MFA for user '{username}' using AWS Console or CLI.",
+        mapped_control="ISO 27001 A.9.4.3",
+    ),
+    FindingRule(
+        "IAM_USER_ADMIN_ACCESS", "IAM", "HIGH",
+        title="IAM user with AdministratorAccess: {username}",
+        description="The IAM user '{username}' has AdministratorAccess policy attached.",
+        remediation="Apply principle of least privilege. Remove AdministratorAccess and grant specific permissions.",
+        mapped_control="ISO 27001 A.9.2.2",
+    ),
+    FindingRule(
+        "IAM_USER_PERMISSIVE_INLINE_POLICY", "IAM", "MEDIUM",
+        title="IAM user with overly permissive inline policy: {username}",
+        description="The IAM user '{username}' has an inline policy that may be overly permissive.",
+        remediation="Review and restrict inline policy permissions.",
+        mapped_control="ISO 27001 A.9.2.2",
+    ),
+    # S3
+    FindingRule(
+        "S3_BUCKET_PUBLIC_ACL", "S3", "HIGH",
+        title="Public S3 bucket: {bucket_name}",
+        description="S3 bucket '{bucket_name}' has public access via ACL.",
+        remediation="Remove public ACL grants from bucket '{bucket_name}'.",
+        mapped_control="ISO 27001 A.9.1.2",
+    ),
+    FindingRule(
+        "S3_BUCKET_PUBLIC_POLICY", "S3", "HIGH",
+        title="Public S3 bucket via policy: {bucket_name}",
+        description="S3 bucket '{bucket_name}' has a bucket policy that allows public access.",
+        remediation="Review and restrict bucket policy for '{bucket_name}'.",
+        mapped_control="ISO 27001 A.9.1.2",
+    ),
+    FindingRule(
+        "S3_BUCKET_NO_ENCRYPTION", "S3", "MEDIUM",
+        title="S3 bucket without encryption: {bucket_name}",
+        description="S3 bucket '{bucket_name}' does not have default encryption enabled.",
+        remediation="Enable default encryption (SSE-S3 or SSE-KMS) for bucket '{bucket_name}'.",
+        mapped_control="ISO 27001 A.10.1.1",
+    ),
+    # Logging
+    FindingRule(
+        "CLOUDTRAIL_NOT_ENABLED", "LOGGING", "HIGH",
+        title="CloudTrail not enabled",
+        description="No CloudTrail trails are currently logging in this AWS account.",
+        remediation="Enable CloudTrail logging for AWS account activity monitoring.",
+        mapped_control="ISO 27001 A.12.4.1",
+    ),
+    FindingRule(
+        "CLOUDTRAIL_NO_GLOBAL_EVENTS", "LOGGING", "MEDIUM",
+        title="CloudTrail missing global service events",
+        description="CloudTrail trails are enabled but do not capture global service events.",
+        remediation="Enable 'Include global service events' in CloudTrail configuration.",
+        mapped_control="ISO 27001 A.12.4.1",
+    ),
+    FindingRule(
+        "GUARDDUTY_NOT_ENABLED", "LOGGING", "MEDIUM",
+        title="GuardDuty not enabled",
+        description="GuardDuty is not enabled in this AWS account.",
+        remediation="Enable GuardDuty for threat detection and continuous monitoring.",
+        mapped_control="ISO 27001 A.12.4.2",
+    ),
+    FindingRule(
+        "GUARDDUTY_DETECTOR_DISABLED", "LOGGING", "MEDIUM",
+        title="GuardDuty detector disabled: {detector_id}",
+        description="GuardDuty detector '{detector_id}' exists but is not enabled.",
+        remediation="Enable GuardDuty detector '{detector_id}'.",
+        mapped_control="ISO 27001 A.12.4.2",
+    ),
+    # EC2
+    FindingRule(
+        "EC2_SG_ALL_INBOUND", "EC2", "CRITICAL",
+        title="Security Group allows all inbound traffic: {sg_id}",
+        description="Security Group '{sg_id}' ({sg_name}) allows all inbound traffic from the internet (0.0.0.0/0).",
+        remediation="Restrict Security Group '{sg_id}' to specific IP ranges or VPC CIDR blocks only.",
+        mapped_control="ISO 27001 A.9.1.2",
+    ),
+    FindingRule(
+        "EC2_SG_ALL_INBOUND_IPV6", "EC2", "CRITICAL",
+        title="Security Group allows all inbound traffic (IPv6): {sg_id}",
+        description="Security Group '{sg_id}' ({sg_name}) allows all inbound traffic from the internet (::/0).",
+        remediation="Restrict Security Group '{sg_id}' to specific IPv6 ranges only.",
+        mapped_control="ISO 27001 A.9.1.2",
+    ),
+    FindingRule(
+        "EC2_SG_RISKY_PORT_OPEN", "EC2", "HIGH",
+        title="Security Group has {service_name} (port {port}) open to internet: {sg_id}",
+        description="Security Group '{sg_id}' ({sg_name}) allows inbound {service_name} traffic (port {port}) from the internet (0.0.0.0/0).",
+        remediation="Restrict port {port} access in Security Group '{sg_id}' to specific IP ranges or remove the rule if not needed.",
+        mapped_control="ISO 27001 A.9.1.2",
+    ),
+    FindingRule(
+        "EC2_SG_RISKY_PORT_OPEN_IPV6", "EC2", "HIGH",
+        title="Security Group has {service_name} (port {port}) open to internet (IPv6): {sg_id}",
+        description="Security Group '{sg_id}' ({sg_name}) allows inbound {service_name} traffic (port {port}) from the internet (::/0).",
+        remediation="Restrict port {port} access in Security Group '{sg_id}' to specific IPv6 ranges only.",
+        mapped_control="ISO 27001 A.9.1.2",
+    ),
+    FindingRule(
+        "EC2_SG_NO_INGRESS", "EC2", "LOW",
+        title="Security Group with no ingress rules: {sg_id}",
+        description="Security Group '{sg_id}' ({sg_name}) has no inbound rules. This may indicate a misconfiguration.",
+        remediation="Review Security Group '{sg_id}' - ensure it's intentional that no ingress rules exist.",
+    ),
+    # EBS
+    FindingRule(
+        "EBS_VOLUME_NOT_ENCRYPTED", "EBS", "HIGH",
+        title="EBS volume not encrypted: {volume_id}",
+        description="EBS volume '{volume_id}' is not encrypted at rest. State: {volume_state}. Attached to: {attached_to}.",
+        remediation="Enable encryption for EBS volume '{volume_id}'. Note: This requires creating a new encrypted volume and migrating data, or enabling encryption during volume creation.",
+        mapped_control="ISO 27001 A.10.1.1",
+    ),
+    FindingRule(
+        "EBS_VOLUME_NO_KMS_KEY", "EBS", "LOW",
+        title="EBS volume encrypted but no KMS key specified: {volume_id}",
+        description="EBS volume '{volume_id}' is encrypted but does not have a KMS key ID specified. This may use the default AWS-managed key.",
+        remediation="Consider using a customer-managed KMS key for EBS volume '{volume_id}' for better key management and compliance.",
+        mapped_control="ISO 27001 A.10.1.2",
+    ),
+    FindingRule(
+        "EBS_VOLUME_ORPHANED", "EBS", "LOW",
+        title="Orphaned EBS volume detected: {volume_id}",
+        description="EBS volume '{volume_id}' has been in 'available' state (unattached) for {age_days} days. This may indicate an orphaned volume incurring unnecessary costs.",
+        remediation="Review EBS volume '{volume_id}' - if it's no longer needed, delete it to reduce costs. If it's needed, attach it to an instance or create a snapshot and delete the volume.",
+    ),
+    FindingRule(
+        "EBS_SNAPSHOT_NOT_ENCRYPTED", "EBS", "MEDIUM",
+        title="EBS snapshot not encrypted: {snapshot_id}",
+        description="EBS snapshot '{snapshot_id}' is not encrypted, which may contain sensitive data.",
+        remediation="Ensure future snapshots are encrypted. Copy this snapshot to create an encrypted version if needed.",
+        mapped_control="ISO 27001 A.10.1.1",
+    ),
+    # RDS
+    FindingRule(
+        "RDS_INSTANCE_NOT_ENCRYPTED", "RDS", "HIGH",
+        title="RDS instance not encrypted: {db_id}",
+        description="RDS instance '{db_id}' ({db_engine}) does not have encryption at rest enabled.",
+        remediation="Enable encryption at rest for RDS instance '{db_id}'. Note: This requires creating a new instance with encryption enabled.",
+        mapped_control="ISO 27001 A.10.1.1",
+    ),
+    FindingRule(
+        "RDS_INSTANCE_PUBLIC", "RDS", "HIGH",
+        title="RDS instance is publicly accessible: {db_id}",
+        description="RDS instance '{db_id}' ({db_engine}) is configured to be publicly accessible, which poses a security risk.",
+        remediation="Modify RDS instance '{db_id}' to disable public accessibility. Use a bastion host or VPN for secure access instead.",
+        mapped_control="ISO 27001 A.9.1.2",
+    ),
+    FindingRule(
+        "RDS_INSTANCE_NO_BACKUPS", "RDS", "MEDIUM",
+        title="RDS instance has no automated backups: {db_id}",
+        description="RDS instance '{db_id}' ({db_engine}) does not have automated backups enabled.",
+        remediation="Enable automated backups for RDS instance '{db_id}' with an appropriate retention period (recommended: 7+ days).",
+        mapped_control="ISO 27001 A.12.3.1",
+    ),
+    FindingRule(
+        "RDS_INSTANCE_NO_MINOR_UPGRADE", "RDS", "LOW",
+        title="RDS instance has auto minor version upgrade disabled: {db_id}",
+        description="RDS instance '{db_id}' ({db_engine}) does not have automatic minor version upgrades enabled, which may result in running outdated software.",
+        remediation="Enable automatic minor version upgrades for RDS instance '{db_id}' to keep the database engine updated with security patches.",
+        mapped_control="ISO 27001 A.12.6.1",
+    ),
+    FindingRule(
+        "RDS_INSTANCE_NOT_MULTI_AZ", "RDS", "LOW",
+        title="RDS instance not in Multi-AZ mode: {db_id}",
+        description="RDS instance '{db_id}' ({db_engine}) is not configured for Multi-AZ deployment, which reduces availability and durability.",
+        remediation="Consider enabling Multi-AZ for RDS instance '{db_id}' for better availability and data durability.",
+    ),
+    FindingRule(
+        "RDS_SNAPSHOT_NOT_ENCRYPTED", "RDS", "MEDIUM",
+        title="RDS snapshot not encrypted: {snapshot_id}",
+        description="RDS snapshot '{snapshot_id}' is not encrypted, which may contain sensitive data.",
+        remediation="Ensure future snapshots are encrypted. Copy this snapshot to create an encrypted version if needed.",
+        mapped_control="ISO 27001 A.10.1.1",
+    ),
+    # Lambda
+    FindingRule(
+        "LAMBDA_NOT_IN_VPC", "LAMBDA", "LOW",
+        title="Lambda function not in VPC: {func_name}",
+        description="Lambda function '{func_name}' is not configured to run within a VPC, which may be required for accessing private resources.",
+        remediation="Configure Lambda function '{func_name}' with VPC settings if it needs to access private resources.",
+    ),
+    FindingRule(
+        "LAMBDA_ROLE_OVERLY_PERMISSIVE", "LAMBDA", "HIGH",
+        title="Lambda function has overly permissive IAM role: {func_name}",
+        description="Lambda function '{func_name}' uses an IAM role with overly permissive policies (AdministratorAccess/PowerUserAccess).",
+        remediation="Apply principle of least privilege to Lambda function '{func_name}'. Grant only the specific permissions required for the function to operate.",
+        mapped_control="ISO 27001 A.9.2.2",
+    ),
+    FindingRule(
+        "LAMBDA_ROLE_FULL_ACCESS", "LAMBDA", "MEDIUM",
+        title="Lambda function has full access policy: {func_name}",
+        description="Lambda function '{func_name}' uses an IAM role with a full access policy, which may grant excessive permissions.",
+        remediation="Review and restrict IAM role permissions for Lambda function '{func_name}' to only what's necessary.",
+        mapped_control="ISO 27001 A.9.2.2",
+    ),
+    FindingRule(
+        "LAMBDA_ROLE_WILDCARD_ACTION", "LAMBDA", "MEDIUM",
+        title="Lambda function has wildcard action in IAM policy: {func_name}",
+        description="Lambda function '{func_name}' uses an IAM role with a policy containing wildcard actions ('{action}'), which may grant excessive permissions.",
+        remediation="Restrict IAM policy for Lambda function '{func_name}' to specific actions only.",
+        mapped_control="ISO 27001 A.9.2.2",
+    ),
+    FindingRule(
+        "LAMBDA_SENSITIVE_ENV_VARS", "LAMBDA", "MEDIUM",
+        title="Lambda function may have sensitive data in environment variables: {func_name}",
+        description="Lambda function '{func_name}' has environment variables that may contain sensitive data (e.g., passwords, keys). Consider using AWS Secrets Manager or Parameter Store instead.",
+        remediation="Move sensitive environment variables for Lambda function '{func_name}' to AWS Secrets Manager or Systems Manager Parameter Store.",
+        mapped_control="ISO 27001 A.9.4.3",
+    ),
+    FindingRule(
+        "LAMBDA_NO_DLQ", "LAMBDA", "LOW",
+        title="Lambda function has no dead letter queue: {func_name}",
+        description="Lambda function '{func_name}' does not have a dead letter queue configured, which may result in lost error information.",
+        remediation="Configure a dead letter queue for Lambda function '{func_name}' to capture failed invocations.",
+    ),
+    FindingRule(
+        "LAMBDA_NO_RESERVED_CONCURRENCY", "LAMBDA", "LOW",
+        title="Lambda function has no reserved concurrent executions: {func_name}",
+        description="Lambda function '{func_name}' does not have reserved concurrent executions configured, which may lead to unexpected costs or throttling.",
+        remediation="Consider setting reserved concurrent executions for Lambda function '{func_name}' to manage costs and prevent unlimited scaling.",
+    ),
+    # CloudWatch
+    FindingRule(
+        "CLOUDWATCH_LOG_GROUP_NO_RETENTION", "CLOUDWATCH", "MEDIUM",
+        title="CloudWatch Log Group has no retention policy: {log_group_name}",
+        description="CloudWatch Log Group '{log_group_name}' does not have a retention policy configured, which means logs will be retained indefinitely and may incur unnecessary costs.",
+        remediation="Set an appropriate retention period for Log Group '{log_group_name}' (recommended: 30-90 days for general logs, longer for compliance requirements).",
+        mapped_control="ISO 27001 A.12.4.1",
+    ),
+    FindingRule(
+        "CLOUDWATCH_LOG_GROUP_LONG_RETENTION", "CLOUDWATCH", "LOW",
+        title="CloudWatch Log Group has extended retention: {log_group_name}",
+        description="CloudWatch Log Group '{log_group_name}' has a retention policy of {retention_in_days} days, which may incur high storage costs.",
+        remediation="Review retention period for Log Group '{log_group_name}'. Consider archiving older logs to S3 with Glacier for cost optimization.",
+    ),
+    FindingRule(
+        "CLOUDWATCH_LOG_GROUP_NOT_ENCRYPTED", "CLOUDWATCH", "MEDIUM",
+        title="CloudWatch Log Group not encrypted: {log_group_name}",
+        description="CloudWatch Log Group '{log_group_name}' does not have encryption at rest enabled.",
+        remediation="Enable encryption at rest for Log Group '{log_group_name}' using AWS KMS.",
+        mapped_control="ISO 27001 A.10.1.1",
+    ),
+    FindingRule(
+        "CLOUDWATCH_LOG_GROUP_ENCRYPTION_UNKNOWN", "CLOUDWATCH", "LOW",
+        title="CloudWatch Log Group encryption status unknown: {log_group_name}",
+        description="Unable to verify encryption status for Log Group '{log_group_name}'. Ensure encryption at rest is enabled.",
+        remediation="Verify and enable encryption at rest for Log Group '{log_group_name}' using AWS KMS if not already enabled.",
+        mapped_control="ISO 27001 A.10.1.1",
+    ),
+    FindingRule(
+        "CLOUDWATCH_LOG_GROUP_SENSITIVE_NAME", "CLOUDWATCH", "LOW",
+        title="CloudWatch Log Group may contain sensitive data: {log_group_name}",
+        description="CloudWatch Log Group '{log_group_name}' has a name suggesting it may contain sensitive information. Ensure proper access controls and encryption are in place.",
+        remediation="Review access controls and encryption for Log Group '{log_group_name}' to ensure sensitive data is protected.",
+        mapped_control="ISO 27001 A.9.4.3",
+    ),
+]
+
+RULES: Dict[str, FindingRule] = {rule.rule_id: rule for rule in _RULES}
+
+
+class _Params(dict):
+    """Format mapping that leaves unknown placeholders visible instead of raising."""
+
+    def __missing__(self, key):
+        return "{" + key + "}"
+
+
+def render(template: str, params: Optional[Dict]) -> str:
+    return string.Formatter().vformat(template, (), _Params(params or {}))
+
+
+def render_rule_text(rule_id: str, field: str, params: Optional[Dict]) -> Optional[str]:
+    """Render one text field ("title", "description", "remediation") of a rule."""
+    rule = RULES.get(rule_id)
+    if rule is None:
+        logger.warning(f"Unknown finding rule: {rule_id}")
+        return None
+    return render(getattr(rule, field), params)
+
+
+def rule_label(rule_id: str) -> Optional[str]:
+    """Rule title with its placeholders shown: "Public S3 bucket: <bucket_name>"."""
+    rule = RULES.get(rule_id)
+    if rule is None:
+        return None
+    return placeholders(rule.title)
+
+
+def placeholders(template: str) -> str:
+    """Template text for display: "{bucket_name}" -> "<bucket_name>"."""
+    return re.sub(r"\{(\w+)\}", r"<\1>", template)
+
+
+def rule_finding(rule_id: str, resource_id: str, **params) -> Dict:
+    """
+    Build a scanner finding dict for a catalog rule.
+
+    The title is rendered up front because it is part of the finding identity
+    (category + resource + title) used for deduplication. Description and
+    remediation are left to the catalog and rendered on read.
+    """
+    rule = RULES[rule_id]
+    return {
+        "rule_id": rule_id,
+        "params": params,
+        "category": rule.category,
+        "title": render(rule.title, params),
+        "severity": rule.severity,
+        "resource_id": resource_id,
+        "mapped_control": rule.mapped_control,
+    }
@@ -1,6 +1,7 @@
 import boto3
 from typing import List, Dict
 from botocore.exceptions import ClientError
+from app.services.finding_rules import rule_finding
 
 
 def scan_iam(session: boto3.Session) -> List[Dict]:
@@ -25,15 +26,7 @@ def scan_iam(session: boto3.Session) -> List[Dict]:
                 try:
                     mfa_devices = iam.list_mfa_devices(UserName=username)
                     if len(mfa_devices.get("MFADevices", [])) == 0:
-                        findings.append({
-                            "category": "IAM",
-                            "title": f"IAM user without MFA: {username}",
-                            "description": f"The IAM user '{username}' does not have MFA enabled.",
-                            "severity": "HIGH",
-                            "resource_id": user_arn,
-                            "remediation": f"Enable MFA for user '{username}' using AWS Console or CLI.",
-                            "mapped_control": "ISO 27001 A.9.4.3",
-                        })
+                        findings.append(rule_finding("IAM_USER_NO_MFA", user_arn, username=username))
                 except ClientError as e:
                     # Log but continue
                     print(f"Error checking MFA for {username}: {e}")
@@ -44,15 +37,7 @@ def scan_iam(session: boto3.Session) -> List[Dict]:
                     attached_policies = iam.list_attached_user_policies(UserName=username)
                     for policy in attached_policies.get("AttachedPolicies", []):
                         if policy["PolicyName"] == "AdministratorAccess":
-                            findings.append({
-                                "category": "IAM",
-                                "title": f"IAM user with AdministratorAccess: {username}",
-                                "description": f"The IAM user '{username}' has AdministratorAccess policy attached.",
-                                "severity": "HIGH",
-                                "resource_id": user_arn,
-                                "remediation": "Apply principle of least privilege. Remove AdministratorAccess and grant specific permissions.",
-                                "mapped_control": "ISO 27001 A.9.2.2",
-                            })
+                            findings.append(rule_finding("IAM_USER_ADMIN_ACCESS", user_arn, username=username))
                             break
                     
                     # Check inline policies (simplified - just check if they exist)
@@ -62,15 +47,10 @@ def scan_iam(session: boto3.Session) -> List[Dict]:
                         # Simple check for AdministratorAccess in policy document
                         policy_str = str(policy_doc.get("PolicyDocument", {}))
                         if "AdministratorAccess" in policy_str or '"Effect": "Allow"' in policy_str and '"Action": "*"' in policy_str:
-                            findings.append({
-                                "category": "IAM",
-                                "title": f"IAM user with overly permissive inline policy: {username}",
-                                "description": f"The IAM user '{username}' has an inline policy that may be overly permissive.",
-                                "severity": "MEDIUM",
-                                "resource_id": user_arn,
-                                "remediation": "Review and restrict inline policy permissions.",
-                                "mapped_control": "ISO 27001 A.9.2.2",
-                            })
+                            findings.append(rule_finding(
+                                "IAM_USER_PERMISSIVE_INLINE_POLICY", user_arn,
+                                username=username,
+                            ))
                             break
                             
                 except ClientError as e:
@@ -2,6 +2,7 @@ import boto3
 from typing import List, Dict
 from botocore.exceptions import ClientError
 from app.core.config import settings
+from app.services.finding_rules import rule_finding
 
 
 def scan_logging(session: boto3.Session) -> List[Dict]:
@@ -20,28 +21,12 @@ def scan_logging(session: boto3.Session) -> List[Dict]:
         enabled_trails = [t for t in trails.get("trailList", []) if t.get("IsLogging", False)]
         
         if len(enabled_trails) == 0:
-            findings.append({
-                "category": "LOGGING",
-                "title": "CloudTrail not enabled",
-                "description": "No CloudTrail trails are currently logging in this AWS account.",
-                "severity": "HIGH",
-                "resource_id": "CloudTrail",
-                "remediation": "Enable CloudTrail logging for AWS account activity monitoring.",
-                "mapped_control": "ISO 27001 A.12.4.1",
-            })
+            findings.append(rule_finding("CLOUDTRAIL_NOT_ENABLED", "CloudTrail"))
         else:
             # Check if any trail has global service events enabled
             has_global = any(t.get("IncludeGlobalServiceEvents", False) for t in enabled_trails)
             if not has_global:
-                findings.append({
-                    "category": "LOGGING",
-                    "title": "CloudTrail missing global service events",
-                    "description": "CloudTrail trails are enabled but do not capture global service events.",
-                    "severity": "MEDIUM",
-                    "resource_id": "CloudTrail",
-                    "remediation": "Enable 'Include global service events' in CloudTrail configuration.",
-                    "mapped_control": "ISO 27001 A.12.4.1",
-                })
+                findings.append(rule_finding("CLOUDTRAIL_NO_GLOBAL_EVENTS", "CloudTrail"))
     
     except ClientError as e:
         print(f"Error scanning CloudTrail: {e}")
@@ -62,29 +47,13 @@ def scan_logging(session: boto3.Session) -> List[Dict]:
         
         detector_ids = detectors.get("DetectorIds", [])
         if len(detector_ids) == 0:
-            findings.append({
-                "category": "LOGGING",
-                "title": "GuardDuty not enabled",
-                "description": "GuardDuty is not enabled in this AWS account.",
-                "severity": "MEDIUM",
-                "resource_id": "GuardDuty",
-                "remediation": "Enable GuardDuty for threat detection and continuous monitoring.",
-                "mapped_control": "ISO 27001 A.12.4.2",
-            })
+            findings.append(rule_finding("GUARDDUTY_NOT_ENABLED", "GuardDuty"))
         else:
             # Check if detector is enabled
             for detector_id in detector_ids:
                 detector = guardduty.get_detector(DetectorId=detector_id)
                 if not detector.get("Status", "").upper() == "ENABLED":
-                    findings.append({
-                        "category": "LOGGING",
-                        "title": f"GuardDuty detector disabled: {detector_id}",
-                        "description": f"GuardDuty detector '{detector_id}' exists but is not enabled.",
-                        "severity": "MEDIUM",
-                        "resource_id": detector_id,
-                        "remediation": f"Enable GuardDuty detector '{detector_id}'.",
-                        "mapped_control": "ISO 27001 A.12.4.2",
-                    })
+                    findings.append(rule_finding("GUARDDUTY_DETECTOR_DISABLED", detector_id, detector_id=detector_id))
     
     except ClientError as e:
         # GuardDuty might not be available in all regions or accounts
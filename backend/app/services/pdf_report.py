@@ -0,0 +1,267 @@
+"""
+PDF rendering of scan reports.
+
+This module only depends on reportlab and the standard library: it runs in
+the report worker processes (app.services.report_artifacts), which import it
+fresh, and it works on plain data rather than ORM objects.
+"""
+from datetime import datetime
+from io import BytesIO
+from itertools import groupby, islice
+from typing import Any, Dict, Iterable, Iterator, List
+
+# Bump whenever the report layout or content changes; cached PDFs are keyed by it
+REPORT_VERSION = 2
+
+# Rows per findings table; long sections become a run of small tables
+TABLE_SEGMENT_ROWS = 100
+
+
+def _segments(rows: Iterable, size: int) -> Iterator[List]:
+    rows = iter(rows)
+    while True:
+        segment = list(islice(rows, size))
+        if not segment:
+            return
+        yield segment
+
+
+def render_scan_report(report: Dict[str, Any]) -> bytes:
+    """
+    Render the PDF report for one scan from plain report data.
+    Uses reportlab for PDF generation; raises ImportError if it is missing.
+    
+    report holds "tenant_name", "scan" (id, started_at, status, summary),
+    "findings" as (severity, category, title, resource_id) tuples ordered by
+    severity, "severity_totals" (all findings, including ones left out of
+    "findings") and an optional "appendix" of (severity, category, rule, count).
+    """
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib import colors
+    from reportlab.lib.units import inch
+    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.enums import TA_CENTER
+    
+    scan = report["scan"]
+    findings = report["findings"]
+    severity_totals = report["severity_totals"]
+    
+    buffer = BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=letter, topMargin=0.5*inch, bottomMargin=0.5*inch)
+    
+    # Container for the 'Flowable' objects
+    elements = []
+    styles = getSampleStyleSheet()
+    
+    # Title
+    title_style = ParagraphStyle(
+        'CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=24,
+        textColor=colors.HexColor('#1e40af'),
+        spaceAfter=30,
+        alignment=TA_CENTER
+    )
+    elements.append(Paragraph("S3ntraCS Security Scan Report", title_style))
+    elements.append(Spacer(1, 0.2*inch))
+    
+    # Report metadata
+    metadata_style = ParagraphStyle(
+        'Metadata',
+        parent=styles['Normal'],
+        fontSize=10,
+        textColor=colors.HexColor('#6b7280'),
+    )
+    
+    scan_date = scan["started_at"].strftime("%B %d, %Y at %H:%M UTC") if scan["started_at"] else "N/A"
+    
+    metadata = [
+        ["Tenant:", report["tenant_name"]],
+        ["Scan Date:", scan_date],
+        ["Scan ID:", str(scan["id"])[:8]],
+        ["Status:", scan["status"].upper()],
+    ]
+    
+    if scan["summary"]:
+        metadata.append(["Total Findings:", str(scan["summary"].get("total_findings", 0))])
+    
+    metadata_table = Table(metadata, colWidths=[2*inch, 4*inch])
+    metadata_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#f3f4f6')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.black),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+        ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 0), (-1, -1), 10),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+        ('TOPPADDING', (0, 0), (-1, -1), 6),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#e5e7eb')),
+    ]))
+    elements.append(metadata_table)
+    elements.append(Spacer(1, 0.3*inch))
+    
+    # Executive Summary
+    heading_style = ParagraphStyle(
+        'Heading',
+        parent=styles['Heading2'],
+        fontSize=14,
+        textColor=colors.HexColor('#1e40af'),
+        spaceAfter=12,
+    )
+    elements.append(Paragraph("Executive Summary", heading_style))
+    
+    if scan["summary"]:
+        summary = scan["summary"]
+        summary_data = [
+            ["Metric", "Count"],
+            ["Total Findings", str(summary.get("total_findings", 0))],
+            ["Critical Findings", str(summary.get("by_severity", {}).get("CRITICAL", 0))],
+            ["High Findings", str(summary.get("by_severity", {}).get("HIGH", 0))],
+            ["Medium Findings", str(summary.get("by_severity", {}).get("MEDIUM", 0))],
+            ["Low Findings", str(summary.get("by_severity", {}).get("LOW", 0))],
+        ]
+        
+        # Add category breakdown
+        by_category = summary.get("by_category", {})
+        if by_category:
+            summary_data.append(["", ""])  # Empty row
+            summary_data.append(["Category Breakdown", ""])
+            for category, count in sorted(by_category.items(), key=lambda x: x[1], reverse=True):
+                summary_data.append([f"{category} Findings", str(count)])
+        
+        summary_table = Table(summary_data, colWidths=[3*inch, 3*inch])
+        summary_table.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1e40af')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 0), (-1, -1), 11),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+            ('TOPPADDING', (0, 0), (-1, -1), 8),
+            ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#cbd5e1')),
+            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f9fafb')]),
+        ]))
+        elements.append(summary_table)
+        elements.append(Spacer(1, 0.3*inch))
+    
+    # Findings Details
+    if findings:
+        elements.append(Paragraph("Detailed Findings", heading_style))
+        elements.append(Spacer(1, 0.2*inch))
+        
+        severity_colors = {
+            "CRITICAL": colors.HexColor('#dc2626'),
+            "HIGH": colors.HexColor('#ea580c'),
+            "MEDIUM": colors.HexColor('#f59e0b'),
+            "LOW": colors.HexColor('#3b82f6'),
+        }
+        note_style = ParagraphStyle(
+            'TruncationNote',
+            parent=styles['Normal'],
+            fontSize=9,
+            textColor=colors.HexColor('#6b7280'),
+            spaceAfter=6,
+        )
+        
+        # Findings arrive ordered by severity, most severe first
+        for severity, severity_findings in groupby(findings, key=lambda f: f[0]):
+            total = severity_totals.get(severity, 0)
+            
+            # Severity header
+            severity_style = ParagraphStyle(
+                f'Severity{severity}',
+                parent=styles['Heading3'],
+                fontSize=12,
+                textColor=severity_colors[severity],
+                spaceAfter=8,
+            )
+            elements.append(Paragraph(f"{severity} Severity ({total} findings)", severity_style))
+            elements.append(Spacer(1, 0.1*inch))
+            
+            table_style = TableStyle([
+                ('BACKGROUND', (0, 0), (-1, 0), severity_colors[severity]),
+                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+                ('ALIGN', (0, 0), (0, -1), 'CENTER'),  # Index column
+                ('ALIGN', (1, 0), (-1, -1), 'LEFT'),
+                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+                ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+                ('FONTSIZE', (0, 0), (-1, -1), 9),
+                ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+                ('TOPPADDING', (0, 0), (-1, -1), 6),
+                ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#e5e7eb')),
+                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f9fafb')]),
+            ])
+            
+            # Fixed-size table segments: layout cost stays linear in the row count
+            shown = 0
+            for segment in _segments(severity_findings, TABLE_SEGMENT_ROWS):
+                findings_data = [["#", "Category", "Title", "Resource ID"]]
+                for _, category, title, resource_id in segment:
+                    shown += 1
+                    findings_data.append([
+                        str(shown),
+                        category,
+                        title[:50] + "..." if len(title) > 50 else title,
+                        (resource_id[:30] + "...") if resource_id and len(resource_id) > 30 else (resource_id or "N/A"),
+                    ])
+                findings_table = Table(findings_data, colWidths=[0.5*inch, 1.2*inch, 3.8*inch, 1.5*inch], repeatRows=1)
+                findings_table.setStyle(table_style)
+                elements.append(findings_table)
+            
+            if total > shown:
+                elements.append(Spacer(1, 0.05*inch))
+                elements.append(Paragraph(
+                    f"Showing the {shown} most recent of {total} {severity} findings. "
+                    f"Appendix A breaks all of them down by rule; export the findings as CSV for the full list.",
+                    note_style,
+                ))
+            elements.append(Spacer(1, 0.2*inch))
+    
+    # Appendix: long tails summarized per rule instead of listed
+    appendix = report.get("appendix") or []
+    if appendix:
+        elements.append(PageBreak())
+        elements.append(Paragraph("Appendix A: Findings by Rule", heading_style))
+        for segment in _segments(appendix, TABLE_SEGMENT_ROWS):
+            appendix_data = [["Severity", "Category", "Rule", "Findings"]]
+            for severity, category, label, count in segment:
+                appendix_data.append([
+                    severity,
+                    category,
+                    label[:60] + "..." if len(label) > 60 else label,
+                    str(count),
+                ])
+            appendix_table = Table(appendix_data, colWidths=[1*inch, 1.2*inch, 4*inch, 0.8*inch], repeatRows=1)
+            appendix_table.setStyle(TableStyle([
+                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1e40af')),
+                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+                ('ALIGN', (-1, 0), (-1, -1), 'RIGHT'),
+                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+                ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+                ('FONTSIZE', (0, 0), (-1, -1), 9),
+                ('BOTTOMPADDING', (0, 0), (-1, -1), 5),
+                ('TOPPADDING', (0, 0), (-1, -1), 5),
+                ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#e5e7eb')),
+                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f9fafb')]),
+            ]))
+            elements.append(appendix_table)
+        elements.append(Spacer(1, 0.2*inch))
+    
+    # Footer
+    elements.append(Spacer(1, 0.3*inch))
+    footer_style = ParagraphStyle(
+        'Footer',
+        parent=styles['Normal'],
+        fontSize=8,
+        textColor=colors.HexColor('#9ca3af'),
+        alignment=TA_CENTER,
+    )
+    elements.append(Paragraph(f"Generated by S3ntraCS on {datetime.utcnow().strftime('%B %d, %Y at %H:%M UTC')}", footer_style))
+    
+    # Build PDF
+    doc.build(elements)
+    buffer.seek(0)
+    return buffer.getvalue()
@@ -0,0 +1,256 @@
+"""
+Rendered report artifacts.
+
+PDF rendering is CPU-bound, so it runs in a process pool instead of on the
+request thread. A finished (completed or failed) scan never changes, so its
+PDF is rendered once per report version and tenant name (the one tenant
+field printed on it) and kept on local disk. Files are
+content-addressed: the name carries the SHA-256 of the bytes, which doubles
+as the ETag, and repeat downloads are served straight from the file.
+"""
+import glob
+import hashlib
+import logging
+import multiprocessing
+import os
+import tempfile
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.finding import Finding
+from app.models.scan_run import ScanRun
+from app.models.tenant import Tenant
+from app.services.finding_counts import SEVERITIES
+from app.services.finding_history import seen_in_scan
+from app.services.finding_rules import rule_label
+from app.services.pdf_report import REPORT_VERSION, render_scan_report
+
+logger = logging.getLogger(__name__)
+
+# Scan states whose report can no longer change
+IMMUTABLE_SCAN_STATUSES = ("completed", "failed")
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _render_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn: workers must not inherit the API process's DB connections and threads
+            _pool = ProcessPoolExecutor(
+                max_workers=settings.REPORT_RENDER_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _pool
+
+
+def shutdown_render_pool():
+    """Stop the worker processes (application shutdown)."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+def submit_render(render: Callable[..., bytes], *args) -> Future:
+    """Start a module-level render function in a worker process."""
+    return _render_pool().submit(render, *args)
+
+
+def render_in_pool(render: Callable[..., bytes], *args) -> bytes:
+    """Run a module-level render function in a worker process and wait for the bytes."""
+    return submit_render(render, *args).result(timeout=settings.REPORT_RENDER_TIMEOUT_SECONDS)
+
+
+def scan_report_data(
+    db: Session,
+    scan: ScanRun,
+    tenant: Tenant,
+    severity_totals: Optional[Dict[str, int]] = None,
+) -> Dict[str, Any]:
+    """
+    Plain (picklable) input for render_scan_report.
+    
+    At most REPORT_MAX_FINDINGS_PER_SEVERITY findings per severity are listed
+    (the most recent ones); severities with more get a per-rule breakdown in
+    the appendix instead. Memory and render time stay bounded however many
+    findings the scan has.
+    
+    severity_totals (finding count per severity) can be passed in when the
+    caller already has them, e.g. from scan_finding_counts of a completed scan.
+    """
+    limit = settings.REPORT_MAX_FINDINGS_PER_SEVERITY
+    
+    if severity_totals is None:
+        severity_totals = dict(
+            db.query(Finding.severity, func.count(Finding.id))
+            .filter(seen_in_scan(scan))
+            .group_by(Finding.severity)
+            .all()
+        )
+    
+    findings = []
+    truncated = []
+    for severity in SEVERITIES:
+        if not severity_totals.get(severity):
+            continue
+        rows = (
+            db.query(Finding.severity, Finding.category, Finding.title, Finding.resource_id)
+            .filter(seen_in_scan(scan), Finding.severity == severity)
+            .order_by(Finding.created_at.desc(), Finding.id.desc())
+            .limit(limit)
+            .all()
+        )
+        findings.extend(tuple(row) for row in rows)
+        if severity_totals[severity] > limit:
+            truncated.append(severity)
+    
+    appendix = []
+    if truncated:
+        rows = (
+            db.query(Finding.severity, Finding.category, Finding.rule_id, func.count(Finding.id).label("count"))
+            .filter(seen_in_scan(scan), Finding.severity.in_(truncated))
+            .group_by(Finding.severity, Finding.category, Finding.rule_id)
+            .order_by(Finding.severity.desc(), func.count(Finding.id).desc())
+            .all()
+        )
+        for severity, category, rule_id, count in rows:
+            label = rule_label(rule_id) if rule_id else None
+            appendix.append((severity, category, label or f"Other {category} findings", count))
+    
+    return {
+        "tenant_name": tenant.name,
+        "scan": {
+            "id": str(scan.id),
+            "started_at": scan.started_at,
+            "status": scan.status,
+            "summary": scan.summary,
+        },
+        "findings": findings,
+        "severity_totals": severity_totals,
+        "appendix": appendix,
+    }
+
+
+@dataclass(frozen=True)
+class CachedReport:
+    path: str
+    etag: str
+
+
+class ReportArtifactCache:
+    """
+    Content-addressed report files on local disk.
+
+    One file per (scan_id, report version, tenant name):
+    <scan_id>.v<version>.<tenant name hash>.<sha256>.pdf, so renaming a tenant
+    renders its reports again. Files are written to a temp name and renamed
+    into place, so readers never see a partial file. Concurrent requests for
+    the same missing report wait for a single render (get_or_render). Files of
+    older report versions or tenant names are removed when a new one is
+    stored; files of the current key are left alone, as a response may be
+    about to send them.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._flights: Dict[str, Future] = {}
+
+    def _prefix(self, scan_id, tenant_name: str) -> str:
+        tenant_tag = hashlib.sha256(tenant_name.encode()).hexdigest()[:16]
+        return os.path.join(self.directory, f"{scan_id}.v{REPORT_VERSION}.{tenant_tag}.")
+
+    def get(self, scan_id, tenant_name: str) -> Optional[CachedReport]:
+        matches = glob.glob(glob.escape(self._prefix(scan_id, tenant_name)) + "*.pdf")
+        if not matches:
+            return None
+        # Normally one file; several only if other processes rendered the same report
+        path = min(matches)
+        digest = os.path.basename(path).rsplit(".", 2)[-2]
+        return CachedReport(path=path, etag=f'"{digest}"')
+
+    def put(self, scan_id, tenant_name: str, content: bytes) -> CachedReport:
+        os.makedirs(self.directory, exist_ok=True)
+        digest = hashlib.sha256(content).hexdigest()
+        path = f"{self._prefix(scan_id, tenant_name)}{digest}.pdf"
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as tmp:
+                tmp.write(content)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        self._remove_stale(scan_id, tenant_name)
+        return CachedReport(path=path, etag=f'"{digest}"')
+
+    def _remove_stale(self, scan_id, tenant_name: str):
+        """Drop files of older report versions or tenant names for this scan."""
+        current = self._prefix(scan_id, tenant_name)
+        for path in glob.glob(os.path.join(glob.escape(self.directory), f"{scan_id}.v*.pdf")):
+            if not path.startswith(current):
+                try:
+                    os.unlink(path)
+                except OSError:
+                    pass
+
+    def get_or_render(self, scan_id, tenant_name: str, render: Callable[[], bytes]) -> CachedReport:
+        """
+        The cached report, or render() stored under it. Every writer goes through
+        here, so one scan's report is rendered and stored once at a time.
+        """
+        cached = self.get(scan_id, tenant_name)
+        if cached:
+            return cached
+
+        key = self._prefix(scan_id, tenant_name)
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = Future()
+                self._flights[key] = flight
+
+        if not leader:
+            return flight.result()
+
+        try:
+            cached = self.get(scan_id, tenant_name) or self.put(scan_id, tenant_name, render())
+            flight.set_result(cached)
+            return cached
+        except BaseException as e:
+            flight.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+
+
+report_cache = ReportArtifactCache(settings.REPORT_CACHE_DIR)
+
+
+def scan_report_pdf(db: Session, scan: ScanRun, tenant: Tenant):
+    """
+    PDF for a scan: a CachedReport for finished scans, raw bytes otherwise.
+
+    Rendering always happens in the process pool.
+    """
+    if scan.status not in IMMUTABLE_SCAN_STATUSES:
+        return render_in_pool(render_scan_report, scan_report_data(db, scan, tenant))
+
+    return report_cache.get_or_render(
+        scan.id,
+        tenant.name,
+        lambda: render_in_pool(render_scan_report, scan_report_data(db, scan, tenant)),
+    )
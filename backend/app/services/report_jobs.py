@@ -0,0 +1,401 @@
+"""
+Background report jobs.
+
+PDF reports, the compliance report and the finding exports can be requested
+as jobs: the API records a pending job and returns at once, a worker builds
+the artifact into REPORT_ARTIFACT_DIR and a `report_job` event goes out over
+the tenant's WebSocket channel when the job finishes. Artifacts are kept for
+REPORT_ARTIFACT_TTL_HOURS and then deleted by purge_report_jobs.
+
+Identical requests (same tenant, kind and parameters) share one job while it
+is pending or running; a partial unique index on dedupe_key enforces this
+across API processes.
+"""
+import hashlib
+import json
+import logging
+import os
+import shutil
+from concurrent.futures import TimeoutError as RenderTimeoutError
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional, Tuple
+from uuid import UUID
+
+from fastapi import HTTPException
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.report_job import ReportJob
+from app.models.scan_run import ScanRun
+from app.models.tenant import Tenant
+from app.models.types import CATEGORY_CODES
+from app.services.compliance_report import build_compliance_report
+from app.services.finding_counts import SEVERITIES
+from app.services.finding_export import (
+    export_query,
+    resolve_export_columns,
+    resolve_remediation_status,
+    stream_arrow,
+    stream_csv,
+    stream_json,
+    stream_ndjson,
+    stream_parquet,
+)
+from app.services.report_artifacts import CachedReport, scan_report_pdf
+from app.services.sarif_export import SARIF_COLUMNS, stream_sarif
+from app.services.scan_progress import progress_bus
+
+logger = logging.getLogger(__name__)
+
+# kind -> (media type, file extension)
+EXPORT_KINDS = {
+    "csv": ("text/csv", "csv"),
+    "json": ("application/json", "json"),
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+    "arrow": ("application/vnd.apache.arrow.stream", "arrows"),
+    "sarif": ("application/sarif+json", "sarif"),
+}
+
+JOB_KINDS = ("pdf", "compliance") + tuple(EXPORT_KINDS)
+
+# Parameters each kind accepts
+_KIND_PARAMS = {
+    "pdf": {"scan_run_id"},
+    "compliance": set(),
+    "sarif": {"scan_run_id", "severity", "category", "remediation_status"},
+}
+_EXPORT_PARAMS = {"scan_run_id", "columns", "severity", "category", "remediation_status"}
+
+IN_FLIGHT_STATUSES = ("pending", "running")
+
+
+def normalize_job_params(kind: str, params: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Validate job parameters and put them in canonical form (upper-case codes,
+    string UUIDs, no empty values), so equal requests get equal dedupe keys.
+
+    Raises ValueError for unknown kinds, unknown parameters or invalid values.
+    """
+    if kind not in JOB_KINDS:
+        raise ValueError(f"Invalid report kind. Must be one of: {', '.join(JOB_KINDS)}")
+
+    allowed = _KIND_PARAMS.get(kind, _EXPORT_PARAMS)
+    params = {key: value for key, value in (params or {}).items() if value not in (None, "")}
+    unknown = sorted(set(params) - allowed)
+    if unknown:
+        raise ValueError(
+            f"Unknown parameters for {kind}: {', '.join(unknown)}. "
+            f"Allowed: {', '.join(sorted(allowed)) or 'none'}"
+        )
+
+    if "scan_run_id" in params:
+        try:
+            params["scan_run_id"] = str(UUID(str(params["scan_run_id"])))
+        except ValueError:
+            raise ValueError("Invalid scan_run_id")
+    if "columns" in params:
+        columns = resolve_export_columns(str(params["columns"]))
+        params["columns"] = ",".join(column.name for column in columns)
+    if "severity" in params:
+        params["severity"] = str(params["severity"]).upper()
+        if params["severity"] not in SEVERITIES:
+            raise ValueError(f"Invalid severity. Must be one of: {', '.join(SEVERITIES)}")
+    if "category" in params:
+        params["category"] = str(params["category"]).upper()
+        if params["category"] not in CATEGORY_CODES:
+            raise ValueError(f"Invalid category. Must be one of: {', '.join(CATEGORY_CODES)}")
+    if "remediation_status" in params:
+        params["remediation_status"] = resolve_remediation_status(str(params["remediation_status"]))
+
+    return params
+
+
+def dedupe_key(tenant_id: UUID, kind: str, params: Dict[str, Any]) -> str:
+    canonical = json.dumps([str(tenant_id), kind, params], sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def _in_flight_job(db: Session, key: str) -> Optional[ReportJob]:
+    return (
+        db.query(ReportJob)
+        .filter(ReportJob.dedupe_key == key, ReportJob.status.in_(IN_FLIGHT_STATUSES))
+        .first()
+    )
+
+
+def create_report_job(
+    db: Session,
+    tenant_id: UUID,
+    kind: str,
+    params: Dict[str, Any],
+    requested_by: Optional[UUID] = None,
+) -> Tuple[ReportJob, bool]:
+    """
+    Record a pending job, or return the identical job already in flight.
+
+    Returns (job, created); only a created job needs to be handed to a worker.
+    params must come from normalize_job_params.
+    """
+    key = dedupe_key(tenant_id, kind, params)
+
+    # Two attempts: the in-flight job we collided with may finish in between
+    for _ in range(2):
+        existing = _in_flight_job(db, key)
+        if existing:
+            return existing, False
+
+        job = ReportJob(
+            tenant_id=tenant_id,
+            requested_by=requested_by,
+            kind=kind,
+            params=params,
+            dedupe_key=key,
+            status="pending",
+            created_at=datetime.utcnow(),
+        )
+        db.add(job)
+        try:
+            db.commit()
+        except IntegrityError:
+            # A concurrent identical request inserted its job first
+            db.rollback()
+            continue
+        db.refresh(job)
+        return job, True
+
+    existing = _in_flight_job(db, key)
+    if existing:
+        return existing, False
+    raise RuntimeError("Could not create report job")
+
+
+def download_path(job: ReportJob) -> str:
+    return f"/report-jobs/{job.tenant_id}/{job.id}/download"
+
+
+def report_job_message(job: ReportJob) -> dict:
+    """Build the `report_job` WebSocket message for a job's current state."""
+    return {
+        "type": "report_job",
+        "job_id": str(job.id),
+        "kind": job.kind,
+        "status": job.status,
+        "error": job.error,
+        "filename": job.filename,
+        "size_bytes": job.size_bytes,
+        "download_url": download_path(job) if job.status == "completed" else None,
+        "expires_at": job.expires_at.isoformat() if job.expires_at else None,
+    }
+
+
+def publish_report_job(job: ReportJob):
+    """Notify WebSocket clients that a report job's status changed."""
+    progress_bus.publish(
+        job.tenant_id,
+        report_job_message(job),
+        coalesce_key=(str(job.id), "report_job"),
+    )
+
+
+def _job_scan(db: Session, job: ReportJob, latest_completed: bool = False) -> Optional[ScanRun]:
+    scan_run_id = job.params.get("scan_run_id")
+    if scan_run_id:
+        scan = db.query(ScanRun).filter(ScanRun.id == scan_run_id, ScanRun.tenant_id == job.tenant_id).first()
+        if not scan:
+            raise ValueError("Scan not found")
+        return scan
+    if not latest_completed:
+        return None
+    scan = (
+        db.query(ScanRun)
+        .filter(ScanRun.tenant_id == job.tenant_id, ScanRun.status == "completed")
+        .order_by(ScanRun.started_at.desc())
+        .first()
+    )
+    if not scan:
+        raise ValueError("No completed scans found for this tenant")
+    return scan
+
+
+def _write_chunks(path: str, chunks):
+    with open(path, "wb") as out:
+        for chunk in chunks:
+            out.write(chunk.encode("utf-8") if isinstance(chunk, str) else chunk)
+
+
+def _build_artifact(db: Session, job: ReportJob, path: str) -> Tuple[str, str]:
+    """Write the job's artifact to path; returns (media type, download filename)."""
+    timestamp = datetime.utcnow().strftime('%Y%m%d-%H%M%S')
+
+    if job.kind == "pdf":
+        tenant = db.query(Tenant).filter(Tenant.id == job.tenant_id).first()
+        if not tenant:
+            raise ValueError("Tenant not found")
+        scan = _job_scan(db, job, latest_completed=True)
+        try:
+            report = scan_report_pdf(db, scan, tenant)
+        except ImportError:
+            raise RuntimeError("PDF generation library not installed. Install reportlab: pip install reportlab")
+        except RenderTimeoutError:
+            raise RuntimeError("PDF generation timed out")
+        if isinstance(report, CachedReport):
+            shutil.copyfile(report.path, path)
+        else:
+            _write_chunks(path, [report])
+        scan_date = scan.started_at.strftime("%Y%m%d") if scan.started_at else "unknown"
+        return "application/pdf", f"s3ntracs-report-{tenant.name.replace(' ', '_')}-{scan_date}.pdf"
+
+    if job.kind == "compliance":
+        try:
+            report = build_compliance_report(db, job.tenant_id)
+        except HTTPException as e:
+            raise ValueError(e.detail)
+        _write_chunks(path, [json.dumps(report, default=str)])
+        return "application/json", f"compliance-report-{job.tenant_id}-{timestamp}.json"
+
+    media_type, extension = EXPORT_KINDS[job.kind]
+    params = job.params
+    scan = _job_scan(db, job)
+    if job.kind == "sarif":
+        columns = SARIF_COLUMNS
+    else:
+        columns = resolve_export_columns(params.get("columns"))
+    query = export_query(
+        db, job.tenant_id, columns,
+        scan=scan,
+        severity=params.get("severity"),
+        category=params.get("category"),
+        remediation_status=params.get("remediation_status"),
+    )
+
+    if job.kind == "sarif":
+        chunks = stream_sarif(db, query, job.tenant_id, scan.id if scan else None)
+    else:
+        stream = {
+            "csv": stream_csv,
+            "json": stream_json,
+            "ndjson": stream_ndjson,
+            "parquet": stream_parquet,
+            "arrow": stream_arrow,
+        }[job.kind]
+        chunks = stream(db, query, columns)
+    try:
+        _write_chunks(path, chunks)
+    except ImportError as e:
+        raise RuntimeError(
+            f"Columnar export library unavailable ({e}). Install the pyarrow version from requirements.txt"
+        )
+    return media_type, f"findings-{job.tenant_id}-{timestamp}.{extension}"
+
+
+def run_report_job(job_id: UUID):
+    """
+    Background task that builds a job's artifact.
+    Creates its own database session.
+    """
+    db = SessionLocal()
+    tmp_path = None
+    try:
+        job = db.query(ReportJob).filter(ReportJob.id == job_id).first()
+        if not job or job.status != "pending":
+            return
+
+        job.status = "running"
+        job.started_at = datetime.utcnow()
+        db.commit()
+        publish_report_job(job)
+
+        os.makedirs(settings.REPORT_ARTIFACT_DIR, exist_ok=True)
+        extension = "pdf" if job.kind == "pdf" else EXPORT_KINDS.get(job.kind, ("", "json"))[1]
+        path = os.path.join(settings.REPORT_ARTIFACT_DIR, f"{job.id}.{extension}")
+        tmp_path = f"{path}.tmp"
+
+        try:
+            content_type, filename = _build_artifact(db, job, tmp_path)
+            os.replace(tmp_path, path)
+            tmp_path = None
+        except Exception as e:
+            logger.error(f"Report job {job.id} ({job.kind}) failed: {e}", exc_info=True)
+            db.rollback()
+            job.status = "failed"
+            job.error = str(e)
+            job.finished_at = datetime.utcnow()
+            db.commit()
+            publish_report_job(job)
+            return
+
+        finished_at = datetime.utcnow()
+        job.status = "completed"
+        job.artifact_path = path
+        job.content_type = content_type
+        job.filename = filename
+        job.size_bytes = os.path.getsize(path)
+        job.finished_at = finished_at
+        job.expires_at = finished_at + timedelta(hours=settings.REPORT_ARTIFACT_TTL_HOURS)
+        db.commit()
+        publish_report_job(job)
+        logger.info(f"Report job {job.id} ({job.kind}) completed: {job.size_bytes} bytes")
+    except Exception as e:
+        logger.error(f"Report job {job_id} could not be run: {e}", exc_info=True)
+    finally:
+        if tmp_path and os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        db.close()
+
+
+def _remove_artifact(path: Optional[str]):
+    if path:
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Could not delete report artifact {path}: {e}")
+
+
+def purge_report_jobs():
+    """
+    Scheduler job: delete artifacts past their expiry and fail jobs that have
+    been pending/running for longer than REPORT_JOB_STALE_MINUTES (their
+    worker is gone, and they would otherwise block identical requests).
+    """
+    db = SessionLocal()
+    try:
+        now = datetime.utcnow()
+
+        expired = (
+            db.query(ReportJob)
+            .filter(ReportJob.status == "completed", ReportJob.expires_at <= now)
+            .all()
+        )
+        for job in expired:
+            _remove_artifact(job.artifact_path)
+            job.status = "expired"
+            job.artifact_path = None
+
+        stale = (
+            db.query(ReportJob)
+            .filter(
+                ReportJob.status.in_(IN_FLIGHT_STATUSES),
+                ReportJob.created_at <= now - timedelta(minutes=settings.REPORT_JOB_STALE_MINUTES),
+            )
+            .all()
+        )
+        for job in stale:
+            job.status = "failed"
+            job.error = "Report job was interrupted"
+            job.finished_at = now
+
+        db.commit()
+        for job in stale:
+            publish_report_job(job)
+        if expired or stale:
+            logger.info(f"Report jobs purged: {len(expired)} expired, {len(stale)} stale")
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Failed to purge report jobs: {e}", exc_info=True)
+    finally:
+        db.close()
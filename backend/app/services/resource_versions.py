@@ -0,0 +1,70 @@
+"""
+Data versions for conditional GETs (ETag / Last-Modified).
+
+A tenant's dashboard, statistics, latest-scan summary and compliance report
+are all derived from its tenant row, scan runs and findings. Each of those
+carries a row version (updated_at), so the newest row version of the three
+identifies the state the response was computed from. It is read with index
+probes (max(updated_at) per tenant) instead of computing the response.
+
+Deleting findings does not leave a newer row behind, so code that deletes
+findings touches the tenant row (touch_tenant).
+"""
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.models.finding import Finding
+from app.models.scan_run import ScanRun
+from app.models.tenant import Tenant
+
+
+@dataclass(frozen=True)
+class DataVersion:
+    """Opaque version token plus the time of the last change (for Last-Modified)."""
+    token: str
+    last_modified: Optional[datetime]
+
+
+def data_version(db: Session, tenant_id: Optional[UUID] = None) -> DataVersion:
+    """Version of one tenant's data, or of every tenant's when tenant_id is None."""
+    latest_scan = (
+        select(func.max(ScanRun.updated_at))
+        .where(ScanRun.tenant_id == Tenant.id)
+        .correlate(Tenant)
+        .scalar_subquery()
+    )
+    latest_finding = (
+        select(func.max(Finding.updated_at))
+        .where(Finding.tenant_id == Tenant.id)
+        .correlate(Tenant)
+        .scalar_subquery()
+    )
+    query = db.query(
+        func.count(Tenant.id),
+        func.max(Tenant.updated_at),
+        func.max(latest_scan),
+        func.max(latest_finding),
+    )
+    if tenant_id is not None:
+        query = query.filter(Tenant.id == tenant_id)
+    tenant_count, tenants_at, scans_at, findings_at = query.one()
+
+    changes = [at for at in (tenants_at, scans_at, findings_at) if at is not None]
+    token = ":".join(
+        [str(tenant_id or "all"), str(tenant_count)]
+        + [at.isoformat() if at else "-" for at in (tenants_at, scans_at, findings_at)]
+    )
+    return DataVersion(token=token, last_modified=max(changes) if changes else None)
+
+
+def touch_tenant(db: Session, tenant_id: UUID):
+    """Bump the tenant's row version (e.g. after deleting findings). Does not commit."""
+    db.query(Tenant).filter(Tenant.id == tenant_id).update(
+        {Tenant.updated_at: datetime.utcnow()},
+        synchronize_session=False,
+    )
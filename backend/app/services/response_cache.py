@@ -0,0 +1,279 @@
+"""
+Result cache for dashboard, statistics, trends and report endpoints.
+
+Dashboards poll these endpoints constantly, but their data only changes when a
+scan finishes or a finding's remediation status changes. Results are cached
+per (endpoint, tenant set, params) and invalidated by bumping a generation
+counter for the affected tenant: entries computed under an older generation
+are simply never looked up again and age out with their TTL.
+
+Backends:
+- memory: per-process dictionary (single API process)
+- postgres: UNLOGGED tables in the application database, shared by every
+  API process and by scans running in the scheduler
+- none: caching disabled
+"""
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from sqlalchemy import text
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Scope bumped for every tenant; cross-tenant (superadmin) views depend on it
+ALL_TENANTS = "all"
+
+
+class CacheBackend:
+    """Base class for cache backends."""
+
+    def get(self, key: str) -> Optional[Any]:
+        raise NotImplementedError
+
+    def set(self, key: str, value: Any, ttl_seconds: float):
+        raise NotImplementedError
+
+    def generations(self, scopes: List[str]) -> Dict[str, int]:
+        """Current generation of each scope (0 if never bumped)."""
+        raise NotImplementedError
+
+    def bump(self, scopes: Iterable[str]):
+        """Advance the generation of each scope, invalidating its entries."""
+        raise NotImplementedError
+
+
+class NullCacheBackend(CacheBackend):
+    """Never stores anything."""
+
+    def get(self, key: str) -> Optional[Any]:
+        return None
+
+    def set(self, key: str, value: Any, ttl_seconds: float):
+        pass
+
+    def generations(self, scopes: List[str]) -> Dict[str, int]:
+        return {scope: 0 for scope in scopes}
+
+    def bump(self, scopes: Iterable[str]):
+        pass
+
+
+class MemoryCacheBackend(CacheBackend):
+    """Thread-safe TTL + LRU dictionary local to the process."""
+
+    def __init__(self, max_entries: int = 5000):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._generations: Dict[str, int] = {}
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl_seconds: float):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + ttl_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def generations(self, scopes: List[str]) -> Dict[str, int]:
+        with self._lock:
+            return {scope: self._generations.get(scope, 0) for scope in scopes}
+
+    def bump(self, scopes: Iterable[str]):
+        with self._lock:
+            for scope in scopes:
+                self._generations[scope] = self._generations.get(scope, 0) + 1
+
+
+class PostgresCacheBackend(CacheBackend):
+    """
+    Shares entries and generations between processes through two UNLOGGED
+    tables (created by migration 008). UNLOGGED skips the WAL: the cache is
+    disposable and is truncated if Postgres crashes.
+    """
+
+    def __init__(self, engine=None):
+        if engine is None:
+            from app.db.base import engine
+        self.engine = engine
+
+    def get(self, key: str) -> Optional[Any]:
+        with self.engine.connect() as conn:
+            row = conn.execute(
+                text(
+                    "SELECT value FROM response_cache_entries "
+                    "WHERE key = :key AND expires_at > now()"
+                ),
+                {"key": key},
+            ).first()
+        return json.loads(row[0]) if row else None
+
+    def set(self, key: str, value: Any, ttl_seconds: float):
+        with self.engine.begin() as conn:
+            conn.execute(
+                text(
+                    "INSERT INTO response_cache_entries (key, value, expires_at) "
+                    "VALUES (:key, :value, now() + make_interval(secs => :ttl)) "
+                    "ON CONFLICT (key) DO UPDATE "
+                    "SET value = EXCLUDED.value, expires_at = EXCLUDED.expires_at"
+                ),
+                {"key": key, "value": json.dumps(value, default=str), "ttl": ttl_seconds},
+            )
+            # Opportunistically drop a few expired rows so the table stays small
+            conn.execute(
+                text(
+                    "DELETE FROM response_cache_entries WHERE key IN ("
+                    "SELECT key FROM response_cache_entries WHERE expires_at <= now() LIMIT 100)"
+                )
+            )
+
+    def generations(self, scopes: List[str]) -> Dict[str, int]:
+        with self.engine.connect() as conn:
+            rows = conn.execute(
+                text(
+                    "SELECT scope, generation FROM response_cache_generations "
+                    "WHERE scope = ANY(:scopes)"
+                ),
+                {"scopes": list(scopes)},
+            ).all()
+        found = {scope: generation for scope, generation in rows}
+        return {scope: found.get(scope, 0) for scope in scopes}
+
+    def bump(self, scopes: Iterable[str]):
+        with self.engine.begin() as conn:
+            for scope in sorted(set(scopes)):
+                conn.execute(
+                    text(
+                        "INSERT INTO response_cache_generations (scope, generation) VALUES (:scope, 1) "
+                        "ON CONFLICT (scope) DO UPDATE "
+                        "SET generation = response_cache_generations.generation + 1"
+                    ),
+                    {"scope": scope},
+                )
+
+
+@dataclass
+class _Flight:
+    """A computation in progress that concurrent callers wait on."""
+    done: threading.Event = field(default_factory=threading.Event)
+    value: Any = None
+    error: Optional[BaseException] = None
+
+
+class ResponseCache:
+    """
+    Caches endpoint results and coalesces concurrent computations.
+
+    Only one thread per process computes a missing entry; the others wait for
+    its result (single flight) instead of stampeding the database.
+    """
+
+    def __init__(self, backend: CacheBackend, ttl_seconds: float):
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._flights: Dict[str, _Flight] = {}
+
+    @staticmethod
+    def _scopes(tenant_ids: Optional[Iterable]) -> List[str]:
+        if tenant_ids is None:
+            return [ALL_TENANTS]
+        return sorted({f"tenant:{tenant_id}" for tenant_id in tenant_ids})
+
+    def _key(self, endpoint: str, scopes: List[str], params: Dict[str, Any]) -> str:
+        generations = self.backend.generations(scopes)
+        scope_part = ",".join(f"{scope}@{generations[scope]}" for scope in scopes)
+        param_part = json.dumps(params, sort_keys=True, default=str)
+        return f"{endpoint}|{scope_part}|{param_part}"
+
+    def get_or_compute(
+        self,
+        endpoint: str,
+        tenant_ids: Optional[Iterable],
+        params: Dict[str, Any],
+        compute: Callable[[], Any],
+    ) -> Any:
+        """
+        Return the cached result for (endpoint, tenant set, params), computing
+        it once if missing. `tenant_ids=None` means every tenant. Exceptions
+        from `compute` (e.g. HTTPException) are never cached.
+        """
+        try:
+            key = self._key(endpoint, self._scopes(tenant_ids), params)
+            cached = self.backend.get(key)
+        except Exception as e:
+            logger.warning(f"Response cache unavailable, computing {endpoint} directly: {e}")
+            return compute()
+
+        if cached is not None:
+            return cached
+
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            flight.value = compute()
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+
+        try:
+            self.backend.set(key, flight.value, self.ttl_seconds)
+        except Exception as e:
+            logger.warning(f"Failed to store {endpoint} in response cache: {e}")
+        return flight.value
+
+    def invalidate_tenant(self, tenant_id):
+        """Drop every cached result that includes this tenant's data."""
+        try:
+            self.backend.bump([f"tenant:{tenant_id}", ALL_TENANTS])
+        except Exception as e:
+            logger.error(f"Failed to invalidate response cache for tenant {tenant_id}: {e}")
+
+
+def create_response_cache(name: Optional[str] = None) -> ResponseCache:
+    """Create the cache selected by settings.RESPONSE_CACHE_BACKEND."""
+    name = (name or settings.RESPONSE_CACHE_BACKEND).lower()
+    if name == "postgres":
+        backend = PostgresCacheBackend()
+    elif name == "none":
+        backend = NullCacheBackend()
+    else:
+        if name != "memory":
+            logger.warning(f"Unknown RESPONSE_CACHE_BACKEND '{name}', falling back to in-process cache")
+        backend = MemoryCacheBackend()
+    return ResponseCache(backend, settings.RESPONSE_CACHE_TTL_SECONDS)
+
+
+response_cache = create_response_cache()
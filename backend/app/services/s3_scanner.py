@@ -2,6 +2,7 @@ import boto3
 import json
 from typing import List, Dict
 from botocore.exceptions import ClientError
+from app.services.finding_rules import rule_finding
 
 
 def scan_s3(session: boto3.Session) -> List[Dict]:
@@ -28,15 +29,7 @@ def scan_s3(session: boto3.Session) -> List[Dict]:
                     if grantee.get("Type") == "Group":
                         uri = grantee.get("URI", "")
                         if "AllUsers" in uri or "AuthenticatedUsers" in uri:
-                            findings.append({
-                                "category": "S3",
-                                "title": f"Public S3 bucket: {bucket_name}",
-                                "description": f"S3 bucket '{bucket_name}' has public access via ACL.",
-                                "severity": "HIGH",
-                                "resource_id": bucket_name,
-                                "remediation": f"Remove public ACL grants from bucket '{bucket_name}'.",
-                                "mapped_control": "ISO 27001 A.9.1.2",
-                            })
+                            findings.append(rule_finding("S3_BUCKET_PUBLIC_ACL", bucket_name, bucket_name=bucket_name))
                             break
             except ClientError as e:
                 # Some buckets may not allow ACL access
@@ -52,26 +45,13 @@ def scan_s3(session: boto3.Session) -> List[Dict]:
                     principal = statement.get("Principal", {})
                     if isinstance(principal, dict):
                         if "*" in principal or "AWS" in principal and "*" in str(principal.get("AWS", "")):
-                            findings.append({
-                                "category": "S3",
-                                "title": f"Public S3 bucket via policy: {bucket_name}",
-                                "description": f"S3 bucket '{bucket_name}' has a bucket policy that allows public access.",
-                                "severity": "HIGH",
-                                "resource_id": bucket_name,
-                                "remediation": f"Review and restrict bucket policy for '{bucket_name}'.",
-                                "mapped_control": "ISO 27001 A.9.1.2",
-                            })
+                            findings.append(rule_finding(
+                                "S3_BUCKET_PUBLIC_POLICY", bucket_name,
+                                bucket_name=bucket_name,
+                            ))
                             break
                     elif principal == "*":
-                        findings.append({
-                            "category": "S3",
-                            "title": f"Public S3 bucket via policy: {bucket_name}",
-                            "description": f"S3 bucket '{bucket_name}' has a bucket policy that allows public access.",
-                            "severity": "HIGH",
-                            "resource_id": bucket_name,
-                            "remediation": f"Review and restrict bucket policy for '{bucket_name}'.",
-                            "mapped_control": "ISO 27001 A.9.1.2",
-                        })
+                        findings.append(rule_finding("S3_BUCKET_PUBLIC_POLICY", bucket_name, bucket_name=bucket_name))
                         break
             except ClientError as e:
                 if "NoSuchBucketPolicy" not in str(e) and "AccessDenied" not in str(e):
@@ -83,15 +63,7 @@ def scan_s3(session: boto3.Session) -> List[Dict]:
                 # If we get here, encryption is configured
             except ClientError as e:
                 if "ServerSideEncryptionConfigurationNotFoundError" in str(e):
-                    findings.append({
-                        "category": "S3",
-                        "title": f"S3 bucket without encryption: {bucket_name}",
-                        "description": f"S3 bucket '{bucket_name}' does not have default encryption enabled.",
-                        "severity": "MEDIUM",
-                        "resource_id": bucket_name,
-                        "remediation": f"Enable default encryption (SSE-S3 or SSE-KMS) for bucket '{bucket_name}'.",
-                        "mapped_control": "ISO 27001 A.10.1.1",
-                    })
+                    findings.append(rule_finding("S3_BUCKET_NO_ENCRYPTION", bucket_name, bucket_name=bucket_name))
                 elif "AccessDenied" not in str(e):
                     print(f"Error checking encryption for {bucket_name}: {e}")
     
@@ -0,0 +1,159 @@
+"""
+SARIF 2.1.0 export of findings for code-scanning and CI consumers.
+
+Results are streamed from the same server-side cursor as the other exports.
+Rule metadata is written once per rule in tool.driver.rules (after the
+results, once every referenced rule is known) and each result points at it
+by ruleId/ruleIndex, so the document grows with the number of findings, not
+with findings times rule text.
+"""
+import json
+from typing import Dict, Iterator, List, Optional, Tuple
+from uuid import UUID
+from sqlalchemy.orm import Session
+
+from app.core.app_config import APP_NAME, APP_VERSION, GITHUB_URL
+from app.services.finding_export import EXPORT_COLUMNS, iter_export_chunks
+from app.services.finding_rules import RULES, placeholders
+
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+SARIF_VERSION = "2.1.0"
+
+# Fields every SARIF result is built from (see finding_export.export_query)
+SARIF_COLUMNS = [
+    EXPORT_COLUMNS[name]
+    for name in (
+        "id", "category", "title", "description", "severity",
+        "resource_id", "remediation", "mapped_control", "remediation_status", "created_at",
+    )
+]
+
+SARIF_LEVELS = {
+    "CRITICAL": "error",
+    "HIGH": "error",
+    "MEDIUM": "warning",
+    "LOW": "note",
+}
+
+# GitHub code scanning reads properties.security-severity (0.0 - 10.0)
+SECURITY_SEVERITY = {
+    "CRITICAL": "9.5",
+    "HIGH": "8.0",
+    "MEDIUM": "5.5",
+    "LOW": "2.0",
+}
+
+
+def _catalog_rule(rule_id: str) -> Dict:
+    rule = RULES[rule_id]
+    tags = ["security", rule.category]
+    if rule.mapped_control:
+        tags.append(rule.mapped_control)
+    return {
+        "id": rule.rule_id,
+        "name": rule.rule_id,
+        "shortDescription": {"text": placeholders(rule.title)},
+        "fullDescription": {"text": placeholders(rule.description)},
+        "help": {"text": placeholders(rule.remediation)},
+        "defaultConfiguration": {"level": SARIF_LEVELS[rule.severity]},
+        "properties": {
+            "tags": tags,
+            "security-severity": SECURITY_SEVERITY[rule.severity],
+        },
+    }
+
+
+def _category_rule(rule_id: str, category: str) -> Dict:
+    """Rule for findings that predate the rule catalog (or scanner errors)."""
+    return {
+        "id": rule_id,
+        "name": rule_id,
+        "shortDescription": {"text": f"{category} finding"},
+        "properties": {"tags": ["security", category]},
+    }
+
+
+class _RuleIndex:
+    """Assigns ruleIndex values in order of first use and keeps one descriptor per rule."""
+
+    def __init__(self):
+        self.rules: List[Dict] = []
+        self._indexes: Dict[str, int] = {}
+
+    def index_for(self, rule_id: Optional[str], category: str) -> Tuple[str, int]:
+        if not rule_id or rule_id not in RULES:
+            rule_id = f"{category}_FINDING"
+        index = self._indexes.get(rule_id)
+        if index is None:
+            index = len(self.rules)
+            self._indexes[rule_id] = index
+            if rule_id in RULES:
+                self.rules.append(_catalog_rule(rule_id))
+            else:
+                self.rules.append(_category_rule(rule_id, category))
+        return rule_id, index
+
+
+def _result(row, rules: _RuleIndex) -> Dict:
+    values = {column.name: column.value(row) for column in SARIF_COLUMNS}
+    rule_id, rule_index = rules.index_for(row.rule_id, values["category"])
+
+    result = {
+        "ruleId": rule_id,
+        "ruleIndex": rule_index,
+        "level": SARIF_LEVELS.get(values["severity"], "warning"),
+        "message": {"text": values["description"] or values["title"]},
+        "partialFingerprints": {"findingId/v1": values["id"]},
+        "properties": {
+            "title": values["title"],
+            "severity": values["severity"],
+            "category": values["category"],
+            "remediationStatus": values["remediation_status"],
+            "createdAt": values["created_at"].isoformat() if values["created_at"] else None,
+        },
+    }
+    if values["resource_id"]:
+        result["locations"] = [{
+            "logicalLocations": [{
+                "fullyQualifiedName": values["resource_id"],
+                "kind": "resource",
+            }],
+        }]
+    # Catalog rules carry the remediation text; only inline findings need it per result
+    if rule_id not in RULES and values["remediation"]:
+        result["properties"]["remediation"] = values["remediation"]
+    return result
+
+
+def stream_sarif(db: Session, query, tenant_id: UUID, scan_run_id: Optional[UUID] = None) -> Iterator[str]:
+    """
+    A SARIF log with a single run, written incrementally.
+
+    query must select the SARIF_COLUMNS sources (finding_export.export_query).
+    """
+    rules = _RuleIndex()
+
+    yield f'{{"$schema": {json.dumps(SARIF_SCHEMA)}, "version": "{SARIF_VERSION}", "runs": [{{"results": ['
+
+    separator = ""
+    for rows in iter_export_chunks(db, query):
+        parts = []
+        for row in rows:
+            parts.append(separator + json.dumps(_result(row, rules)))
+            separator = ","
+        yield "".join(parts)
+
+    # One automation id per tenant keeps uploads of different tenants apart
+    automation_id = f"{APP_NAME.lower()}/{tenant_id}/"
+    if scan_run_id:
+        automation_id += str(scan_run_id)
+
+    tool = {
+        "driver": {
+            "name": APP_NAME,
+            "version": APP_VERSION,
+            "informationUri": GITHUB_URL,
+            "rules": rules.rules,
+        },
+    }
+    yield f'], "tool": {json.dumps(tool)}, "automationDetails": {json.dumps({"id": automation_id})}}}]}}\n'
@@ -0,0 +1,152 @@
+"""
+Thread-safe progress bus for scan events.
+
+Scans run in worker threads (FastAPI background tasks, the APScheduler thread),
+so they cannot await WebSocket sends directly. Workers publish events to the bus
+and the API event loop drains it into the WebSocket connection manager.
+"""
+import asyncio
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Awaitable, Callable, Optional, Tuple
+from uuid import UUID
+
+from app.models.scan_run import ScanRun
+
+logger = logging.getLogger(__name__)
+
+Dispatcher = Callable[[str, dict], Awaitable[None]]
+
+
+class ScanProgressBus:
+    """
+    Collects scan progress events from worker threads.
+
+    Events published with the same coalesce key replace each other while they
+    wait to be dispatched, so a burst of updates for one scan collapses to the
+    latest one instead of queueing up behind slow clients.
+    """
+
+    def __init__(self, flush_interval: float = 0.1, max_pending: int = 10000):
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._lock = threading.Lock()
+        self._pending: "OrderedDict[Tuple, Tuple[str, dict]]" = OrderedDict()
+        self._sequence = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+
+    def attach(self, loop: asyncio.AbstractEventLoop):
+        """Bind the bus to the event loop that will drain it."""
+        self._loop = loop
+        self._wakeup = asyncio.Event()
+
+    def detach(self):
+        """Stop accepting events (called on application shutdown)."""
+        self._loop = None
+        with self._lock:
+            self._pending.clear()
+
+    def publish(self, tenant_id, message: dict, coalesce_key: Optional[Tuple] = None):
+        """
+        Queue a message for every WebSocket connection of a tenant.
+        Safe to call from any thread; never blocks on network I/O.
+        """
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            logger.debug(f"No event loop attached, dropping {message.get('type')} event")
+            return
+
+        tenant_key = str(tenant_id)
+        with self._lock:
+            if coalesce_key is None:
+                self._sequence += 1
+                key = (tenant_key, "_seq", self._sequence)
+            else:
+                key = (tenant_key,) + tuple(coalesce_key)
+                # Re-insert at the end so the latest value keeps its place in the stream
+                self._pending.pop(key, None)
+
+            if len(self._pending) >= self.max_pending:
+                self._pending.popitem(last=False)
+                logger.warning("Scan progress bus is full, dropping oldest event")
+
+            self._pending[key] = (tenant_key, message)
+
+        try:
+            loop.call_soon_threadsafe(self._wakeup.set)
+        except RuntimeError:
+            # Loop was closed between the check above and now
+            pass
+
+    def _take_pending(self):
+        with self._lock:
+            batch = list(self._pending.values())
+            self._pending.clear()
+        return batch
+
+    async def run(self, dispatch: Dispatcher):
+        """Drain the bus forever, handing each message to `dispatch`."""
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+
+            # Give bursts a moment to coalesce before sending
+            if self.flush_interval:
+                await asyncio.sleep(self.flush_interval)
+
+            for tenant_id, message in self._take_pending():
+                try:
+                    await dispatch(tenant_id, message)
+                except Exception as e:
+                    logger.error(f"Failed to dispatch scan progress event: {e}", exc_info=True)
+
+
+progress_bus = ScanProgressBus()
+
+
+def scan_update_message(scan_run: ScanRun) -> dict:
+    """Build the `scan_update` message for a scan run's current state."""
+    return {
+        "type": "scan_update",
+        "scan_id": str(scan_run.id),
+        "status": scan_run.status,
+        "started_at": scan_run.started_at.isoformat() if scan_run.started_at else None,
+        "finished_at": scan_run.finished_at.isoformat() if scan_run.finished_at else None,
+        "summary": scan_run.summary,
+    }
+
+
+def publish_scan_update(tenant_id: UUID, scan_run: ScanRun):
+    """Notify WebSocket clients that a scan's status changed."""
+    progress_bus.publish(
+        tenant_id,
+        scan_update_message(scan_run),
+        coalesce_key=(str(scan_run.id), "scan_update"),
+    )
+
+
+def publish_scan_progress(
+    tenant_id: UUID,
+    scan_run_id: UUID,
+    event: str,
+    coalesce_key: Optional[Tuple] = None,
+    **fields,
+):
+    """
+    Publish an intermediate scan progress event.
+
+    Events: scanner_started, scanner_finished, region_finished, findings_persisted.
+    """
+    message = {
+        "type": "scan_progress",
+        "scan_id": str(scan_run_id),
+        "event": event,
+        "at": datetime.utcnow().isoformat(),
+        **fields,
+    }
+    if coalesce_key is not None:
+        coalesce_key = (str(scan_run_id),) + tuple(coalesce_key)
+    progress_bus.publish(tenant_id, message, coalesce_key=coalesce_key)
@@ -16,6 +16,11 @@ from app.services.ebs_scanner import scan_ebs
 from app.services.rds_scanner import scan_rds
 from app.services.lambda_scanner import scan_lambda
 from app.services.cloudwatch_scanner import scan_cloudwatch
+from app.services.scan_progress import publish_scan_update, publish_scan_progress
+from app.services.finding_counts import record_scan_finding_counts
+from app.services.finding_history import record_occurrences, scan_findings_query
+from app.services.response_cache import response_cache
+from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
@@ -48,20 +53,8 @@ def run_scan(db: Session, scan_run_id: UUID, tenant_id: UUID) -> ScanRun:
     db.refresh(scan_run)
     
     # Notify WebSocket connections about scan start
-    try:
-        import asyncio
-        from app.api.websocket import notify_scan_update
-        try:
-            loop = asyncio.get_event_loop()
-            if loop.is_running():
-                asyncio.create_task(notify_scan_update(tenant_id, scan_run, db))
-            else:
-                loop.run_until_complete(notify_scan_update(tenant_id, scan_run, db))
-        except RuntimeError:
-            # No event loop, create new one
-            asyncio.run(notify_scan_update(tenant_id, scan_run, db))
-    except Exception as e:
-        logger.error(f"Failed to send WebSocket notification: {e}", exc_info=True)
+    publish_scan_update(tenant_id, scan_run)
+    response_cache.invalidate_tenant(tenant_id)
     
     all_findings = []
     
@@ -102,13 +95,33 @@ def run_scan(db: Session, scan_run_id: UUID, tenant_id: UUID) -> ScanRun:
             ]
         
         for scanner_name, scanner_func in scanners:
+            publish_scan_progress(
+                tenant_id, scan_run.id, "scanner_started",
+                coalesce_key=("scanner", scanner_name),
+                scanner=scanner_name,
+            )
             try:
                 logger.info(f"Running {scanner_name} scanner for tenant {tenant_id}")
                 findings = scanner_func(session)
                 all_findings.extend(findings)
                 logger.info(f"{scanner_name} scanner found {len(findings)} issues")
+                publish_scan_progress(
+                    tenant_id, scan_run.id, "scanner_finished",
+                    coalesce_key=("scanner", scanner_name),
+                    scanner=scanner_name,
+                    status="completed",
+                    findings_count=len(findings),
+                )
             except Exception as e:
                 logger.error(f"{scanner_name} scanner failed: {e}", exc_info=True)
+                publish_scan_progress(
+                    tenant_id, scan_run.id, "scanner_finished",
+                    coalesce_key=("scanner", scanner_name),
+                    scanner=scanner_name,
+                    status="failed",
+                    findings_count=0,
+                    error=str(e),
+                )
                 # Create a finding about the scanner failure
                 all_findings.append({
                     "category": scanner_name,
@@ -120,6 +133,14 @@ def run_scan(db: Session, scan_run_id: UUID, tenant_id: UUID) -> ScanRun:
                     "mapped_control": None,
                 })
         
+        # Scanners run against the configured region only
+        publish_scan_progress(
+            tenant_id, scan_run.id, "region_finished",
+            region=settings.AWS_REGION,
+            scanners_run=len(scanners),
+            findings_count=len(all_findings),
+        )
+        
         # Check for previously marked-as-fixed findings that are now resolved
         # Get all findings marked as fixed from previous scans
         marked_fixed_findings = (
@@ -174,6 +195,8 @@ def run_scan(db: Session, scan_run_id: UUID, tenant_id: UUID) -> ScanRun:
         
         new_findings_count = 0
         updated_findings_count = 0
+        redetected_findings = {}
+        new_findings = []
         
         for finding_data in all_findings:
             finding_key = (
@@ -186,8 +209,15 @@ def run_scan(db: Session, scan_run_id: UUID, tenant_id: UUID) -> ScanRun:
             existing_finding = existing_findings.get(finding_key)
             
             if existing_finding:
-                # Update existing finding: refresh scan_run_id
-                existing_finding.scan_run_id = scan_run.id
+                # Existing finding: this scan is recorded as an occurrence below
+                redetected_findings[existing_finding.id] = existing_finding
+                # Findings stored before the rule catalog carry their text inline;
+                # switch them to the rule so the text columns can be dropped
+                if finding_data.get("rule_id") and not existing_finding.rule_id:
+                    existing_finding.rule_id = finding_data["rule_id"]
+                    existing_finding.params = finding_data.get("params")
+                    existing_finding.description_text = None
+                    existing_finding.remediation_text = None
                 # Only update status if it was marked as fixed but the issue persists
                 if existing_finding.remediation_status == "marked_fixed":
                     existing_finding.remediation_status = "open"  # Issue still exists
@@ -200,15 +230,22 @@ def run_scan(db: Session, scan_run_id: UUID, tenant_id: UUID) -> ScanRun:
                     scan_run_id=scan_run.id,
                     category=finding_data["category"],
                     title=finding_data["title"],
-                    description=finding_data.get("description"),
                     severity=finding_data["severity"],
                     resource_id=finding_data.get("resource_id"),
+                    rule_id=finding_data.get("rule_id"),
+                    params=finding_data.get("params"),
+                    # Catalog findings render their text from rule_id + params
+                    description=finding_data.get("description"),
                     remediation=finding_data.get("remediation"),
                     mapped_control=finding_data.get("mapped_control"),
                 )
                 db.add(finding)
+                new_findings.append(finding)
                 new_findings_count += 1
         
+        # Extend occurrence ranges of re-detected findings, open ranges for the rest
+        record_occurrences(db, scan_run, redetected_findings.values(), new_findings)
+        
         # Calculate summary
         summary = {
             "total_findings": len(all_findings),
@@ -228,6 +265,9 @@ def run_scan(db: Session, scan_run_id: UUID, tenant_id: UUID) -> ScanRun:
             category = finding["category"]
             summary["by_category"][category] = summary["by_category"].get(category, 0) + 1
         
+        # Aggregate counts are committed together with the scan completion
+        record_scan_finding_counts(db, scan_run.id, tenant_id)
+        
         # Update scan run
         scan_run.status = "completed"
         scan_run.finished_at = datetime.utcnow()
@@ -237,6 +277,14 @@ def run_scan(db: Session, scan_run_id: UUID, tenant_id: UUID) -> ScanRun:
         db.refresh(scan_run)
         
         logger.info(f"Scan {scan_run.id} completed with {len(all_findings)} findings")
+        publish_scan_progress(
+            tenant_id, scan_run.id, "findings_persisted",
+            coalesce_key=("findings_persisted",),
+            persisted=new_findings_count + updated_findings_count,
+            new_findings=new_findings_count,
+            updated_findings=updated_findings_count,
+            verified_fixed=verified_count,
+        )
         
         # Send notifications for new findings
         try:
@@ -248,14 +296,7 @@ def run_scan(db: Session, scan_run_id: UUID, tenant_id: UUID) -> ScanRun:
             # Only send if enabled and there are findings
             if notification_prefs.get("notify_on_scan_complete", True) and all_findings:
                 # Get stored findings from this scan
-                finding_objects = (
-                    db.query(Finding)
-                    .filter(
-                        Finding.tenant_id == tenant_id,
-                        Finding.scan_run_id == scan_run.id
-                    )
-                    .all()
-                )
+                finding_objects = scan_findings_query(db, scan_run).all()
                 
                 if finding_objects:
                     send_notifications_for_findings(
@@ -266,20 +307,8 @@ def run_scan(db: Session, scan_run_id: UUID, tenant_id: UUID) -> ScanRun:
             logger.error(f"Failed to send notifications: {e}", exc_info=True)
         
         # Notify WebSocket connections about scan completion
-        try:
-            import asyncio
-            from app.api.websocket import notify_scan_update
-            try:
-                loop = asyncio.get_event_loop()
-                if loop.is_running():
-                    asyncio.create_task(notify_scan_update(tenant_id, scan_run, db))
-                else:
-                    loop.run_until_complete(notify_scan_update(tenant_id, scan_run, db))
-            except RuntimeError:
-                # No event loop, create new one
-                asyncio.run(notify_scan_update(tenant_id, scan_run, db))
-        except Exception as e:
-            logger.error(f"Failed to send WebSocket notification: {e}", exc_info=True)
+        publish_scan_update(tenant_id, scan_run)
+        response_cache.invalidate_tenant(tenant_id)
         
     except Exception as e:
         error_message = str(e)
@@ -291,20 +320,8 @@ def run_scan(db: Session, scan_run_id: UUID, tenant_id: UUID) -> ScanRun:
         db.refresh(scan_run)
         
         # Notify WebSocket connections about scan failure
-        try:
-            import asyncio
-            from app.api.websocket import notify_scan_update
-            try:
-                loop = asyncio.get_event_loop()
-                if loop.is_running():
-                    asyncio.create_task(notify_scan_update(tenant_id, scan_run, db))
-                else:
-                    loop.run_until_complete(notify_scan_update(tenant_id, scan_run, db))
-            except RuntimeError:
-                # No event loop, create new one
-                asyncio.run(notify_scan_update(tenant_id, scan_run, db))
-        except Exception as e:
-            logger.error(f"Failed to send WebSocket notification: {e}", exc_info=True)
+        publish_scan_update(tenant_id, scan_run)
+        response_cache.invalidate_tenant(tenant_id)
     
     return scan_run
 
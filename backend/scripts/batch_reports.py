@@ -0,0 +1,47 @@
+"""
+Batch report script.
+Writes the PDF and compliance reports of all (or some) tenants to one zip file.
+
+Usage: python scripts/batch_reports.py --month 2024-03 --output reports-2024-03.zip
+"""
+import argparse
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from uuid import UUID
+
+from app.db.session import SessionLocal
+from app.services.batch_reports import BATCH_REPORT_KINDS, parse_month, stream_batch_reports
+from app.services.report_artifacts import shutdown_render_pool
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate reports for many tenants as one zip archive")
+    parser.add_argument("--month", help="Use the latest completed scan started in this month (YYYY-MM)")
+    parser.add_argument("--tenant", action="append", type=UUID, dest="tenant_ids", help="Tenant id (repeatable, default: all)")
+    parser.add_argument("--kind", action="append", choices=BATCH_REPORT_KINDS, dest="kinds", help="Report kind (repeatable, default: all)")
+    parser.add_argument("--output", required=True, help="Path of the zip file to write")
+    args = parser.parse_args()
+    
+    if args.month:
+        try:
+            parse_month(args.month)
+        except ValueError as e:
+            parser.error(str(e))
+    
+    db = SessionLocal()
+    try:
+        with open(args.output, "wb") as out:
+            for chunk in stream_batch_reports(db, args.tenant_ids, args.month, args.kinds or BATCH_REPORT_KINDS):
+                out.write(chunk)
+    finally:
+        db.close()
+        shutdown_render_pool()
+    print(f"Reports written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Response serialization benchmark.
+Encodes the same synthetic findings page (transient ORM rows, no database)
+through FastAPI's default response path and through the helpers in
+app.api.responses, and a statistics-sized dict through jsonable_encoder and
+json_response, reporting the mean time per response.
+
+Usage: python scripts/benchmark_serialization.py --rows 500 --repeat 200
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import List
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+import app.models  # noqa: F401 - configure mappers before building rows
+from app.api.responses import FastJSONResponse, json_response, orm_list_response
+from app.models.finding import Finding
+from app.schemas.finding import FindingResponse
+
+SEVERITIES = ("LOW", "MEDIUM", "HIGH", "CRITICAL")
+CATEGORIES = ("IAM", "S3", "LOGGING")
+
+
+def make_findings(count: int) -> List[Finding]:
+    tenant_id, scan_run_id = uuid.uuid4(), uuid.uuid4()
+    created_at = datetime(2026, 1, 1)
+    return [
+        Finding(
+            id=uuid.uuid4(),
+            tenant_id=tenant_id,
+            scan_run_id=scan_run_id,
+            category=CATEGORIES[index % len(CATEGORIES)],
+            title=f"Finding {index}",
+            description=f"Resource {index} is misconfigured and allows public access.",
+            severity=SEVERITIES[index % len(SEVERITIES)],
+            resource_id=f"arn:aws:s3:::bucket-{index}",
+            remediation="Remove the public ACL grant.",
+            mapped_control="ISO 27001 A.9.4.3",
+            remediation_status="open",
+            remediation_metadata={"aws_cli": f"aws s3api put-bucket-acl --bucket bucket-{index} --acl private"},
+            created_at=created_at + timedelta(minutes=index),
+        )
+        for index in range(count)
+    ]
+
+
+def make_statistics(tenants: int) -> dict:
+    return {
+        "generated_at": datetime(2026, 1, 1),
+        "tenants": [
+            {
+                "tenant_id": uuid.uuid4(),
+                "last_scan_at": datetime(2026, 1, 1) + timedelta(hours=index),
+                "by_severity": {severity: index * rank for rank, severity in enumerate(SEVERITIES)},
+                "by_category": {category: index for category in CATEGORIES},
+            }
+            for index in range(tenants)
+        ],
+    }
+
+
+def measure(encode, repeat: int) -> float:
+    encode()  # warm up adapters and caches
+    started = time.perf_counter()
+    for _ in range(repeat):
+        encode()
+    return (time.perf_counter() - started) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare response serialization paths")
+    parser.add_argument("--rows", type=int, default=500, help="findings per response")
+    parser.add_argument("--tenants", type=int, default=200, help="tenants in the statistics dict")
+    parser.add_argument("--repeat", type=int, default=200, help="responses encoded per path")
+    args = parser.parse_args()
+
+    findings = make_findings(args.rows)
+    statistics = make_statistics(args.tenants)
+    field = create_response_field(name="Response_list_findings", type_=List[FindingResponse], mode="serialization")
+    loop = asyncio.new_event_loop()
+
+    def default_path(response_class):
+        # What a route with response_model=List[FindingResponse] does with the returned rows
+        content = loop.run_until_complete(serialize_response(field=field, response_content=findings))
+        return response_class(content).body
+
+    cases = [
+        (f"findings x{args.rows}: default (JSONResponse)", lambda: default_path(JSONResponse)),
+        (f"findings x{args.rows}: default (FastJSONResponse)", lambda: default_path(FastJSONResponse)),
+        (f"findings x{args.rows}: orm_list_response", lambda: orm_list_response(FindingResponse, findings).body),
+        (f"statistics x{args.tenants}: jsonable_encoder", lambda: JSONResponse(jsonable_encoder(statistics)).body),
+        (f"statistics x{args.tenants}: json_response", lambda: json_response(statistics).body),
+    ]
+    for name, encode in cases:
+        size = len(encode())
+        seconds = measure(encode, args.repeat)
+        print(f"{name:<48} {seconds * 1000:8.2f} ms  {size / 1024:8.1f} KiB")
+    loop.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+UUID primary key insert benchmark.
+Bulk-inserts the same rows into two temporary tables, one keyed by uuid4 and
+one by uuid7, and reports insert throughput and primary key index size.
+
+Usage: python scripts/benchmark_uuid_inserts.py --rows 1000000 --batch 5000
+"""
+import argparse
+import os
+import sys
+import time
+import uuid
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+
+from app.core.ids import uuid7
+from app.db.base import engine
+
+GENERATORS = {"uuid4": uuid.uuid4, "uuid7": uuid7}
+
+
+def run(generator_name: str, rows: int, batch: int):
+    generate = GENERATORS[generator_name]
+    table = f"bench_{generator_name}"
+    with engine.connect() as connection:
+        connection.execute(text(
+            f"CREATE TEMPORARY TABLE {table} ("
+            " id uuid PRIMARY KEY, tenant_id uuid NOT NULL, created_at timestamp NOT NULL DEFAULT now(),"
+            " payload text)"
+        ))
+        connection.commit()
+        tenant_id = uuid.uuid4()
+        statement = text(f"INSERT INTO {table} (id, tenant_id, payload) VALUES (:id, :tenant_id, :payload)")
+
+        started = time.perf_counter()
+        for offset in range(0, rows, batch):
+            connection.execute(statement, [
+                {"id": generate(), "tenant_id": tenant_id, "payload": "x" * 64}
+                for _ in range(min(batch, rows - offset))
+            ])
+            connection.commit()
+        elapsed = time.perf_counter() - started
+
+        index_bytes = connection.execute(text(f"SELECT pg_relation_size('{table}_pkey')")).scalar()
+        connection.execute(text(f"DROP TABLE {table}"))
+        connection.commit()
+
+    print(
+        f"{generator_name}: {rows} rows in {elapsed:.2f}s ({rows / elapsed:,.0f} rows/s), "
+        f"primary key index {index_bytes / 1024 / 1024:.1f} MiB"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare uuid4 and uuid7 primary key bulk inserts")
+    parser.add_argument("--rows", type=int, default=200000, help="Rows per table")
+    parser.add_argument("--batch", type=int, default=5000, help="Rows per INSERT transaction")
+    args = parser.parse_args()
+
+    for name in GENERATORS:
+        run(name, args.rows, args.batch)
+
+
+if __name__ == "__main__":
+    main()
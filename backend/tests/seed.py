@@ -0,0 +1,120 @@
+"""Bulk test data: tenants with scan runs, findings (and their occurrences) and alerts."""
+import itertools
+import uuid
+from datetime import datetime, timedelta
+from typing import List
+
+from sqlalchemy import insert, text
+from sqlalchemy.orm import Session
+
+from app.core.ids import uuid7
+from app.models.alert import Alert
+from app.models.finding import Finding
+from app.models.finding_occurrence import FindingOccurrence
+from app.models.scan_run import ScanRun
+from app.models.tenant import Tenant
+from app.services.finding_counts import record_scan_finding_counts
+
+SEVERITIES = ("LOW", "MEDIUM", "HIGH", "CRITICAL")
+CATEGORIES = ("IAM", "S3", "LOGGING", "EC2")
+
+
+def seed_tenants(
+    db: Session,
+    tenants: int,
+    scans_per_tenant: int = 1,
+    findings_per_scan: int = 0,
+    alerts_per_scan: int = 0,
+    analyze: bool = False,
+    record_counts: bool = False,
+) -> List[uuid.UUID]:
+    """
+    Insert tenants, each with completed scans a day apart and findings
+    (and alerts) per scan. Each finding is seen by the scan that created it
+    only. Returns the tenant ids.
+
+    With record_counts=True scan_finding_counts is filled in as a scan would.
+    With analyze=True the tables are ANALYZEd afterwards, so the planner
+    sees the real row counts.
+    """
+    now = datetime.utcnow()
+    severity = itertools.cycle(SEVERITIES)
+    category = itertools.cycle(CATEGORIES)
+    tenant_rows, scan_rows, finding_rows, occurrence_rows, alert_rows = [], [], [], [], []
+
+    for t in range(tenants):
+        tenant_id = uuid.uuid4()
+        tenant_rows.append({
+            "id": tenant_id,
+            "name": f"Tenant {t:04d}",
+            "aws_role_arn": f"arn:aws:iam::{t:012d}:role/S3ntraCS",
+            "aws_external_id": f"external-{t}",
+            "enabled_scanners": list(CATEGORIES),
+            "created_at": now,
+            "updated_at": now,
+        })
+        for s in range(scans_per_tenant):
+            started_at = now - timedelta(days=scans_per_tenant - s)
+            scan_id = uuid7()
+            scan_rows.append({
+                "id": scan_id,
+                "tenant_id": tenant_id,
+                "status": "completed",
+                "started_at": started_at,
+                "finished_at": started_at + timedelta(minutes=5),
+                "updated_at": started_at + timedelta(minutes=5),
+            })
+            for f in range(findings_per_scan):
+                finding_id = uuid7()
+                finding_rows.append({
+                    "id": finding_id,
+                    "tenant_id": tenant_id,
+                    "scan_run_id": scan_id,
+                    "category": next(category),
+                    "severity": next(severity),
+                    "title": f"Finding {s}-{f}",
+                    "resource_id": f"resource-{f}",
+                    "remediation_status": "open",
+                    "created_at": started_at,
+                    "updated_at": started_at,
+                })
+                occurrence_rows.append({
+                    "id": uuid7(),
+                    "finding_id": finding_id,
+                    "tenant_id": tenant_id,
+                    "first_scan_run_id": scan_id,
+                    "last_scan_run_id": scan_id,
+                    "first_seen_at": started_at,
+                    "last_seen_at": started_at,
+                    "scan_count": 1,
+                })
+                if f < alerts_per_scan:
+                    alert_rows.append({
+                        "id": uuid7(),
+                        "tenant_id": tenant_id,
+                        "finding_id": finding_id,
+                        "channel": "email",
+                        "status": "sent",
+                        "created_at": started_at,
+                    })
+
+    for model, rows in (
+        (Tenant, tenant_rows),
+        (ScanRun, scan_rows),
+        (Finding, finding_rows),
+        (FindingOccurrence, occurrence_rows),
+        (Alert, alert_rows),
+    ):
+        if rows:
+            db.execute(insert(model), rows)
+    db.flush()
+
+    if record_counts:
+        for row in scan_rows:
+            record_scan_finding_counts(db, row["id"], row["tenant_id"])
+        db.flush()
+
+    if analyze:
+        for table in ("tenants", "scan_runs", "findings", "finding_occurrences", "alerts"):
+            db.execute(text(f"ANALYZE {table}"))
+    return [row["id"] for row in tenant_rows]
@@ -0,0 +1,27 @@
+"""Validation of export filter parameters (no database needed)."""
+import uuid
+
+import pytest
+from fastapi import HTTPException
+
+from app.api.exports import _filtered_export_query
+from app.services.finding_export import resolve_remediation_status
+
+
+def test_resolve_remediation_status():
+    assert resolve_remediation_status(None) is None
+    assert resolve_remediation_status("") is None
+    assert resolve_remediation_status(" Marked_Fixed ") == "marked_fixed"
+    with pytest.raises(ValueError, match="Invalid remediation_status"):
+        resolve_remediation_status("fixed")
+
+
+@pytest.mark.parametrize("severity, category, remediation_status", [
+    ("SEVERE", None, None),
+    (None, "DNS", None),
+    (None, None, "markedfixed"),
+])
+def test_invalid_export_filters_are_rejected(severity, category, remediation_status):
+    with pytest.raises(HTTPException) as exc_info:
+        _filtered_export_query(None, uuid.uuid4(), None, None, severity, category, remediation_status)
+    assert exc_info.value.status_code == 400
@@ -0,0 +1,40 @@
+"""Which findings a scan saw, from occurrence ranges."""
+from datetime import datetime, timedelta
+
+from app.models.finding import Finding
+from app.models.scan_run import ScanRun
+from app.services.finding_history import record_occurrences, scan_findings_query
+from tests.seed import seed_tenants
+
+
+def _scan(db, tenant_id, status, started_at):
+    scan = ScanRun(tenant_id=tenant_id, status=status, started_at=started_at)
+    db.add(scan)
+    db.flush()
+    return scan
+
+
+def test_failed_scan_between_completed_scans_saw_nothing(db):
+    tenant_id = seed_tenants(db, tenants=1, scans_per_tenant=0)[0]
+    start = datetime.utcnow() - timedelta(days=3)
+    first = _scan(db, tenant_id, "completed", start)
+    failed = _scan(db, tenant_id, "failed", start + timedelta(days=1))
+    second = _scan(db, tenant_id, "running", start + timedelta(days=2))
+
+    finding = Finding(tenant_id=tenant_id, scan_run_id=first.id, category="S3", severity="HIGH", title="Public bucket")
+    db.add(finding)
+    db.flush()
+    record_occurrences(db, first, [], [finding])
+    db.flush()
+
+    # The next scan re-detects it: one range now covers the failed scan's start time
+    record_occurrences(db, second, [finding], [])
+    db.flush()
+    # While recording, the running scan sees what it recorded
+    assert scan_findings_query(db, second).all() == [finding]
+    second.status = "completed"
+    db.flush()
+
+    assert scan_findings_query(db, first).all() == [finding]
+    assert scan_findings_query(db, second).all() == [finding]
+    assert scan_findings_query(db, failed).all() == []
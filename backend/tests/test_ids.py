@@ -0,0 +1,49 @@
+"""uuid7(): RFC 9562 layout and per-process ordering."""
+import threading
+import time
+from unittest import mock
+
+from app.core import ids
+from app.core.ids import uuid7
+
+
+def test_version_variant_and_timestamp():
+    before_ms = time.time_ns() // 1_000_000
+    value = uuid7()
+    after_ms = time.time_ns() // 1_000_000
+
+    assert value.version == 7
+    assert value.variant == "specified in RFC 4122"
+    assert before_ms <= value.int >> 80 <= after_ms + 1
+
+
+def test_strictly_increasing():
+    values = [uuid7() for _ in range(100_000)]
+    assert all(a < b for a, b in zip(values, values[1:]))
+    # Byte order too, as the database compares them
+    assert values == sorted(values, key=lambda value: value.bytes)
+
+
+def test_counter_overflow_and_clock_step_back_stay_ordered():
+    frozen = time.time_ns()
+    with mock.patch.object(ids.time, "time_ns", return_value=frozen):
+        # Far more than the 12-bit counter holds within one millisecond
+        values = [uuid7() for _ in range(10_000)]
+    with mock.patch.object(ids.time, "time_ns", return_value=frozen - 5_000_000_000):
+        values.append(uuid7())
+    assert all(a < b for a, b in zip(values, values[1:]))
+    assert all(value.version == 7 for value in values)
+
+
+def test_unique_across_threads():
+    results = []
+
+    def generate():
+        results.extend(uuid7() for _ in range(10_000))
+
+    threads = [threading.Thread(target=generate) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(set(results)) == 80_000
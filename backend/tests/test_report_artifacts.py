@@ -0,0 +1,83 @@
+"""ReportArtifactCache: single render per scan and tenant name, safe cleanup of old files."""
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from app.services.pdf_report import REPORT_VERSION
+from app.services.report_artifacts import ReportArtifactCache
+
+
+def test_concurrent_renders_store_one_file(tmp_path):
+    cache = ReportArtifactCache(str(tmp_path))
+    scan_id = uuid.uuid4()
+    renders = []
+
+    def render():
+        # Every render differs (like the "Generated on" footer)
+        renders.append(1)
+        time.sleep(0.05)
+        return f"pdf {time.monotonic_ns()}".encode()
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda _: cache.get_or_render(scan_id, "Acme", render), range(8)))
+
+    assert len(renders) == 1
+    assert len({result.etag for result in results}) == 1
+    assert len(os.listdir(tmp_path)) == 1
+
+
+def test_render_from_submitted_future_joins_the_flight(tmp_path):
+    """A batch render (already-submitted future) and a request for the same scan store one file."""
+    cache = ReportArtifactCache(str(tmp_path))
+    scan_id = uuid.uuid4()
+    batch_render = Future()
+    batch_done = threading.Event()
+    results = {}
+
+    def batch():
+        results["batch"] = cache.get_or_render(scan_id, "Acme", lambda: batch_render.result(timeout=5))
+        batch_done.set()
+
+    thread = threading.Thread(target=batch)
+    thread.start()
+    time.sleep(0.05)
+    # The request arrives while the batch render is in flight and waits for it
+    request = threading.Thread(target=lambda: results.update(request=cache.get_or_render(scan_id, "Acme", lambda: b"request")))
+    request.start()
+    batch_render.set_result(b"batch")
+    thread.join(5)
+    request.join(5)
+
+    assert results["batch"] == results["request"]
+    assert len(os.listdir(tmp_path)) == 1
+
+
+def test_put_removes_only_older_versions(tmp_path):
+    cache = ReportArtifactCache(str(tmp_path))
+    scan_id = uuid.uuid4()
+    older = tmp_path / f"{scan_id}.v{REPORT_VERSION - 1}.{'0' * 16}.{'0' * 64}.pdf"
+    older.write_bytes(b"old")
+    sibling = cache.put(scan_id, "Acme", b"first render")
+
+    cached = cache.put(scan_id, "Acme", b"second render")
+
+    assert not older.exists()
+    # A same-version file may be being sent by another request
+    assert os.path.exists(sibling.path)
+    assert os.path.exists(cached.path)
+    assert cache.get(scan_id, "Acme") == cache.get(scan_id, "Acme")
+
+
+def test_renamed_tenant_renders_again(tmp_path):
+    """The tenant name is printed on the report, so it is part of the cache key."""
+    cache = ReportArtifactCache(str(tmp_path))
+    scan_id = uuid.uuid4()
+    before = cache.get_or_render(scan_id, "Acme", lambda: b"report for Acme")
+
+    after = cache.get_or_render(scan_id, "Acme Corp", lambda: b"report for Acme Corp")
+
+    assert after.etag != before.etag
+    assert cache.get(scan_id, "Acme") is None
+    assert os.listdir(tmp_path) == [os.path.basename(after.path)]
@@ -0,0 +1,19 @@
+"""Report job parameter normalization (no database needed)."""
+import uuid
+
+import pytest
+
+from app.services.report_jobs import dedupe_key, normalize_job_params
+
+
+def test_remediation_status_is_validated():
+    with pytest.raises(ValueError, match="Invalid remediation_status"):
+        normalize_job_params("csv", {"remediation_status": "fixed"})
+
+
+def test_equivalent_params_share_a_dedupe_key():
+    tenant_id = uuid.uuid4()
+    a = normalize_job_params("csv", {"remediation_status": "Open", "severity": "high"})
+    b = normalize_job_params("csv", {"remediation_status": "open", "severity": "HIGH", "category": ""})
+    assert a == b == {"remediation_status": "open", "severity": "HIGH"}
+    assert dedupe_key(tenant_id, "csv", a) == dedupe_key(tenant_id, "csv", b)
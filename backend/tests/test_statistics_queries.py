@@ -0,0 +1,34 @@
+"""
+Query-count regression test for the dashboard statistics.
+
+The dashboard is computed with a fixed number of set-based queries; the
+number of statements must not grow with the number of tenants (no per-tenant
+loop, no lazy loads).
+"""
+from app.api.statistics import _compute_dashboard_stats
+from tests.conftest import transactional_session
+from tests.seed import seed_tenants
+
+TENANT_COUNTS = (1, 5, 40)
+
+
+def _dashboard_statement_count(engine, recorder, tenants: int, tenant_scope_index=None):
+    with transactional_session(engine) as db:
+        tenant_ids = seed_tenants(db, tenants=tenants, scans_per_tenant=2, findings_per_scan=3, record_counts=True)
+        tenant_scope = None if tenant_scope_index is None else tenant_ids[tenant_scope_index]
+        with recorder.record(db):
+            stats = _compute_dashboard_stats(db, tenant_scope)
+        # Only the latest scan of each tenant counts
+        assert stats["total_findings"] == 3 * (tenants if tenant_scope is None else 1)
+        assert stats["total_scans"] == 2 * (tenants if tenant_scope is None else 1)
+        return len(recorder)
+
+
+def test_dashboard_query_count_is_constant_in_tenants(engine, statements):
+    counts = [_dashboard_statement_count(engine, statements, tenants) for tenants in TENANT_COUNTS]
+    assert len(set(counts)) == 1, f"statements per dashboard by tenant count {TENANT_COUNTS}: {counts}"
+
+
+def test_tenant_dashboard_query_count_is_constant_in_tenants(engine, statements):
+    counts = [_dashboard_statement_count(engine, statements, tenants, tenant_scope_index=0) for tenants in TENANT_COUNTS]
+    assert len(set(counts)) == 1, f"statements per dashboard by tenant count {TENANT_COUNTS}: {counts}"
@@ -0,0 +1,25 @@
+"""Granularity of the trend history series."""
+from app.api.trends import _compute_scan_history, resolve_bucket
+from app.core.config import settings
+from tests.seed import seed_tenants
+
+
+def test_auto_keeps_scans_while_the_window_holds_few(monkeypatch):
+    monkeypatch.setattr(settings, "TRENDS_AUTO_MAX_SCAN_POINTS", 10)
+
+    assert resolve_bucket("auto", 30, 10) == "scan"
+    assert resolve_bucket("auto", 30, 11) == "day"
+    assert resolve_bucket("auto", 365, 11) == "week"
+    assert resolve_bucket("day", 30, 1) == "day"
+
+
+def test_auto_history_has_a_point_per_scan(db, monkeypatch):
+    tenant_id = seed_tenants(db, tenants=1, scans_per_tenant=3, findings_per_scan=2, record_counts=True)[0]
+
+    history = _compute_scan_history(db, tenant_id, 30, "auto")
+
+    assert history["bucket"] == "scan"
+    assert [scan["scans_in_bucket"] for scan in history["scans"]] == [1, 1, 1]
+
+    monkeypatch.setattr(settings, "TRENDS_AUTO_MAX_SCAN_POINTS", 2)
+    assert _compute_scan_history(db, tenant_id, 30, "auto")["bucket"] == "day"
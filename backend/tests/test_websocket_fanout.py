@@ -0,0 +1,145 @@
+"""
+WebSocket fan-out under load, with fake sockets: bounded per-connection
+queues, coalescing, and broadcasts that never wait for a slow client.
+"""
+import asyncio
+import time
+
+from app.api.websocket import ConnectionManager
+
+CONNECTIONS = 10_000
+
+
+class FakeWebSocket:
+    def __init__(self, blocked: bool = False):
+        self.sent = []
+        self.closed = None
+        # A blocked socket never completes a send (a stalled client)
+        self.unblocked = asyncio.Event()
+        if not blocked:
+            self.unblocked.set()
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text: str):
+        await self.unblocked.wait()
+        self.sent.append(text)
+
+    async def send_json(self, message):
+        self.sent.append(message)
+
+    async def close(self, code: int = 1000):
+        self.closed = code
+
+
+async def _connect(manager, tenant_id, websockets):
+    for websocket in websockets:
+        await manager.connect(websocket, tenant_id)
+
+
+def _progress(i: int, scanner: str = "S3") -> dict:
+    return {"type": "scan_progress", "scan_id": "scan-1", "scanner": scanner, "done": i}
+
+
+async def _drain():
+    # Let the writer tasks run
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+async def _until(condition, timeout: float = 10.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out waiting for the writers"
+        await asyncio.sleep(0.01)
+
+
+async def _disconnect_all(manager):
+    writers = []
+    for tenant_id, connections in list(manager.active_connections.items()):
+        for websocket, connection in list(connections.items()):
+            writers.append(connection.writer)
+            manager.disconnect(websocket, tenant_id)
+    # Every writer must actually stop (a swallowed cancellation leaks the task)
+    _, pending = await asyncio.wait(writers, timeout=5)
+    assert not pending
+    assert not manager.active_connections
+
+
+async def test_slow_consumer_does_not_block_broadcast():
+    manager = ConnectionManager(max_queue=40, policy="coalesce", send_timeout=60, replay_buffer_size=10)
+    fast = [FakeWebSocket() for _ in range(CONNECTIONS - 1)]
+    slow = FakeWebSocket(blocked=True)
+    await _connect(manager, "tenant", fast + [slow])
+
+    elapsed = 0.0
+    for burst in range(2):
+        started = time.perf_counter()
+        for i in range(50):
+            # Distinct keys: nothing coalesces
+            await manager.broadcast_to_tenant("tenant", {"type": "notice", "i": burst * 50 + i})
+        elapsed = max(elapsed, time.perf_counter() - started)
+        await _until(lambda: all(len(websocket.sent) == (burst + 1) * 50 for websocket in fast))
+
+    # Broadcasting only enqueues: 50 events to 10k sockets, one of them stalled
+    assert elapsed < 10
+    slow_connection = manager.active_connections["tenant"][slow]
+    # Bounded at max_queue + replay_buffer_size entries, oldest dropped first
+    assert len(slow_connection.queue) == 50
+    assert slow_connection.dropped == 100 - 50 - 1
+    assert '"i":99' in slow_connection.queue[-1][1]
+    await _disconnect_all(manager)
+
+
+async def test_stalled_client_memory_stays_bounded_under_sustained_events():
+    manager = ConnectionManager(max_queue=50, policy="drop_oldest", send_timeout=60, replay_buffer_size=0)
+    slow = FakeWebSocket(blocked=True)
+    await _connect(manager, "tenant", [slow])
+
+    for i in range(20_000):
+        await manager.broadcast_to_tenant("tenant", {"type": "notice", "i": i})
+
+    connection = manager.active_connections["tenant"][slow]
+    assert len(connection.queue) == 50
+    assert connection.dropped >= 20_000 - 51
+    await _disconnect_all(manager)
+
+
+async def test_coalescing_keeps_only_the_latest_state_per_key():
+    manager = ConnectionManager(max_queue=20, policy="coalesce", send_timeout=60, replay_buffer_size=0)
+    slow = FakeWebSocket(blocked=True)
+    await _connect(manager, "tenant", [slow])
+    await _drain()
+
+    for i in range(1_000):
+        await manager.broadcast_to_tenant("tenant", _progress(i, scanner="S3"))
+        await manager.broadcast_to_tenant("tenant", _progress(i, scanner="IAM"))
+
+    connection = manager.active_connections["tenant"][slow]
+    # The writer holds at most one message in flight; the queue has one entry per key
+    assert len(connection.queue) <= 2
+    assert connection.dropped == 0
+
+    slow.unblocked.set()
+    await _drain()
+    latest = [text for text in slow.sent if '"done":999' in text]
+    assert len(latest) == 2
+    assert len(slow.sent) <= 3
+    await _disconnect_all(manager)
+
+
+async def test_stalled_send_times_out_and_disconnects():
+    manager = ConnectionManager(max_queue=5, policy="coalesce", send_timeout=0.05, replay_buffer_size=0)
+    slow = FakeWebSocket(blocked=True)
+    fast = FakeWebSocket()
+    await _connect(manager, "tenant", [slow, fast])
+
+    await manager.broadcast_to_tenant("tenant", {"type": "notice"})
+    await asyncio.sleep(0.2)
+
+    assert slow.closed is not None
+    assert slow not in manager.active_connections["tenant"]
+    assert fast in manager.active_connections["tenant"]
+    assert len(fast.sent) == 1
+    await _disconnect_all(manager)
@@ -238,10 +238,14 @@ export default function Settings() {
     setChangingPassword(true)
 
     try {
-      await api.post('/auth/me/change-password', {
+      const response = await api.post('/auth/me/change-password', {
         current_password: passwordData.current_password,
         new_password: passwordData.new_password,
       })
+      // The change revokes tokens issued before it; keep this session on the new one
+      if (response.data?.access_token) {
+        localStorage.setItem('token', response.data.access_token)
+      }
       
       showToast('Password changed successfully', 'success')
       setPasswordData({